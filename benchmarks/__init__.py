@@ -0,0 +1 @@
+# This file tells Python that 'benchmarks' is a package.
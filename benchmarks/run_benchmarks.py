@@ -0,0 +1,187 @@
+"""
+Benchmark the encoders on synthetic logs of increasing size.
+
+Every configuration of encoder, labeling type, prefix strategy, categorical encoding, latest payload (or attributes, for ComplexIndexEncoder) and time features is run on every log scale.
+Wall time, peak memory and throughput are written to a JSON file, which can be compared with the results of another version.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks --scales 100 1000 --output results.json
+    python -m benchmarks.run_benchmarks --encoders FrequencyEncoder --labeling-types NEXT_ACTIVITY --compare baseline.json
+"""
+import gc
+import json
+import time
+import argparse
+import platform
+import itertools
+import tracemalloc
+import subprocess
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType, PrefixStrategy, CategoricalEncoding
+
+ENCODERS = {
+    'FrequencyEncoder': FrequencyEncoder,
+    'SimpleIndexEncoder': SimpleIndexEncoder,
+    'ComplexIndexEncoder': ComplexIndexEncoder,
+}
+LABELING_TYPES = [labeling_type for labeling_type in LabelingType if labeling_type != LabelingType.CUSTOM]
+
+# Fields identifying a configuration, used to match results of different runs
+CONFIGURATION_FIELDS = ['encoder', 'labeling_type', 'prefix_strategy', 'categorical_encoding', 'include_latest_payload', 'attributes', 'add_time_features', 'num_cases']
+
+
+def iter_configurations(
+    encoders: list[str] = list(ENCODERS),
+    labeling_types: list[LabelingType] = LABELING_TYPES,
+) -> list[dict]:
+    """
+    Return every configuration of the sweep, as keyword arguments of the encoder (plus the encoder name).
+    Latest payload is swept for FrequencyEncoder and SimpleIndexEncoder, while attributes (none or all) are swept for ComplexIndexEncoder, which has no latest payload.
+    """
+    configurations = []
+
+    for encoder, labeling_type, prefix_strategy, categorical_encoding, add_time_features, with_attributes in itertools.product(
+        encoders, labeling_types, list(PrefixStrategy), list(CategoricalEncoding), [False, True], [False, True],
+    ):
+        configuration = {
+            'encoder': encoder,
+            'labeling_type': labeling_type,
+            'prefix_strategy': prefix_strategy,
+            'categorical_encoding': categorical_encoding,
+            'add_time_features': add_time_features,
+            'attributes': 'all' if with_attributes else [],
+        }
+
+        if encoder != 'ComplexIndexEncoder':
+            configuration['include_latest_payload'] = with_attributes
+
+        configurations.append(configuration)
+
+    return configurations
+
+
+def run_benchmark(configuration: dict, log: pd.DataFrame, prefix_length: int, measure_memory: bool = True) -> dict:
+    """
+    Encode log with the encoder described by configuration and return the measured result.
+    Time is measured in a first run; peak memory (allocations traced by tracemalloc, which slows down the encoding) in a second one.
+    """
+    encoder_kwargs = {key: value for key, value in configuration.items() if key != 'encoder'}
+
+    def encode() -> pd.DataFrame:
+        encoder = ENCODERS[configuration['encoder']](prefix_length=prefix_length, **encoder_kwargs)
+        return encoder.encode(log)
+
+    gc.collect()
+    start = time.perf_counter()
+    encoded_log = encode()
+    duration = time.perf_counter() - start
+
+    peak_memory = None
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            encode()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'encoder': configuration['encoder'],
+        'labeling_type': configuration['labeling_type'].name,
+        'prefix_strategy': configuration['prefix_strategy'].name,
+        'categorical_encoding': configuration['categorical_encoding'].name,
+        'include_latest_payload': configuration.get('include_latest_payload'),
+        'attributes': 'all' if configuration['attributes'] == 'all' else 'none',
+        'add_time_features': configuration['add_time_features'],
+        'num_cases': log['case:concept:name'].nunique(),
+        'num_events': len(log),
+        'rows': len(encoded_log),
+        'columns': len(encoded_log.columns),
+        'time': duration,
+        'peak_memory': peak_memory,
+        'rows_per_second': len(encoded_log) / duration if duration > 0 else None,
+        'events_per_second': len(log) / duration if duration > 0 else None,
+    }
+
+
+def get_metadata() -> dict:
+    """
+    Describe the environment of the run, so that results of different versions and machines can be told apart.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'date': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
+
+
+def compare_results(results: list[dict], baseline_results: list[dict]) -> pd.DataFrame:
+    """
+    Match results with the baseline ones by configuration and compute time and memory ratios (values below 1 are improvements).
+    """
+    results_df = pd.DataFrame(results)
+    baseline_df = pd.DataFrame(baseline_results)
+
+    comparison = results_df.merge(baseline_df, on=CONFIGURATION_FIELDS, suffixes=('', '_baseline'), how='inner')
+    comparison['time_ratio'] = comparison['time'] / comparison['time_baseline']
+    comparison['peak_memory_ratio'] = comparison['peak_memory'] / comparison['peak_memory_baseline']
+
+    return comparison[CONFIGURATION_FIELDS + ['time', 'time_baseline', 'time_ratio', 'peak_memory_ratio']]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark enc4ppm encoders on synthetic logs.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[100, 1000], help='Number of cases of the generated logs.')
+    parser.add_argument('--encoders', nargs='+', choices=list(ENCODERS), default=list(ENCODERS), help='Encoders to benchmark.')
+    parser.add_argument('--labeling-types', nargs='+', choices=[labeling_type.name for labeling_type in LABELING_TYPES], default=[labeling_type.name for labeling_type in LABELING_TYPES], help='Labeling types to benchmark.')
+    parser.add_argument('--prefix-length', type=int, default=10, help='Prefix length of the encoders.')
+    parser.add_argument('--no-memory', action='store_true', help='Do not measure peak memory (halves the duration of the benchmark).')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the generated logs.')
+    parser.add_argument('--output', default='benchmark_results.json', help='Path of the JSON results file.')
+    parser.add_argument('--compare', default=None, help='Path of a JSON results file to compare the results with.')
+    args = parser.parse_args()
+
+    configurations = iter_configurations(args.encoders, [LabelingType[name] for name in args.labeling_types])
+    results = []
+
+    for num_cases in args.scales:
+        log = generate_log(num_cases=num_cases, seed=args.seed)
+
+        for i, configuration in enumerate(configurations, start=1):
+            result = run_benchmark(configuration, log, args.prefix_length, measure_memory=not args.no_memory)
+            results.append(result)
+
+            print(f"[{num_cases} cases, {i}/{len(configurations)}] {', '.join(str(result[field]) for field in CONFIGURATION_FIELDS[:-1])}: {result['time']:.3f}s, {result['rows_per_second']:.0f} rows/s")
+
+    with open(args.output, 'w') as f:
+        json.dump({'metadata': get_metadata(), 'results': results}, f, indent=2)
+
+    print(f'Results written to {args.output}')
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline_results = json.load(f)['results']
+
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(compare_results(results, baseline_results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+from .base_encoder import BaseEncoder
+from .coded_log import CodedLog
+from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy, ParallelBackend, Aggregation, TimeFeature
+from .cache import PreprocessedLogCache
+from .time_features import BusinessCalendar
+from .instrumentation import StageMetrics, EncodingProgress
+from .helpers import one_hot
+
+class AggregationEncoder(BaseEncoder):
+    EVENT_COUNT_KEY = 'EventCount'
+
+    def __init__(
+        self,
+        *,
+        aggregations: list[Aggregation] = list(Aggregation),
+
+        labeling_type: LabelingType = LabelingType.NEXT_ACTIVITY,
+        attributes: list[str] | str = [],
+        categorical_encoding: CategoricalEncoding = CategoricalEncoding.STRING,
+        numerical_scaling: NumericalScaling = NumericalScaling.NONE,
+        prefix_length: int = None,
+        prefix_strategy: PrefixStrategy = PrefixStrategy.UP_TO_SPECIFIED,
+        add_time_features: bool | list[TimeFeature] = False,
+        timestamp_format: str = None,
+        case_id_key: str = 'case:concept:name',
+        activity_key: str = 'concept:name',
+        timestamp_key: str = 'time:timestamp',
+        outcome_key: str = 'outcome',
+        max_vocabulary_size: int | dict[str, int] = None,
+        min_value_frequency: int | dict[str, int] = None,
+        business_calendar: BusinessCalendar = None,
+    ) -> None:
+        """
+        Initialize the AggregationEncoder, which encodes every prefix with the count of every activity, the last state of the attributes (their latest values) and cumulative aggregations of numerical event attributes.
+
+        Args:
+            aggregations: Which aggregations to compute. Aggregation.COUNT adds the number of events of the prefix (EventCount column), while the other ones (SUM, MEAN, MIN, MAX, STD) are computed for every numerical event attribute, in columns named '<attribute>_<aggregation>'. STD is the population standard deviation.
+            labeling_type: Label type to apply to examples.
+            attributes: Which attributes to consider. Can be a list of the attributes to consider or the string 'all' (all attributes found in the log will be encoded).
+            categorical_encoding: How to encode categorical features. They can either remain strings (CategoricalEncoding.STRING) or be converted to one-hot vectors splitted across multiple columns (CategoricalEncoding.ONE_HOT).
+            numerical_scaling: How to scale numerical features. They can be standardized (NumericalScaling.STANDARDIZATION) or left as-is (NumericalScaling.NONE). Latest values, means, minimums and maximums are standardized with the statistics of their attribute, sums and standard deviations with their own statistics (stored in numerical_scaling_info).
+            prefix_length: Maximum prefix length to consider: longer prefixes will be discarded, shorter prefixes may be discarded depending on prefix_strategy parameter. If not provided, defaults to maximum prefix length found in log. If provided, it must be a non-zero positive int number.
+            prefix_strategy: Whether to consider prefix lengths from 1 to prefix_length (PrefixStrategy.UP_TO_SPECIFIED) or only the specified prefix_length (PrefixStrategy.ONLY_SPECIFIED).
+            add_time_features: Time features to add to the encoding, as a list of TimeFeature (e.g. hour of day, day of week, time since case start), or True for time since case start and time since last event.
+            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data. Numeric timestamps are read as time since epoch (unit inferred from their magnitude), and datetime columns (including Arrow timestamps) are used as they are.
+            case_id_key: Column name for case identifiers.
+            activity_key: Column name for activity names.
+            timestamp_key: Column name for timestamps.
+            outcome_key: Column name for outcome predition.
+            max_vocabulary_size: Maximum number of distinct values kept in the vocabulary of activities and categorical attributes (the most frequent ones), when the vocabulary is built (i.e. until the encoder is frozen). Other values are folded into the OTHER value. Can be an int, or a dict mapping column names (activity_key or attribute names) to their maximum. Frequencies of all values are recorded in the value_frequencies attribute. If not provided, all values are kept.
+            min_value_frequency: Minimum number of events a value must occur in to be kept in the vocabulary of activities and categorical attributes. Rarer values are folded into the OTHER value. Can be an int or a dict, as max_vocabulary_size. If not provided, all values are kept.
+            business_calendar: Working days and hours used by business-calendar time features (e.g. TimeFeature.IS_WORKING_HOURS). If not provided, Monday to Friday from 9 to 17, without holidays.
+        """
+        super().__init__(
+            labeling_type,
+            attributes,
+            categorical_encoding,
+            numerical_scaling,
+            prefix_length,
+            prefix_strategy,
+            add_time_features,
+            timestamp_format,
+            case_id_key,
+            activity_key,
+            timestamp_key,
+            outcome_key,
+            max_vocabulary_size,
+            min_value_frequency,
+            business_calendar,
+        )
+
+        self.aggregations = aggregations
+
+
+    def encode(
+        self,
+        df: pd.DataFrame,
+        *,
+        freeze: bool = False,
+        n_jobs: int = 1,
+        parallel_backend: ParallelBackend = ParallelBackend.PROCESS,
+        preprocessing_cache: PreprocessedLogCache = None,
+        instrument: bool = False,
+        stage_callback: Callable[[StageMetrics], None] = None,
+        progress_callback: Callable[[EncodingProgress], None] = None,
+        memory_budget: int = None,
+    ) -> pd.DataFrame:
+        """
+        Encode the provided DataFrame with aggregation encoding and apply the specified labeling.
+
+        Args:
+            df: DataFrame to encode.
+            freeze: Freeze encoder with provided parameters. Usually set to True when encoding the train log, False otherwise. Required if you want to later save the encoder to a file.
+            n_jobs: Number of worker processes used to encode cases in parallel. Set it to -1 to use all available CPUs.
+            parallel_backend: How cases are exchanged with worker processes when n_jobs is not 1. AggregationEncoder only supports ParallelBackend.PROCESS (partitions and results are pickled).
+            preprocessing_cache: Cache of preprocessed logs. If provided, the preprocessed log is taken from the cache (or stored into it), so that encoding the same log multiple times preprocesses it only once.
+            instrument: Whether to measure every stage of the encoding (duration, rows and columns in and out, peak allocated memory). Measures are stored in the stage_metrics attribute of the encoder as StageMetrics objects.
+            stage_callback: Function called with the StageMetrics of every stage as soon as it ends. Setting it enables instrument.
+            progress_callback: Function called with the EncodingProgress of the encoding (current stage, cases encoded out of the total, rows produced) at the start of every stage and whenever cases are encoded (all at once, or every partition when n_jobs is not 1).
+            memory_budget: Maximum memory of the encoded log, in bytes. If the encoded log is projected to take more (see estimate), a MemoryError is raised before encoding.
+
+        Returns:
+            The encoded DataFrame.
+        """
+        return super()._encode_template(
+            df,
+            freeze=freeze,
+            n_jobs=n_jobs,
+            parallel_backend=parallel_backend,
+            preprocessing_cache=preprocessing_cache,
+            instrument=instrument,
+            stage_callback=stage_callback,
+            progress_callback=progress_callback,
+            memory_budget=memory_budget,
+        )
+
+
+    def _check_parameters(self, df: pd.DataFrame) -> None:
+        super()._check_parameters(df)
+
+        if not isinstance(self.aggregations, list) or not all(isinstance(aggregation, Aggregation) for aggregation in self.aggregations):
+            raise TypeError(f'aggregations must be a list of valid Aggregation: {[e.name for e in Aggregation]}')
+
+
+    def _encode(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+        events = df.iloc[coded_log.order].reset_index(drop=True)
+
+        # Prefixes are encoded all at once with cumulative operations grouped by case
+        event_cases = np.repeat(np.arange(coded_log.num_cases), coded_log.case_lengths)
+        depths = coded_log.depths
+
+        encoded_df = pd.DataFrame({
+            self.case_id_key: coded_log.event_case_ids(),
+            self.timestamp_key: events[self.timestamp_key],
+            self.ORIGINAL_INDEX_KEY: coded_log.index,
+        })
+
+        # Activity counts (PADDING excluded)
+        activity_vocabulary = self._activity_vocabulary()
+        activities = coded_log.code_activities(activity_vocabulary, self.UNKNOWN_VAL)
+
+        activity_occurrences = np.zeros((coded_log.num_events, len(activity_vocabulary)-1), dtype=np.int64)
+        activity_occurrences[np.arange(coded_log.num_events), activities] = 1
+
+        activity_counts = pd.DataFrame(activity_occurrences, columns=activity_vocabulary[:-1]).groupby(event_cases).cumsum()
+
+        encoded_df = pd.concat([encoded_df, activity_counts], axis=1)
+
+        if Aggregation.COUNT in self.aggregations:
+            encoded_df[self.EVENT_COUNT_KEY] = depths
+
+        # Last state and aggregations of attributes
+        for attribute_name in self.attributes:
+            attribute = self.log_attributes[attribute_name]
+            values = events[attribute_name]
+
+            if attribute['type'] == 'categorical':
+                encoded_df[f'{attribute_name}_{self.LATEST_PAYLOAD_COL_SUFFIX_NAME}'] = values.where(values.isin(attribute['values']), self.UNKNOWN_VAL)
+                continue
+
+            encoded_df[f'{attribute_name}_{self.LATEST_PAYLOAD_COL_SUFFIX_NAME}'] = values
+
+            if attribute['scope'] == 'event':
+                for aggregation, aggregated_values in self._aggregate(values.astype(np.float64), event_cases, depths).items():
+                    encoded_df[f'{attribute_name}_{aggregation.value}'] = aggregated_values
+
+        self._report_progress(cases=coded_log.num_cases, rows=coded_log.num_events)
+
+        return encoded_df
+
+
+    def _aggregate(self, values: pd.Series, event_cases: np.ndarray, depths: np.ndarray) -> dict[Aggregation, np.ndarray]:
+        """
+        Compute the requested aggregations (COUNT excluded) of values over every prefix, where values are sorted by case and event_cases holds the case of every value.
+        """
+        grouped = values.groupby(event_cases)
+        aggregated_values = {}
+
+        sums = grouped.cumsum().to_numpy()
+
+        for aggregation in self.aggregations:
+            if aggregation == Aggregation.SUM:
+                aggregated_values[aggregation] = sums
+            elif aggregation == Aggregation.MEAN:
+                aggregated_values[aggregation] = sums / depths
+            elif aggregation == Aggregation.MIN:
+                aggregated_values[aggregation] = grouped.cummin().to_numpy()
+            elif aggregation == Aggregation.MAX:
+                aggregated_values[aggregation] = grouped.cummax().to_numpy()
+            elif aggregation == Aggregation.STD:
+                # Shift values by the first value of their case, to limit cancellation in the sum of squares
+                shifted_values = values - grouped.transform('first')
+                shifted_sums = shifted_values.groupby(event_cases).cumsum().to_numpy()
+                shifted_squared_sums = (shifted_values**2).groupby(event_cases).cumsum().to_numpy()
+
+                variances = (shifted_squared_sums - shifted_sums**2 / depths) / depths
+                aggregated_values[aggregation] = np.sqrt(np.maximum(variances, 0))
+
+        return aggregated_values
+
+
+    def _complete_encoding(self, encoded_df: pd.DataFrame) -> pd.DataFrame:
+        # Transform to one-hot if requested
+        if self.categorical_encoding == CategoricalEncoding.ONE_HOT:
+            categorical_columns = []
+            categorical_columns_possible_values = []
+
+            for attribute_name in self.attributes:
+                attribute = self.log_attributes[attribute_name]
+
+                if attribute['type'] == 'categorical':
+                    # For latest values do not consider PADDING value
+                    attribute_possible_values = [attribute_value for attribute_value in attribute['values'] if attribute_value != self.PADDING_CAT_VAL]
+
+                    categorical_columns.append(f'{attribute_name}_{self.LATEST_PAYLOAD_COL_SUFFIX_NAME}')
+                    categorical_columns_possible_values.append(attribute_possible_values)
+
+            encoded_df = one_hot(
+                encoded_df,
+                columns=categorical_columns,
+                columns_possible_values=categorical_columns_possible_values,
+                unknown_value=self.UNKNOWN_VAL,
+            )
+
+        return encoded_df
+
+
+    def _postprocess_log(self, df: pd.DataFrame, keep_index: bool = False) -> pd.DataFrame:
+        # Sums and standard deviations are not in the unit of their attribute, so they are scaled with their own statistics
+        for col in self._get_aggregation_columns([Aggregation.SUM, Aggregation.STD]):
+            if not self.was_frozen:
+                self.numerical_scaling_info[col] = {
+                    'mean': df[col].mean(),
+                    'std': df[col].std(ddof=0),
+                }
+
+            if self.numerical_scaling == NumericalScaling.STANDARDIZATION:
+                df[col] = (df[col] - self.numerical_scaling_info[col]['mean']) / self.numerical_scaling_info[col]['std']
+
+        return super()._postprocess_log(df, keep_index)
+
+
+    def _get_attribute_columns(self, columns: list[str], attribute_name: str) -> list[str]:
+        return [f'{attribute_name}_{self.LATEST_PAYLOAD_COL_SUFFIX_NAME}'] + self._get_aggregation_columns([Aggregation.MEAN, Aggregation.MIN, Aggregation.MAX], [attribute_name])
+
+
+    def _get_aggregation_columns(self, aggregations: list[Aggregation], attribute_names: list[str] = None) -> list[str]:
+        """
+        Columns holding the provided aggregations (COUNT excluded, since it is not computed per attribute) of the numerical event attributes attribute_names (all of them, if not provided).
+        """
+        if attribute_names is None:
+            attribute_names = self.attributes
+
+        return [
+            f'{attribute_name}_{aggregation.value}'
+            for attribute_name in attribute_names
+            if self.log_attributes[attribute_name]['type'] == 'numerical' and self.log_attributes[attribute_name]['scope'] == 'event'
+            for aggregation in self.aggregations
+            if aggregation in aggregations and aggregation != Aggregation.COUNT
+        ]
+
+
+    def _estimate_feature_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        # One count per activity, PADDING excluded
+        columns = [(activity, np.dtype(np.int64), None) for activity in self._activity_vocabulary()[:-1]]
+
+        if Aggregation.COUNT in self.aggregations:
+            columns.append((self.EVENT_COUNT_KEY, np.dtype(np.int64), None))
+
+        columns_possible_values = {}
+
+        for attribute_name in self.attributes:
+            attribute = self.log_attributes[attribute_name]
+            name = f'{attribute_name}_{self.LATEST_PAYLOAD_COL_SUFFIX_NAME}'
+
+            if attribute['type'] == 'categorical':
+                attribute_possible_values = [attribute_value for attribute_value in attribute['values'] if attribute_value != self.PADDING_CAT_VAL]
+                columns.append(self._estimate_categorical_column(name, attribute_possible_values))
+                columns_possible_values[name] = attribute_possible_values
+                continue
+
+            columns.append((name, df[attribute_name].dtype, None))
+            columns += [(col, np.dtype(np.float64), None) for col in self._get_aggregation_columns(list(Aggregation), [attribute_name])]
+
+        if self.categorical_encoding == CategoricalEncoding.ONE_HOT:
+            columns = self._estimate_one_hot_columns(columns, columns_possible_values)
+
+        return columns
@@ -1,23 +1,44 @@
 import os
+import copy
+import dataclasses
 import pickle
 import pprint
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 from pandas.api.types import is_numeric_dtype
 
-from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy
+from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy, ParallelBackend, TimeFeature
+from .coded_log import CodedLog, build_prefix_trie, group_variants, sequence_depths, sequence_parents
+from .parallel import resolve_n_jobs, encode_in_parallel, encode_in_shared_memory
+from .helpers import parse_timestamps, take_rows
+from .instrumentation import StageMetrics, ProgressReporter, measure_stage
+from .cache import PreprocessedLogCache
+from .estimation import EncodingEstimate, build_estimate
+from .time_features import BusinessCalendar, INTEGER_TIME_FEATURES, BOOLEAN_TIME_FEATURES, compute_time_features, timestamps_to_ns
 
 class BaseEncoder(ABC):
     ORIGINAL_INDEX_KEY = 'OriginalIndex'
+    PREFIX_NODE_KEY = 'PrefixNode'
     TIME_SINCE_CS_KEY = 'TimeSinceCaseStart'
     TIME_SINCE_PE_KEY = 'TimeSincePreviousEvent'
+    HOUR_OF_DAY_KEY = 'HourOfDay'
+    DAY_OF_WEEK_KEY = 'DayOfWeek'
+    MONTH_KEY = 'Month'
+    TIME_SINCE_MIDNIGHT_KEY = 'TimeSinceMidnight'
+    IS_WORKING_DAY_KEY = 'IsWorkingDay'
+    IS_WORKING_HOURS_KEY = 'IsWorkingHours'
+    WORKING_DAYS_SINCE_CS_KEY = 'WorkingDaysSinceCaseStart'
+    INTER_EVENT_TIME_COL_PREFIX_NAME = 'InterEventTime'
     EVENT_COL_PREFIX_NAME = 'event'
     TIMESTAMP_COL_PREFIX_NAME = 'Timestamp'
     LATEST_PAYLOAD_COL_SUFFIX_NAME = 'latest'
     LABEL_KEY = 'label'
     UNKNOWN_VAL = 'UNKNOWN'
+    OTHER_VAL = 'OTHER'
     PADDING_CAT_VAL = 'PADDING'
     PADDING_NUM_VAL = 0.0
+    CODED_DTYPE = np.int64
     
     def __init__(
         self,
@@ -27,12 +48,15 @@ class BaseEncoder(ABC):
         numerical_scaling: NumericalScaling = NumericalScaling.NONE,
         prefix_length: int = None,
         prefix_strategy: PrefixStrategy = PrefixStrategy.UP_TO_SPECIFIED,
-        add_time_features: bool = False,
+        add_time_features: bool | list[TimeFeature] = False,
         timestamp_format: str = None,
         case_id_key: str = 'case:concept:name',
         activity_key: str = 'concept:name',
         timestamp_key: str = 'time:timestamp',
         outcome_key: str = 'outcome',
+        max_vocabulary_size: int | dict[str, int] = None,
+        min_value_frequency: int | dict[str, int] = None,
+        business_calendar: BusinessCalendar = None,
     ) -> None:
         self.labeling_type = labeling_type
         self.attributes = attributes
@@ -46,6 +70,9 @@ class BaseEncoder(ABC):
         self.activity_key = activity_key
         self.timestamp_key = timestamp_key
         self.outcome_key = outcome_key
+        self.max_vocabulary_size = max_vocabulary_size
+        self.min_value_frequency = min_value_frequency
+        self.business_calendar = business_calendar
 
         # Instance variables
         self.is_frozen: bool = False
@@ -53,16 +80,20 @@ class BaseEncoder(ABC):
         self.original_df: pd.DataFrame = pd.DataFrame()
         self.log_activities: list[str] = []
         self.log_attributes: dict[str, dict[str, str | list | dict]] = {}
+        self.value_frequencies: dict[str, dict[str, int]] = {}
         self.numerical_scaling_info = {}
         self.remaining_time_num_bins = 10
+        self.stage_metrics: list[StageMetrics] | None = None
+        self.progress_reporter: ProgressReporter | None = None
 
 
     @abstractmethod
-    def _encode(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    def _encode(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
         """
         The _encode abstract method must be defined by subclasses and must contain the specific encoding logic of the encoder.
         In particular, the _encode implementation must create the necessary columns for the specific encoding + add the ORIGINAL_INDEX_KEY column.
         The _encode method must not filter rows (events), but instead return them all: the BaseEncoder will then _apply_prefix_strategy to filter them.
+        If provided, coded_log is the coded view of df (e.g. shared by encode_many), which must be used to segment and sort cases instead of building it again with _code_log.
         """
         pass
 
@@ -71,30 +102,333 @@ class BaseEncoder(ABC):
         """
         The _encode_template method is a template method which performs both common operations shared amongs all encoders and the specific logic of each encoder.
         In particular, common operations are: _preprocess_log, _label_log, _apply_prefix_strategy and _postprocess_log; specific encoding is performed by the _encode method.
+        With prefix_trie, the features of the nodes of the prefix trie are returned along with the encoded DataFrame (see encode_prefix_table).
         """
         self.original_df = df
         self.was_frozen = self.is_frozen
         
-        self._check_log(df)
+        # Logs shared by multiple encoders have already been checked (see encode_many)
+        if kwargs.get('preprocessed_df') is None:
+            self._check_log(df)
+
         self._check_parameters(df)
-        df = self._preprocess_log(df)
+        n_jobs = resolve_n_jobs(kwargs.get('n_jobs', 1))
+        parallel_backend = kwargs.get('parallel_backend', ParallelBackend.PROCESS)
+        self._check_parallel_backend(parallel_backend)
+        deduplicate_variants = kwargs.get('deduplicate_variants', False)
+        self._check_deduplicate_variants(deduplicate_variants, n_jobs)
+        prefix_trie = kwargs.get('prefix_trie', False)
+        memory_budget = kwargs.get('memory_budget')
+        self._check_memory_budget(memory_budget)
+
+        # Instrumentation is opt-in: when disabled, stages are called directly
+        stage_callback = kwargs.get('stage_callback')
+        instrument = kwargs.get('instrument', False) or stage_callback is not None
+        self.stage_metrics = [] if instrument else None
+
+        # Progress is reported at the start of every stage and, during encoding, whenever cases are encoded
+        progress_callback = kwargs.get('progress_callback')
+        progress_reporter = ProgressReporter(progress_callback, df[self.case_id_key].nunique()) if progress_callback is not None else None
+
+        def run_stage(stage, function, df, *args):
+            if progress_reporter is not None:
+                progress_reporter.start_stage(stage)
+
+            if not instrument:
+                return function(df, *args)
+
+            result, metrics = measure_stage(stage, function, df, *args)
+            self.stage_metrics.append(metrics)
+            if stage_callback is not None:
+                stage_callback(metrics)
+
+            return result
+
+        # Logs shared by multiple encoders may have already been preprocessed (see encode_many) or cached
+        coded_log = kwargs.get('coded_log')
+
+        if 'preprocessed_df' in kwargs and kwargs['preprocessed_df'] is not None:
+            df = kwargs['preprocessed_df']
+        elif 'preprocessing_cache' in kwargs and kwargs['preprocessing_cache'] is not None:
+            df, coded_log = run_stage('preprocess_log', lambda df: kwargs['preprocessing_cache'].get(self, df), df)
+        else:
+            df = run_stage('preprocess_log', self._preprocess_log, df)
+
+        # Refuse encodings that cannot fit before building vocabularies, so that the encoder is left untouched
+        if memory_budget is not None:
+            estimate = self._get_estimator()._estimate(df)
+            if estimate.bytes > memory_budget:
+                raise MemoryError(f'The encoded log is projected to take {estimate.bytes} bytes ({estimate.rows} rows, {len(estimate.columns)} columns), which exceeds memory_budget ({memory_budget} bytes)')
         
         if not self.is_frozen:
-            self._extract_log_data(df)
+            run_stage('extract_log_data', self._extract_log_data, df)
 
         if 'freeze' in kwargs and kwargs['freeze']:
             self.is_frozen = True
 
-        encoded_df = self._encode(df)
+        # Values folded into OTHER_VAL by vocabulary caps are replaced before encoding, so that every encoding strategy sees them
+        if len(self._get_capped_columns()) > 0:
+            df = run_stage('fold_rare_values', self._fold_rare_values, df)
+            if coded_log is not None:
+                coded_log = self._fold_coded_log(coded_log)
 
-        encoded_df = self._after_encode(encoded_df)
-        encoded_df = self._label_log(encoded_df)
-        encoded_df = self._apply_prefix_strategy(encoded_df)
-        encoded_df = self._postprocess_log(encoded_df)
+        # The reporter is only kept on the encoder while encoding, since its callback may not be picklable
+        self.progress_reporter = progress_reporter
+        try:
+            encoded_df, node_features = run_stage('encode', self._encode_log, df, coded_log, n_jobs, parallel_backend, deduplicate_variants, prefix_trie)
+        finally:
+            self.progress_reporter = None
+
+        # Nodes of a prefix trie are completed by encode_prefix_table
+        if not prefix_trie:
+            encoded_df = run_stage('complete_encoding', self._complete_encoding, encoded_df)
+
+        encoded_df = run_stage('after_encode', self._after_encode, encoded_df)
+        encoded_df = run_stage('label_log', self._label_log, encoded_df)
+        encoded_df = run_stage('apply_prefix_strategy', self._apply_prefix_strategy, encoded_df)
+        encoded_df = run_stage('postprocess_log', self._postprocess_log, encoded_df, kwargs.get('keep_index', False))
+
+        if prefix_trie:
+            return encoded_df, node_features
 
         return encoded_df
+
+
+    def _encode_log(
+        self,
+        df: pd.DataFrame,
+        coded_log: CodedLog,
+        n_jobs: int,
+        parallel_backend: ParallelBackend,
+        deduplicate_variants: bool,
+        prefix_trie: bool,
+    ) -> tuple[pd.DataFrame, np.ndarray]:
+        """
+        Encode the preprocessed log df with the requested strategy: serially with _encode, in parallel, once per variant or once per prefix trie node.
+        The features of the prefix trie nodes are returned along with the encoded DataFrame (None unless prefix_trie).
+        """
+        # Cases are independent once vocabularies are built, so they can be encoded in parallel
+        if prefix_trie:
+            encoded_df, node_features = self._encode_prefix_trie(df, coded_log)
+            self._report_progress(cases=df[self.case_id_key].nunique(), rows=len(encoded_df))
+            return encoded_df, node_features
+
+        if deduplicate_variants:
+            encoded_df = self._encode_variants(df, coded_log)
+            self._report_progress(cases=df[self.case_id_key].nunique(), rows=len(encoded_df))
+            return encoded_df, None
+
+        if n_jobs == 1:
+            return self._encode(df, coded_log), None
+
+        if parallel_backend == ParallelBackend.SHARED_MEMORY:
+            return encode_in_shared_memory(self, df, n_jobs, coded_log=coded_log), None
+
+        return encode_in_parallel(self, df, n_jobs), None
     
 
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encode the provided DataFrame with a frozen encoder, without modifying the encoder. Per-call state is kept on a shallow copy of the encoder (which shares the frozen vocabularies), so a single encoder can be safely used by multiple threads at the same time.
+
+        Args:
+            df: DataFrame to encode.
+
+        Returns:
+            The encoded DataFrame.
+        """
+        if not self.is_frozen:
+            raise RuntimeError("Encoder must be frozen before calling transform. Call encode with freeze=True first.")
+
+        # A frozen encoder only reads its vocabularies, so they can be shared by all calls
+        return copy.copy(self)._encode_template(df)
+
+
+    def encode_prefix_table(
+        self,
+        df: pd.DataFrame,
+        *,
+        freeze: bool = False,
+        preprocessing_cache: PreprocessedLogCache = None,
+    ) -> tuple[pd.DataFrame, np.ndarray, pd.DataFrame]:
+        """
+        Encode the provided DataFrame like encode, but store the features of every distinct prefix only once: prefixes shared by multiple cases are encoded once, by building a trie of the prefixes of the log.
+        Only encoders whose features depend on the activity sequence alone support it (e.g. FrequencyEncoder and SimpleIndexEncoder, without latest payload).
+
+        The encoding returned by encode can be rebuilt as `pd.concat([examples.iloc[:, :1], prefix_table.iloc[index].reset_index(drop=True), examples.iloc[:, 1:]], axis=1)`.
+
+        Args:
+            df: DataFrame to encode.
+            freeze: Freeze encoder with provided parameters. See encode.
+            preprocessing_cache: Cache of preprocessed logs. See encode.
+
+        Returns:
+            The features of every distinct prefix (prefix_table), the row of prefix_table holding the features of every example (index), and the remaining columns of every example, i.e. case id, time features and label (examples).
+        """
+        if not self._supports_coded_encoding():
+            raise ValueError(f'{self.__class__.__name__} does not support prefix tables')
+
+        if getattr(self, 'include_latest_payload', False):
+            raise ValueError('Prefix tables do not support include_latest_payload, since the latest payload differs between cases sharing a prefix')
+
+        examples, node_features = self._encode_template(df, freeze=freeze, preprocessing_cache=preprocessing_cache, prefix_trie=True)
+
+        # Only keep the prefixes used by the examples left after applying the prefix strategy
+        used_nodes, index = np.unique(examples[self.PREFIX_NODE_KEY].to_numpy(), return_inverse=True)
+
+        prefix_table = self._complete_encoding(self._coded_features(node_features[used_nodes]))
+        examples = examples.drop(columns=[self.PREFIX_NODE_KEY])
+
+        return prefix_table, index, examples
+
+
+    def estimate(
+        self,
+        df: pd.DataFrame,
+        *,
+        preprocessing_cache: PreprocessedLogCache = None,
+    ) -> EncodingEstimate:
+        """
+        Compute the size of the encoding of the provided DataFrame without encoding it, nor modifying the encoder.
+        Rows and columns are exact, since they follow from the log profile (case lengths, vocabularies, attribute types and scopes) and the encoder settings. Memory is projected from the dtype of every column: fixed-size columns take their item size, while string columns take the mean size of the values they can take.
+
+        Args:
+            df: DataFrame to estimate the encoding of.
+            preprocessing_cache: Cache of preprocessed logs. See encode.
+
+        Returns:
+            The EncodingEstimate of the encoding.
+        """
+        self._check_log(df)
+
+        estimator = self._get_estimator()
+        estimator.original_df = df
+        estimator._check_parameters(df)
+
+        if preprocessing_cache is not None:
+            df, _ = preprocessing_cache.get(estimator, df)
+        else:
+            df = estimator._preprocess_log(df)
+
+        return estimator._estimate(df)
+
+
+    def _get_estimator(self) -> 'BaseEncoder':
+        """
+        Return a shallow copy of the encoder, whose vocabularies can be built without modifying the encoder.
+        """
+        estimator = copy.copy(self)
+        estimator.log_attributes = dict(self.log_attributes)
+
+        return estimator
+
+
+    def _estimate(self, df: pd.DataFrame) -> EncodingEstimate:
+        """
+        Compute the EncodingEstimate of the preprocessed log df. Vocabularies are built if the encoder is not frozen, so it must be called on a copy of the encoder (see _get_estimator).
+        """
+        if not self.is_frozen:
+            self._extract_log_data(df)
+
+        # Rows: one per event, filtered by the prefix strategy and without label
+        df = df.sort_values([self.case_id_key, self.timestamp_key])
+        grouped = df.groupby(self.case_id_key)
+        positions = grouped.cumcount().to_numpy() + 1
+        case_lengths = grouped[self.case_id_key].transform('size').to_numpy()
+
+        if self.prefix_strategy == PrefixStrategy.UP_TO_SPECIFIED:
+            is_kept = positions <= self.prefix_length
+        elif self.prefix_strategy == PrefixStrategy.ONLY_SPECIFIED:
+            is_kept = positions == self.prefix_length
+        else:
+            is_kept = np.ones(len(df), dtype=bool)
+
+        if self.labeling_type == LabelingType.NEXT_ACTIVITY:
+            is_kept &= positions < case_lengths
+        elif self.labeling_type == LabelingType.OUTCOME:
+            is_kept &= self.original_df[self.outcome_key].loc[df.index].notna().to_numpy()
+
+        # Columns, as (name, dtype, values) tuples
+        columns = [(self.case_id_key, df[self.case_id_key].dtype, df[self.case_id_key].unique())]
+        columns += self._estimate_feature_columns(df)
+
+        # Standardized attribute columns become float
+        if self.numerical_scaling == NumericalScaling.STANDARDIZATION:
+            scaled_columns = set()
+            for attribute_name, attribute_info in self.log_attributes.items():
+                if attribute_info['type'] == 'numerical':
+                    scaled_columns.update(self._get_attribute_columns([name for name, _, _ in columns], attribute_name))
+
+            columns = [(name, np.dtype(np.float64), None) if name in scaled_columns else (name, dtype, values) for name, dtype, values in columns]
+
+        for name, time_feature in self._get_time_feature_columns():
+            if time_feature in BOOLEAN_TIME_FEATURES:
+                columns.append((name, np.dtype(bool), None))
+            elif time_feature in INTEGER_TIME_FEATURES and self.numerical_scaling != NumericalScaling.STANDARDIZATION:
+                columns.append((name, np.dtype(np.int64), None))
+            else:
+                columns.append((name, np.dtype(np.float64), None))
+
+        if self.labeling_type == LabelingType.NEXT_ACTIVITY:
+            columns.append(self._estimate_categorical_column(self.LABEL_KEY, self._activity_vocabulary()[:-1]))
+        elif self.labeling_type == LabelingType.REMAINING_TIME:
+            columns.append((self.LABEL_KEY, np.dtype(np.float64), None))
+        elif self.labeling_type == LabelingType.REMAINING_TIME_CLASSIFICATION:
+            num_bins = len(self.remaining_time_bins)-1 if self.is_frozen else self.remaining_time_num_bins
+            bin_labels = [f'Bin_{i+1}' for i in range(num_bins)] + ([self.UNKNOWN_VAL] if self.is_frozen else [])
+            columns.append(self._estimate_categorical_column(self.LABEL_KEY, bin_labels))
+        elif self.labeling_type == LabelingType.OUTCOME:
+            outcomes = self.original_df[self.outcome_key]
+            columns.append((self.LABEL_KEY, outcomes.dtype, None if is_numeric_dtype(outcomes) else outcomes.dropna().unique()))
+
+        return build_estimate(int(is_kept.sum()), columns)
+
+
+    def _estimate_feature_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        """
+        Encoders supporting estimate must implement this method, which describes the columns created by _encode and _complete_encoding (case id excluded) as (name, dtype, values) tuples, in order.
+        Values are the values a column can take, and must be provided for variable-size dtypes (e.g. strings); None otherwise.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not support estimate')
+
+
+    def _estimate_categorical_column(self, name: str, values: list) -> tuple[str, object, list]:
+        """
+        Describe a column taking the provided values, with the dtype pandas infers for them.
+        """
+        return (name, pd.Series(values).dtype, values)
+
+
+    def _estimate_latest_payload_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        """
+        Describe the columns created by _include_latest_payload.
+        """
+        columns = []
+
+        for attribute_name in self.attributes:
+            name = f'{attribute_name}_{self.LATEST_PAYLOAD_COL_SUFFIX_NAME}'
+
+            if self.log_attributes[attribute_name]['type'] == 'numerical':
+                columns.append((name, df[attribute_name].dtype, None))
+            else:
+                # Latest payload does not include PADDING value
+                columns.append(self._estimate_categorical_column(name, [value for value in self.log_attributes[attribute_name]['values'] if value != self.PADDING_CAT_VAL]))
+
+        return columns
+
+
+    def _estimate_one_hot_columns(self, columns: list[tuple[str, object, list | None]], columns_possible_values: dict[str, list]) -> list[tuple[str, object, list | None]]:
+        """
+        Describe the columns resulting from helpers.one_hot: one-hot columns are replaced by one boolean column per possible value, appended in the order of columns_possible_values.
+        """
+        one_hot_columns = [column for column in columns if column[0] not in columns_possible_values]
+
+        for name, possible_values in columns_possible_values.items():
+            one_hot_columns += [(f'{name}_{value}', np.dtype(bool), None) for value in possible_values]
+
+        return one_hot_columns
+
+
     def _check_log(self, df: pd.DataFrame) -> None:
         """
         Checks and validations on input log.
@@ -136,6 +470,27 @@ class BaseEncoder(ABC):
                 if attribute not in self.original_df.columns:
                     raise ValueError(f"attributes contains value '{attribute}', which cannot be found in the log")
         
+        # Time features
+        if not isinstance(self.add_time_features, bool) and not (isinstance(self.add_time_features, list) and all(isinstance(time_feature, TimeFeature) for time_feature in self.add_time_features)):
+            raise TypeError(f'add_time_features must be either a boolean or a list of valid TimeFeature: {[e.name for e in TimeFeature]}')
+
+        if TimeFeature.INTER_EVENT_TIMES in self._get_time_features() and type(self)._get_num_positions is BaseEncoder._get_num_positions:
+            raise ValueError(f'TimeFeature.INTER_EVENT_TIMES is only available for index encoders, since {self.__class__.__name__} does not encode events by position')
+
+        if self.business_calendar is not None and not isinstance(self.business_calendar, BusinessCalendar):
+            raise TypeError('business_calendar must be a BusinessCalendar')
+
+        # Vocabulary caps
+        for cap_name, cap in [('max_vocabulary_size', self.max_vocabulary_size), ('min_value_frequency', self.min_value_frequency)]:
+            caps = cap if isinstance(cap, dict) else {None: cap}
+
+            for column, column_cap in caps.items():
+                if column_cap is not None and (not isinstance(column_cap, int) or column_cap <= 0):
+                    raise ValueError(f'{cap_name} must be either None, a positive integer or a dict of positive integers ({cap} has been provided instead)')
+
+                if column is not None and column != self.activity_key and (column not in self.original_df.columns or (isinstance(self.attributes, list) and column not in self.attributes)):
+                    raise ValueError(f"{cap_name} contains column '{column}', which is neither the activity column nor an attribute of the encoder")
+
         # Prefix length and strategy
         if self.prefix_length is not None and (not isinstance(self.prefix_length, int) or self.prefix_length <= 0):
             raise ValueError(f'prefix_length must be either None or a positive integer ({self.prefix_length} has been provided instead)')
@@ -147,6 +502,39 @@ class BaseEncoder(ABC):
             raise TypeError(f'prefix_strategy must be a valid PrefixStrategy: {[e.name for e in PrefixStrategy]}')
 
 
+    def _check_parallel_backend(self, parallel_backend: ParallelBackend) -> None:
+        """
+        Checks and validations on the requested parallel backend.
+        """
+        if not isinstance(parallel_backend, ParallelBackend):
+            raise TypeError(f'parallel_backend must be a valid ParallelBackend: {[e.name for e in ParallelBackend]}')
+
+        if parallel_backend == ParallelBackend.SHARED_MEMORY and not self._supports_coded_encoding():
+            raise ValueError(f'{self.__class__.__name__} does not support the SHARED_MEMORY parallel backend')
+
+
+    def _check_deduplicate_variants(self, deduplicate_variants: bool, n_jobs: int) -> None:
+        """
+        Checks and validations on the deduplicate_variants parameter.
+        """
+        if not isinstance(deduplicate_variants, bool):
+            raise TypeError('deduplicate_variants must be a boolean')
+
+        if deduplicate_variants and not self._supports_coded_encoding():
+            raise ValueError(f'{self.__class__.__name__} does not support variant deduplication')
+
+        if deduplicate_variants and n_jobs != 1:
+            raise ValueError('deduplicate_variants cannot be combined with n_jobs, since variants are encoded in a single process')
+
+
+    def _check_memory_budget(self, memory_budget: int) -> None:
+        """
+        Checks and validations on the memory_budget parameter.
+        """
+        if memory_budget is not None and (not isinstance(memory_budget, int) or memory_budget <= 0):
+            raise ValueError(f'memory_budget must be either None or a positive integer ({memory_budget} has been provided instead)')
+
+
     def _preprocess_log(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Common preprocessing logic shared by all encoders.
@@ -157,7 +545,7 @@ class BaseEncoder(ABC):
         df[self.case_id_key] = df[self.case_id_key].astype(str)
 
         # Cast timestamp column to datetime
-        df[self.timestamp_key] = pd.to_datetime(df[self.timestamp_key], format=self.timestamp_format)
+        df[self.timestamp_key] = parse_timestamps(df[self.timestamp_key], self.timestamp_format)
 
         # Change null values to UNKNOWN_VAL or 0, based on their type
         fill_dict = {}
@@ -184,7 +572,8 @@ class BaseEncoder(ABC):
             self.prefix_length = max_prefix_length_log
 
         # Build activity vocab
-        self.log_activities = df[self.activity_key].unique().tolist() + [self.UNKNOWN_VAL] + [self.PADDING_CAT_VAL]
+        self.value_frequencies = {}
+        self.log_activities = self._build_vocabulary(self.activity_key, df[self.activity_key]) + [self.UNKNOWN_VAL] + [self.PADDING_CAT_VAL]
 
         # Build outcome vocab
         if self.labeling_type == LabelingType.OUTCOME:
@@ -213,12 +602,221 @@ class BaseEncoder(ABC):
                     'std': attribute_values.std().item() if len(attribute_values) > 1 else 0.0,
                 }
             else:
-                attribute_values = attribute_values[attribute_values != self.UNKNOWN_VAL] # remove UNKNOWN_VAL if present, because it'll be added anyway
-                attribute_dict['values'] = attribute_values.tolist() + [self.UNKNOWN_VAL] + [self.PADDING_CAT_VAL]
+                attribute_values = df.loc[df[attribute_name] != self.UNKNOWN_VAL, attribute_name] # remove UNKNOWN_VAL if present, because it'll be added anyway
+                attribute_dict['values'] = self._build_vocabulary(attribute_name, attribute_values) + [self.UNKNOWN_VAL] + [self.PADDING_CAT_VAL]
                 
             self.log_attributes[attribute_name] = attribute_dict
 
     
+    def _build_vocabulary(self, column: str, values: pd.Series) -> list[str]:
+        """
+        Return the distinct values of column, in order of first occurrence, and record their frequencies (number of events) in self.value_frequencies.
+        If column has a vocabulary cap, only the values within it are returned, followed by OTHER_VAL (which the other values are folded into).
+        """
+        frequencies = values.value_counts(sort=False)
+        distinct_values = values.unique()
+        frequencies = frequencies.loc[distinct_values]
+
+        self.value_frequencies[column] = dict(zip(distinct_values.tolist(), frequencies.tolist()))
+
+        max_vocabulary_size, min_value_frequency = self._get_vocabulary_cap(column)
+        if max_vocabulary_size is None and min_value_frequency is None:
+            return distinct_values.tolist()
+
+        is_kept = np.ones(len(frequencies), dtype=bool)
+        if min_value_frequency is not None:
+            is_kept &= frequencies.to_numpy() >= min_value_frequency
+
+        if max_vocabulary_size is not None:
+            # Most frequent values first, ties broken by first occurrence
+            ranks = np.empty(len(frequencies), dtype=np.int64)
+            ranks[np.argsort(-frequencies.to_numpy(), kind='stable')] = np.arange(len(frequencies))
+            is_kept &= ranks < max_vocabulary_size
+
+        return distinct_values[is_kept].tolist() + [self.OTHER_VAL]
+
+
+    def _get_vocabulary_cap(self, column: str) -> tuple[int | None, int | None]:
+        """
+        Return the maximum vocabulary size and the minimum value frequency of column (None if not capped).
+        """
+        caps = []
+        for cap in [self.max_vocabulary_size, self.min_value_frequency]:
+            caps.append(cap.get(column) if isinstance(cap, dict) else cap)
+
+        return tuple(caps)
+
+
+    def _get_capped_columns(self) -> list[str]:
+        """
+        Return the columns (activity column and categorical attributes) whose vocabulary folds rare values into OTHER_VAL.
+        """
+        vocabularies = {self.activity_key: self.log_activities}
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['type'] == 'categorical':
+                vocabularies[attribute_name] = attribute['values']
+
+        return [
+            column for column, vocabulary in vocabularies.items()
+            if self._get_vocabulary_cap(column) != (None, None) and self.OTHER_VAL in vocabulary
+        ]
+
+
+    def _get_folded_values(self, column: str) -> list[str]:
+        """
+        Return the values of column folded into OTHER_VAL: values found when building vocabularies, but not kept in them.
+        """
+        vocabulary = set(self.log_activities if column == self.activity_key else self.log_attributes[column]['values'])
+
+        return [value for value in self.value_frequencies[column] if value not in vocabulary]
+
+
+    def _fold_rare_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace the values folded into OTHER_VAL by vocabulary caps with OTHER_VAL.
+        """
+        folded_columns = {}
+        for column in self._get_capped_columns():
+            folded_columns[column] = df[column].mask(df[column].isin(self._get_folded_values(column)), self.OTHER_VAL)
+
+        return df.assign(**folded_columns)
+
+
+    def _fold_coded_log(self, coded_log: CodedLog) -> CodedLog:
+        """
+        Replace the activities folded into OTHER_VAL by vocabulary caps with OTHER_VAL in coded_log.
+        """
+        if self.activity_key not in self._get_capped_columns():
+            return coded_log
+
+        is_folded = pd.Index(coded_log.activity_values).isin(self._get_folded_values(self.activity_key))
+
+        return dataclasses.replace(coded_log, activity_values=np.where(is_folded, self.OTHER_VAL, coded_log.activity_values))
+
+
+    def _code_log(self, df: pd.DataFrame) -> CodedLog:
+        """
+        Build the integer-coded view of the preprocessed log, with events sorted by case and timestamp.
+        """
+        return CodedLog.from_log(df, self.case_id_key, self.activity_key, self.timestamp_key)
+
+
+    def _activity_vocabulary(self) -> list[str]:
+        """
+        Activities in coding order: coded activities are positions in this list, with PADDING_CAT_VAL last.
+        """
+        return list(dict.fromkeys(self.log_activities))
+
+
+    def _supports_coded_encoding(self) -> bool:
+        """
+        Whether the encoder implements _encode_coded, i.e. it can encode an integer-coded log.
+        """
+        return type(self)._encode_coded is not BaseEncoder._encode_coded
+
+
+    def _coded_width(self) -> int:
+        """
+        Number of columns (of type CODED_DTYPE) written by _encode_coded for every row.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not support coded encoding')
+
+
+    def _encode_coded(self, activities: np.ndarray, parents: np.ndarray, depths: np.ndarray, out: np.ndarray) -> None:
+        """
+        Encoders whose features only depend on the activity sequence can implement this method (together with _coded_width and _coded_features) to encode integer-coded prefixes, which enables ParallelBackend.SHARED_MEMORY.
+        Every row is a prefix: activities contains its last activity (coded as a position in _activity_vocabulary), parents the row of the prefix without its last activity (-1 if none) and depths its length. The encoding of every row must be written in place into out.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not support coded encoding')
+
+
+    def _coded_features(self, out: np.ndarray) -> pd.DataFrame:
+        """
+        Convert the matrix written by _encode_coded into the feature columns of the encoding.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not support coded encoding')
+
+
+    def _report_progress(self, cases: int = 1, rows: int = 0) -> None:
+        """
+        Report that cases more cases have been encoded, producing rows more rows, if a progress callback has been provided.
+        """
+        if self.progress_reporter is not None:
+            self.progress_reporter.advance(cases, rows)
+
+
+    def _encode_variants(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
+        """
+        Encode the prefixes of every variant (distinct sequence of activities) once with _encode_coded, then broadcast them to the cases of the variant.
+        If provided, coded_log must be the coded view of df; otherwise it is built from df.
+        """
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+        activities = coded_log.code_activities(self._activity_vocabulary(), self.UNKNOWN_VAL)
+        case_variants, representatives = group_variants(activities, coded_log.case_offsets)
+
+        # Concatenate the events of the first case of every variant
+        variant_lengths = coded_log.case_lengths[representatives]
+        variant_offsets = np.zeros(len(representatives)+1, dtype=np.int64)
+        np.cumsum(variant_lengths, out=variant_offsets[1:])
+
+        variant_events = sequence_depths(variant_offsets) - 1 + np.repeat(coded_log.case_offsets[representatives], variant_lengths)
+
+        out = np.empty((variant_offsets[-1], self._coded_width()), dtype=self.CODED_DTYPE)
+        self._encode_coded(activities[variant_events], sequence_parents(variant_offsets), sequence_depths(variant_offsets), out)
+
+        # Every event takes the row of the event at the same position in its variant
+        rows = np.repeat(variant_offsets[case_variants], coded_log.case_lengths) + coded_log.positions
+
+        return self._coded_frame(df, coded_log, out[rows])
+
+
+    def _encode_prefix_trie(self, df: pd.DataFrame, coded_log: CodedLog = None) -> tuple[pd.DataFrame, np.ndarray]:
+        """
+        Encode every node of the prefix trie of the log once with _encode_coded. The features of the nodes are returned along with a DataFrame referencing the node of every event in the PREFIX_NODE_KEY column.
+        If provided, coded_log must be the coded view of df; otherwise it is built from df.
+        """
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+        activities = coded_log.code_activities(self._activity_vocabulary(), self.UNKNOWN_VAL)
+        event_nodes, node_activities, node_parents, node_depths = build_prefix_trie(activities, coded_log.case_offsets)
+
+        out = np.empty((len(node_activities), self._coded_width()), dtype=self.CODED_DTYPE)
+        self._encode_coded(node_activities, node_parents, node_depths, out)
+
+        encoded_df = pd.DataFrame({
+            self.case_id_key: coded_log.event_case_ids(),
+            self.timestamp_key: df[self.timestamp_key].iloc[coded_log.order].reset_index(drop=True),
+            self.ORIGINAL_INDEX_KEY: coded_log.index,
+            self.PREFIX_NODE_KEY: event_nodes,
+        })
+
+        return encoded_df, out
+
+
+    def _coded_frame(self, df: pd.DataFrame, coded_log: CodedLog, out: np.ndarray) -> pd.DataFrame:
+        """
+        Build the result of _encode from the matrix written by _encode_coded for the events of coded_log.
+        """
+        encoded_df = pd.DataFrame({
+            self.case_id_key: coded_log.event_case_ids(),
+            self.timestamp_key: df[self.timestamp_key].iloc[coded_log.order].reset_index(drop=True),
+            self.ORIGINAL_INDEX_KEY: coded_log.index,
+        })
+        encoded_df = pd.concat([encoded_df, self._coded_features(out)], axis=1)
+
+        return encoded_df
+
+
+    def _complete_encoding(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Steps applied to the result of _encode once the features of every prefix have been computed (e.g. latest payload and one-hot), whichever way the log has been encoded (serially, in parallel, per variant). By default, nothing is done.
+        """
+        return df
+
+
     def _after_encode(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Common logic to execute right after encoding.
@@ -228,18 +826,109 @@ class BaseEncoder(ABC):
             raise ValueError(f'You must include {self.ORIGINAL_INDEX_KEY} column when implementing your own custom encoder!')
         
         # Sort by case and timestamp
-        df = df.sort_values([self.case_id_key, self.timestamp_key], ascending=[True, True]).reset_index(drop=True)
-
-        # If requested, add columns TimeSinceCaseStart and TimeSincePreviousEvent to dataframe
-        if self.add_time_features:
-            first_timestamp_per_case = df.groupby(self.case_id_key)[self.timestamp_key].transform('min')
+        df = take_rows(df, self._sorted_rows(df, [self.case_id_key, self.timestamp_key]))
 
-            df[self.TIME_SINCE_CS_KEY] = (df[self.timestamp_key] - first_timestamp_per_case).dt.total_seconds()
-            df[self.TIME_SINCE_PE_KEY] = df.groupby(self.case_id_key)[self.timestamp_key].diff().dt.total_seconds()
-            df[self.TIME_SINCE_PE_KEY] = df[self.TIME_SINCE_PE_KEY].fillna(0)
+        # If requested, add time features (e.g. TimeSinceCaseStart and TimeSincePreviousEvent) to dataframe
+        if len(self._get_time_features()) > 0:
+            df = self._add_time_features(df)
 
         return df
 
+
+    def _get_time_features(self) -> list[TimeFeature]:
+        """
+        Time features requested through add_time_features (True stands for TimeSinceCaseStart and TimeSincePreviousEvent).
+        """
+        if self.add_time_features is True:
+            return [TimeFeature.TIME_SINCE_CASE_START, TimeFeature.TIME_SINCE_PREVIOUS_EVENT]
+
+        if self.add_time_features is False:
+            return []
+
+        return list(dict.fromkeys(self.add_time_features))
+
+
+    def _get_time_feature_columns(self) -> list[tuple[str, TimeFeature]]:
+        """
+        Columns added by the requested time features, in order, with the feature they belong to.
+        """
+        keys = {
+            TimeFeature.TIME_SINCE_CASE_START: self.TIME_SINCE_CS_KEY,
+            TimeFeature.TIME_SINCE_PREVIOUS_EVENT: self.TIME_SINCE_PE_KEY,
+            TimeFeature.HOUR_OF_DAY: self.HOUR_OF_DAY_KEY,
+            TimeFeature.DAY_OF_WEEK: self.DAY_OF_WEEK_KEY,
+            TimeFeature.MONTH: self.MONTH_KEY,
+            TimeFeature.TIME_SINCE_MIDNIGHT: self.TIME_SINCE_MIDNIGHT_KEY,
+            TimeFeature.IS_WORKING_DAY: self.IS_WORKING_DAY_KEY,
+            TimeFeature.IS_WORKING_HOURS: self.IS_WORKING_HOURS_KEY,
+            TimeFeature.WORKING_DAYS_SINCE_CASE_START: self.WORKING_DAYS_SINCE_CS_KEY,
+        }
+
+        columns = []
+        for time_feature in self._get_time_features():
+            if time_feature == TimeFeature.INTER_EVENT_TIMES:
+                columns += [(f'{self.INTER_EVENT_TIME_COL_PREFIX_NAME}_{i}', time_feature) for i in range(1, self._get_num_positions()+1)]
+            else:
+                columns.append((keys[time_feature], time_feature))
+
+        return columns
+
+
+    def _add_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the requested time features to df, whose rows are events sorted by case and timestamp.
+        """
+        case_ids = df[self.case_id_key].to_numpy()
+        is_case_start = np.ones(len(df), dtype=bool)
+        is_case_start[1:] = case_ids[1:] != case_ids[:-1]
+        case_offsets = np.append(np.flatnonzero(is_case_start), len(df))
+
+        time_features = self._get_time_features()
+        business_calendar = self.business_calendar if self.business_calendar is not None else BusinessCalendar()
+        values = compute_time_features(
+            timestamps_to_ns(df[self.timestamp_key]),
+            case_offsets,
+            time_features,
+            business_calendar,
+            wall_timestamps=timestamps_to_ns(df[self.timestamp_key], wall_time=True),
+        )
+
+        # Inter-event times are taken at every position of the prefix ending with every event (padding positions get PADDING_NUM_VAL)
+        if TimeFeature.INTER_EVENT_TIMES in time_features:
+            inter_event_times = values[TimeFeature.INTER_EVENT_TIMES]
+            position_events = self._get_position_events(case_offsets)
+            values[TimeFeature.INTER_EVENT_TIMES] = np.where(position_events >= 0, inter_event_times[position_events], self.PADDING_NUM_VAL)
+
+            # Like numerical attributes, all positions are standardized with the statistics of the events of the log
+            if not self.was_frozen:
+                self.numerical_scaling_info[self.INTER_EVENT_TIME_COL_PREFIX_NAME] = {
+                    'mean': inter_event_times.mean().item() if len(inter_event_times) > 0 else 0.0,
+                    'std': inter_event_times.std().item() if len(inter_event_times) > 0 else 0.0,
+                }
+
+        # Values come in the same order as columns, inter-event times taking one column per position
+        time_values = []
+        for time_feature, feature_values in values.items():
+            time_values += list(feature_values.T) if time_feature == TimeFeature.INTER_EVENT_TIMES else [feature_values]
+
+        time_columns = dict(zip([name for name, _ in self._get_time_feature_columns()], time_values))
+
+        return pd.concat([df, pd.DataFrame(time_columns, index=df.index)], axis=1)
+
+
+    def _get_num_positions(self) -> int:
+        """
+        Index encoders, which encode the events of every prefix by position, must return the number of positions (see _get_position_events).
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not encode events by position')
+
+
+    def _get_position_events(self, case_offsets: np.ndarray) -> np.ndarray:
+        """
+        Index encoders must return, for every event of the cases delimited by case_offsets (sorted by case and timestamp), the event at every position of the prefix ending with it (-1 for padding positions), as a matrix with _get_num_positions columns.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not encode events by position')
+
     
     def _label_log(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -309,41 +998,43 @@ class BaseEncoder(ABC):
         Common logic shared by all encoders. The method filters the log with respect to specified prefix_length value.
         """
         # Compute event number in case (starting from 1)
-        df = df.sort_values([self.case_id_key, self.timestamp_key], ascending=[True, True]).reset_index(drop=True)
-        df['event_num_in_case'] = df.groupby(self.case_id_key).cumcount() + 1
+        rows = self._sorted_rows(df, [self.case_id_key, self.timestamp_key])
+        case_ids = pd.Series(df[self.case_id_key].to_numpy()[rows])
+        event_num_in_case = case_ids.groupby(case_ids).cumcount().to_numpy() + 1
 
         if self.prefix_strategy == PrefixStrategy.UP_TO_SPECIFIED:
-            filtered_df = df[df['event_num_in_case'] <= self.prefix_length]
+            rows = rows[event_num_in_case <= self.prefix_length]
         elif self.prefix_strategy == PrefixStrategy.ONLY_SPECIFIED:
-            filtered_df = df[df['event_num_in_case'] == self.prefix_length]
-        else:
-            filtered_df = df
+            rows = rows[event_num_in_case == self.prefix_length]
+
+        return take_rows(df, rows)
 
-        # Drop the helper column
-        filtered_df = filtered_df.drop(columns=['event_num_in_case'])
 
-        return filtered_df
+    def _sorted_rows(self, df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+        """
+        Positions of the rows of df sorted by the provided columns (stable). Only these columns are sorted: rows are then moved with take_rows, which moves sparse columns (e.g. n-gram counts) without densifying them.
+        """
+        return df[columns].reset_index(drop=True).sort_values(columns, kind='stable').index.to_numpy()
 
 
-    def _postprocess_log(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _postprocess_log(self, df: pd.DataFrame, keep_index: bool = False) -> pd.DataFrame:
         """
         Common postprocessing logic shared by all encoders. The method restores original ordering and drops unnecessary data.
+        If keep_index is True, every row is indexed by the index label of its last event in the original log.
         """
-        if self.add_time_features and not self.was_frozen:
-            self.numerical_scaling_info[self.TIME_SINCE_CS_KEY] = {
-                'mean': df[self.TIME_SINCE_CS_KEY].mean(),
-                'std': df[self.TIME_SINCE_CS_KEY].std(ddof=0),
-            }
-            self.numerical_scaling_info[self.TIME_SINCE_PE_KEY] = {
-                'mean': df[self.TIME_SINCE_PE_KEY].mean(),
-                'std': df[self.TIME_SINCE_PE_KEY].std(ddof=0),
-            }
+        # Numerical time features (not boolean ones) are scaled with their own statistics, inter-event times with the statistics computed in _add_time_features
+        for name, time_feature in self._get_time_feature_columns():
+            if time_feature in BOOLEAN_TIME_FEATURES: continue
+
+            scaling_key = self.INTER_EVENT_TIME_COL_PREFIX_NAME if time_feature == TimeFeature.INTER_EVENT_TIMES else name
+            if not self.was_frozen and time_feature != TimeFeature.INTER_EVENT_TIMES:
+                self.numerical_scaling_info[scaling_key] = {
+                    'mean': df[name].mean(),
+                    'std': df[name].std(ddof=0),
+                }
 
-        # Scale time features
-        if self.add_time_features:
             if self.numerical_scaling == NumericalScaling.STANDARDIZATION:
-                df[self.TIME_SINCE_CS_KEY] = (df[self.TIME_SINCE_CS_KEY] - self.numerical_scaling_info[self.TIME_SINCE_CS_KEY]['mean']) / self.numerical_scaling_info[self.TIME_SINCE_CS_KEY]['std']
-                df[self.TIME_SINCE_PE_KEY] = (df[self.TIME_SINCE_PE_KEY] - self.numerical_scaling_info[self.TIME_SINCE_PE_KEY]['mean']) / self.numerical_scaling_info[self.TIME_SINCE_PE_KEY]['std']
+                df[name] = (df[name] - self.numerical_scaling_info[scaling_key]['mean']) / self.numerical_scaling_info[scaling_key]['std']
 
         # Scale label if it is remaining time
         if self.labeling_type == LabelingType.REMAINING_TIME:
@@ -354,21 +1045,31 @@ class BaseEncoder(ABC):
         for attribute_name, attribute_info in self.log_attributes.items():
             if attribute_info['type'] == 'numerical':
                 if self.numerical_scaling == NumericalScaling.STANDARDIZATION:
-                    for col in df.columns:
-                        if attribute_name in col:
-                            df[col] = (df[col] - self.log_attributes[attribute_name]['values']['mean']) / self.log_attributes[attribute_name]['values']['std']
+                    for col in self._get_attribute_columns(df.columns.tolist(), attribute_name):
+                        df[col] = (df[col] - self.log_attributes[attribute_name]['values']['mean']) / self.log_attributes[attribute_name]['values']['std']
+
+        # Restore original ordering, dropping unlabeled rows
+        rows = self._sorted_rows(df, [self.ORIGINAL_INDEX_KEY])
+        if self.labeling_type != LabelingType.NONE:
+            rows = rows[df[self.LABEL_KEY].notna().to_numpy()[rows]]
 
-        # Restore original ordering
-        df = df.sort_values(by=self.ORIGINAL_INDEX_KEY).reset_index(drop=True)
+        df = take_rows(df, rows)
+        if keep_index:
+            df.index = pd.Index(df[self.ORIGINAL_INDEX_KEY].to_numpy())
 
         # Drop unnecessary data
         df = df.drop(columns=[self.timestamp_key, self.ORIGINAL_INDEX_KEY])
-        if self.labeling_type != LabelingType.NONE:
-            df = df.dropna(subset=[self.LABEL_KEY]).reset_index(drop=True)
 
         return df
 
     
+    def _get_attribute_columns(self, columns: list[str], attribute_name: str) -> list[str]:
+        """
+        Columns (amongst the provided ones) holding values of the numerical attribute attribute_name, which are standardized with the statistics of the attribute. By default, all columns whose name contains attribute_name.
+        """
+        return [col for col in columns if attribute_name in col]
+
+
     def _include_latest_payload(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Add latest payload attributes to encoded DataFrame. 
@@ -395,17 +1096,20 @@ class BaseEncoder(ABC):
     
     def _get_activity_value(self, activity_value: str) -> str:
         """
-        Return specified activity_value if present in self.log_activities, otherwise a string representing unknown activity.
+        Return specified activity_value if present in self.log_activities, OTHER_VAL if it was folded by vocabulary caps, otherwise a string representing unknown activity.
         """
         if activity_value in self.log_activities:
             return activity_value
+
+        if self.OTHER_VAL in self.log_activities and activity_value in self.value_frequencies.get(self.activity_key, {}):
+            return self.OTHER_VAL
             
         return self.UNKNOWN_VAL
     
 
     def _get_attribute_value(self, attribute_name: str, attribute_value: str) -> str:
         """
-        Return specified attribute_value if present in self.log_attributes under attribute_name, otherwise a string representing unknown attribute.
+        Return specified attribute_value if present in self.log_attributes under attribute_name, OTHER_VAL if it was folded by vocabulary caps, otherwise a string representing unknown attribute.
         """
         if attribute_name not in self.log_attributes:
             raise ValueError(f'Attribute {attribute_name} not found in log attributes {list(self.log_attributes.keys())}')
@@ -417,6 +1121,9 @@ class BaseEncoder(ABC):
         # Categorical attribute
         if attribute_value in self.log_attributes[attribute_name]['values']:
             return attribute_value
+
+        if self.OTHER_VAL in self.log_attributes[attribute_name]['values'] and attribute_value in self.value_frequencies.get(attribute_name, {}):
+            return self.OTHER_VAL
         
         return self.UNKNOWN_VAL
         
@@ -445,6 +1152,8 @@ class BaseEncoder(ABC):
         print(f" - Log Activities ({len(self.log_activities)}): {self.log_activities}")
         print(f" - Log Attributes ({len(self.log_attributes)}):")
         pprint.pprint(self.log_attributes)
+        if len(self._get_capped_columns()) > 0:
+            print(f" - Values Folded Into {self.OTHER_VAL}: { {column: len(self._get_folded_values(column)) for column in self._get_capped_columns()} }")
 
 
     def save(self, filepath: str) -> None:
@@ -0,0 +1,302 @@
+import os
+import json
+import pickle
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from .coded_log import CodedLog
+
+
+def fingerprint_log(df: pd.DataFrame) -> str:
+    """
+    Return a fingerprint of the content of df (column names, dtypes, index and values).
+    """
+    fingerprint = hashlib.blake2b(digest_size=16)
+    fingerprint.update(repr(df.columns.tolist()).encode('utf-8'))
+    fingerprint.update(repr(df.dtypes.astype(str).tolist()).encode('utf-8'))
+    fingerprint.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+
+    return fingerprint.hexdigest()
+
+
+class PreprocessedLogCache:
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 2 * 1024**3,
+        directory: str = None,
+    ) -> None:
+        """
+        Initialize the PreprocessedLogCache, which stores preprocessed logs (together with their case-sorted, integer-coded view) so that encoding the same log multiple times preprocesses it only once.
+        Entries are keyed by a fingerprint of the log content and by the encoder settings that affect preprocessing. When the cache exceeds max_bytes, least recently used entries are evicted.
+
+        Args:
+            max_bytes: Maximum size of the cache, in bytes.
+            directory: Directory where entries are stored. If not provided, entries are kept in memory.
+        """
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError(f'max_bytes must be a positive integer ({max_bytes} has been provided instead)')
+
+        self.max_bytes = max_bytes
+        self.directory = directory
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+        # Instance variables
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[pd.DataFrame, CodedLog, int]] = OrderedDict()
+
+
+    def get(self, encoder, df: pd.DataFrame) -> tuple[pd.DataFrame, CodedLog]:
+        """
+        Return the preprocessed log and its coded view for df, preprocessing it with encoder if not cached yet.
+
+        Args:
+            encoder: Encoder whose settings are used to preprocess the log.
+            df: DataFrame to preprocess.
+
+        Returns:
+            The preprocessed log (in the same order as df) and its coded view.
+        """
+        key = self._get_key(encoder, df)
+
+        entry = self._load(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+
+        preprocessed_df = encoder._preprocess_log(df)
+        coded_log = encoder._code_log(preprocessed_df)
+        self._store(key, preprocessed_df, coded_log)
+
+        return preprocessed_df, coded_log
+
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        self._entries.clear()
+
+        if self.directory is not None:
+            for filepath in _get_filepaths(self.directory, '.pkl'):
+                os.remove(filepath)
+
+
+    def _get_key(self, encoder, df: pd.DataFrame) -> str:
+        """
+        Combine the fingerprint of df with the encoder settings that affect preprocessing.
+        """
+        settings = repr((
+            encoder.case_id_key,
+            encoder.activity_key,
+            encoder.timestamp_key,
+            encoder.timestamp_format,
+            encoder.attributes,
+        ))
+        key = hashlib.blake2b(digest_size=16)
+        key.update(fingerprint_log(df).encode('utf-8'))
+        key.update(settings.encode('utf-8'))
+
+        return key.hexdigest()
+
+
+    def _load(self, key: str) -> tuple[pd.DataFrame, CodedLog] | None:
+        if self.directory is None:
+            if key not in self._entries:
+                return None
+
+            self._entries.move_to_end(key)
+            preprocessed_df, coded_log, _ = self._entries[key]
+            return preprocessed_df, coded_log
+
+        filepath = os.path.join(self.directory, f'{key}.pkl')
+        if not os.path.exists(filepath):
+            return None
+
+        # File modification time tracks the last use of the entry
+        os.utime(filepath)
+        with open(filepath, 'rb') as f:
+            return pickle.load(f)
+
+
+    def _store(self, key: str, preprocessed_df: pd.DataFrame, coded_log: CodedLog) -> None:
+        if self.directory is None:
+            size = preprocessed_df.memory_usage(index=True, deep=True).sum().item()
+            size += sum(array.nbytes for array in vars(coded_log).values())
+
+            self._entries[key] = (preprocessed_df, coded_log, size)
+            while sum(entry[2] for entry in self._entries.values()) > self.max_bytes and len(self._entries) > 0:
+                self._entries.popitem(last=False)
+            return
+
+        with open(os.path.join(self.directory, f'{key}.pkl'), 'wb') as f:
+            pickle.dump((preprocessed_df, coded_log), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        _evict_files(self.directory, '.pkl', self.max_bytes)
+
+
+class EncodedLogCache:
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_bytes: int = 10 * 1024**3,
+    ) -> None:
+        """
+        Initialize the EncodedLogCache, which stores on disk the logs encoded by frozen encoders, so that encoding the same log again with an identical encoder loads the stored result instead of recomputing it.
+        Entries are keyed by a fingerprint of the log content and by a hash of the encoder configuration and frozen state (e.g. vocabularies, scaling info). Each entry is stored column by column in a binary .npz file; when the directory exceeds max_bytes, least recently used entries are evicted.
+
+        Args:
+            directory: Directory where entries are stored.
+            max_bytes: Maximum size of the directory, in bytes.
+        """
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError(f'max_bytes must be a positive integer ({max_bytes} has been provided instead)')
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Instance variables
+        self.hits = 0
+        self.misses = 0
+
+
+    def encode(self, encoder, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """
+        Return the encoding of df with encoder, loading it from the cache if available and encoding (and storing) it otherwise.
+
+        Args:
+            encoder: Frozen encoder.
+            df: DataFrame to encode.
+            **kwargs: Arguments passed to the encode method of encoder when df is not cached (e.g. n_jobs).
+
+        Returns:
+            The encoded DataFrame.
+        """
+        if not encoder.is_frozen:
+            raise RuntimeError("Encoder must be frozen before caching its encodings. Call with freeze=True during encoding.")
+
+        if 'freeze' in kwargs:
+            raise ValueError('freeze cannot be set, since the encoder is already frozen')
+
+        filepath = os.path.join(self.directory, f'{self._get_key(encoder, df)}.npz')
+
+        if os.path.exists(filepath):
+            self.hits += 1
+
+            # File modification time tracks the last use of the entry
+            os.utime(filepath)
+            return _load_frame(filepath)
+
+        self.misses += 1
+
+        encoded_df = encoder.encode(df, **kwargs)
+
+        # Write to a temporary file first, so that concurrent readers never see a partial entry
+        tmp_filepath = f'{filepath}.{os.getpid()}.tmp'
+        _save_frame(encoded_df, tmp_filepath)
+        os.replace(tmp_filepath, filepath)
+
+        _evict_files(self.directory, '.npz', self.max_bytes)
+
+        return encoded_df
+
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        for filepath in _get_filepaths(self.directory, '.npz'):
+            os.remove(filepath)
+
+
+    def _get_key(self, encoder, df: pd.DataFrame) -> str:
+        """
+        Combine the fingerprint of df with a hash of the encoder class, configuration and frozen state.
+        """
+        # Per-call state does not affect the encoding
+        state = {name: value for name, value in vars(encoder).items() if name not in ['original_df', 'was_frozen', 'stage_metrics', 'progress_reporter']}
+
+        key = hashlib.blake2b(digest_size=16)
+        key.update(fingerprint_log(df).encode('utf-8'))
+        key.update(type(encoder).__qualname__.encode('utf-8'))
+        key.update(repr(sorted(state.items())).encode('utf-8'))
+
+        return key.hexdigest()
+
+
+def _get_filepaths(directory: str, extension: str) -> list[str]:
+    return [os.path.join(directory, filename) for filename in os.listdir(directory) if filename.endswith(extension)]
+
+
+def _evict_files(directory: str, extension: str, max_bytes: int) -> None:
+    """
+    Remove the least recently used files with the given extension until they fit in max_bytes.
+    """
+    filepaths = _get_filepaths(directory, extension)
+    filepaths.sort(key=os.path.getmtime)
+
+    total_size = sum(os.path.getsize(filepath) for filepath in filepaths)
+    for filepath in filepaths:
+        if total_size <= max_bytes:
+            break
+
+        total_size -= os.path.getsize(filepath)
+        os.remove(filepath)
+
+
+def _save_frame(df: pd.DataFrame, filepath: str) -> None:
+    """
+    Save df column by column in a .npz file, together with the metadata needed to restore columns, dtypes and index.
+    """
+    arrays = {'index': df.index.to_numpy()}
+    for i, column in enumerate(df.columns):
+        values = df[column]
+
+        # Categorical columns are stored as codes, with their categories, so that unused categories and their order are kept
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[f'column_{i}'] = values.cat.codes.to_numpy()
+            arrays[f'categories_{i}'] = values.cat.categories.to_numpy()
+        # Columns holding only strings are stored as fixed-width unicode arrays, other object columns (e.g. arrays) are pickled
+        elif pd.api.types.infer_dtype(values, skipna=False) == 'string' and not values.isna().any():
+            arrays[f'column_{i}'] = values.to_numpy(dtype=str)
+        else:
+            arrays[f'column_{i}'] = values.to_numpy()
+
+    metadata = {
+        'columns': df.columns.tolist(),
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'ordered': {i: values.dtype.ordered for i, (_, values) in enumerate(df.items()) if isinstance(values.dtype, pd.CategoricalDtype)},
+        'index_name': df.index.name,
+    }
+
+    with open(filepath, 'wb') as f:
+        np.savez(f, metadata=np.array(json.dumps(metadata)), **arrays)
+
+
+def _load_frame(filepath: str) -> pd.DataFrame:
+    """
+    Load a DataFrame saved by _save_frame.
+    """
+    with np.load(filepath, allow_pickle=True) as arrays:
+        metadata = json.loads(arrays['metadata'].item())
+        index = pd.Index(arrays['index'], name=metadata['index_name'])
+
+        columns = {}
+        for i, (column, dtype) in enumerate(zip(metadata['columns'], metadata['dtypes'])):
+            if str(i) in metadata['ordered']:
+                values = pd.Categorical.from_codes(arrays[f'column_{i}'], categories=arrays[f'categories_{i}'], ordered=metadata['ordered'][str(i)])
+                columns[column] = pd.Series(values, index=index)
+            else:
+                columns[column] = pd.Series(arrays[f'column_{i}'], index=index).astype(dtype)
+
+    return pd.DataFrame(columns, index=index)
@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from typing import Iterator
+import numpy as np
+import pandas as pd
+
+@dataclass
+class CodedLog:
+    """
+    Integer-coded view of a preprocessed log, with events sorted by case and timestamp (cases are sorted by case id, like in groupby).
+
+    Attributes:
+        order: Positions (in the preprocessed log) of the sorted events.
+        index: Index labels (in the preprocessed log) of the sorted events.
+        case_ids: Case id of every case.
+        case_offsets: Position of the first event of every case in the sorted events, followed by the total number of events.
+        timestamps: Timestamps of the sorted events, as nanoseconds since epoch.
+        activity_codes: Activities of the sorted events, coded as positions in activity_values.
+        activity_values: Distinct activities of the log.
+    """
+    order: np.ndarray
+    index: np.ndarray
+    case_ids: np.ndarray
+    case_offsets: np.ndarray
+    timestamps: np.ndarray
+    activity_codes: np.ndarray
+    activity_values: np.ndarray
+
+
+    @classmethod
+    def from_log(cls, df: pd.DataFrame, case_id_key: str, activity_key: str, timestamp_key: str) -> 'CodedLog':
+        """
+        Build the coded view of the preprocessed log df.
+        """
+        case_codes, case_ids = pd.factorize(df[case_id_key], sort=True)
+        timestamps = pd.DatetimeIndex(df[timestamp_key]).as_unit('ns').asi8
+
+        # lexsort is stable, so events with the same timestamp keep their original order
+        order = np.lexsort((timestamps, case_codes))
+
+        case_offsets = np.zeros(len(case_ids)+1, dtype=np.int64)
+        np.cumsum(np.bincount(case_codes, minlength=len(case_ids)), out=case_offsets[1:])
+
+        activity_codes, activity_values = pd.factorize(df[activity_key].to_numpy()[order])
+
+        return cls(
+            order=order,
+            index=df.index.to_numpy()[order],
+            case_ids=np.asarray(case_ids, dtype=object),
+            case_offsets=case_offsets,
+            timestamps=timestamps[order],
+            activity_codes=activity_codes,
+            activity_values=np.asarray(activity_values, dtype=object),
+        )
+
+
+    @property
+    def num_events(self) -> int:
+        return len(self.order)
+
+
+    @property
+    def num_cases(self) -> int:
+        return len(self.case_ids)
+
+
+    @property
+    def case_lengths(self) -> np.ndarray:
+        return np.diff(self.case_offsets)
+
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Position of every event in its case (starting from 0).
+        """
+        return sequence_depths(self.case_offsets) - 1
+
+
+    @property
+    def depths(self) -> np.ndarray:
+        """
+        Length of the prefix ending with every event.
+        """
+        return sequence_depths(self.case_offsets)
+
+
+    @property
+    def parents(self) -> np.ndarray:
+        """
+        Position of the previous event of the same case, or -1 for the first event of a case.
+        """
+        return sequence_parents(self.case_offsets)
+
+
+    def event_case_ids(self) -> np.ndarray:
+        """
+        Case id of every sorted event.
+        """
+        return np.repeat(self.case_ids, self.case_lengths)
+
+
+    def code_activities(self, vocabulary: list[str], unknown_value: str) -> np.ndarray:
+        """
+        Code the activities of the sorted events as positions in vocabulary. Activities not in vocabulary get the position of unknown_value.
+        """
+        return code_values(self.activity_values, vocabulary, unknown_value)[self.activity_codes]
+
+
+    def iter_cases(self, df: pd.DataFrame) -> Iterator[tuple[object, pd.DataFrame]]:
+        """
+        Iterate over the cases of the preprocessed log df (the log coded by this view), yielding the case id and the sorted events of every case, like grouping df by case and sorting every case by timestamp.
+        """
+        events = df.iloc[self.order]
+
+        for case_id, start, stop in zip(self.case_ids, self.case_offsets[:-1].tolist(), self.case_offsets[1:].tolist()):
+            yield case_id, events.iloc[start:stop]
+
+
+def code_values(values: np.ndarray, vocabulary: list[str], unknown_value: str) -> np.ndarray:
+    """
+    Code values as positions in vocabulary (first occurrence). Values not in vocabulary get the position of unknown_value.
+    """
+    positions = {}
+    for i, value in enumerate(vocabulary):
+        positions.setdefault(value, i)
+
+    unknown_code = positions[unknown_value]
+
+    return np.array([positions.get(value, unknown_code) for value in values], dtype=np.int64)
+
+
+def sequence_depths(offsets: np.ndarray) -> np.ndarray:
+    """
+    Length of the prefix ending with every element of the concatenated sequences delimited by offsets (see CodedLog.case_offsets).
+    """
+    return np.arange(offsets[-1]) - np.repeat(offsets[:-1], np.diff(offsets)) + 1
+
+
+def sequence_parents(offsets: np.ndarray) -> np.ndarray:
+    """
+    Position of the previous element in the same sequence, or -1 for the first element of a sequence, for the concatenated sequences delimited by offsets.
+    """
+    parents = np.arange(-1, offsets[-1]-1)
+    parents[offsets[:-1][np.diff(offsets) > 0]] = -1
+
+    return parents
+
+
+def prefix_positions(offsets: np.ndarray, length: int) -> np.ndarray:
+    """
+    Positions of the first length elements of the prefix ending with every element of the concatenated sequences delimited by offsets, left-aligned: positions after the end of a prefix are -1.
+    """
+    depths = sequence_depths(offsets)
+    columns = np.arange(length)
+
+    positions = (np.arange(offsets[-1]) - depths + 1)[:, None] + columns
+    positions[columns >= depths[:, None]] = -1
+
+    return positions
+
+
+def sliding_windows(offsets: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Positions of the last window_size elements up to every element (itself included) of the concatenated sequences delimited by offsets, right-aligned: positions before the start of a sequence are -1.
+    Windows are strided views over the positions, with window_size-1 padding positions before every sequence, so that their cost only depends on window_size.
+    """
+    lengths = np.diff(offsets)
+    positions = np.arange(offsets[-1])
+    sequence_numbers = np.repeat(np.arange(len(lengths)), lengths)
+
+    padded_positions = np.full(offsets[-1] + len(lengths) * (window_size-1), -1, dtype=np.int64)
+    padded_positions[positions + (sequence_numbers+1) * (window_size-1)] = positions
+
+    # The window ending with every element starts window_size-1 positions before it
+    return np.lib.stride_tricks.sliding_window_view(padded_positions, window_size)[positions + sequence_numbers * (window_size-1)]
+
+
+def group_variants(activities: np.ndarray, case_offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Group the cases delimited by case_offsets by variant, i.e. by their sequence of coded activities.
+
+    Returns:
+        The variant of every case (variants are numbered in order of first occurrence) and the first case of every variant.
+    """
+    variants = {}
+    case_variants = np.empty(len(case_offsets)-1, dtype=np.int64)
+
+    for case, (start, stop) in enumerate(zip(case_offsets[:-1].tolist(), case_offsets[1:].tolist())):
+        case_variants[case] = variants.setdefault(activities[start:stop].tobytes(), len(variants))
+
+    _, representatives = np.unique(case_variants, return_index=True)
+
+    return case_variants, representatives
+
+
+def build_prefix_trie(activities: np.ndarray, case_offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the trie of the prefixes of the cases delimited by case_offsets, whose events have the given coded activities. Every node of the trie is a distinct prefix.
+
+    Returns:
+        The node of every event (i.e. of the prefix ending with it), and the last activity, parent node (-1 for roots) and depth of every node. Nodes are numbered level by level, so parents always come before their children.
+    """
+    event_parents = sequence_parents(case_offsets)
+    event_nodes = np.empty(len(activities), dtype=np.int64)
+    num_activities = activities.max().item() + 1 if len(activities) > 0 else 1
+
+    node_activities, node_parents, node_depths = [], [], []
+    num_nodes = 0
+
+    for depth, rows in iter_levels(sequence_depths(case_offsets)):
+        parent_nodes = np.where(event_parents[rows] >= 0, event_nodes[event_parents[rows]], -1)
+
+        # Events of the same level with the same parent node and activity end the same prefix
+        keys, inverse = np.unique((parent_nodes + 1) * num_activities + activities[rows], return_inverse=True)
+        event_nodes[rows] = num_nodes + inverse
+
+        node_activities.append(keys % num_activities)
+        node_parents.append(keys // num_activities - 1)
+        node_depths.append(np.full(len(keys), depth, dtype=np.int64))
+        num_nodes += len(keys)
+
+    if num_nodes == 0:
+        return event_nodes, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    return event_nodes, np.concatenate(node_activities), np.concatenate(node_parents), np.concatenate(node_depths)
+
+
+def iter_levels(depths: np.ndarray) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Iterate over the rows of a prefix forest (events of cases, or nodes of a prefix trie) level by level, yielding each depth with the rows at that depth. Parents always come in an earlier level than their children.
+    """
+    if len(depths) == 0:
+        return
+
+    order = np.argsort(depths, kind='stable')
+    sorted_depths = depths[order]
+    level_bounds = np.flatnonzero(np.diff(sorted_depths)) + 1
+
+    for rows in np.split(order, level_bounds):
+        yield int(depths[rows[0]]), rows
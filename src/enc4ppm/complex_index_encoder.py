@@ -1,44 +1,63 @@
+from typing import Callable
+import numpy as np
 import pandas as pd
 
 from .base_encoder import BaseEncoder
-from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy
-from .helpers import one_hot
+from .coded_log import CodedLog, prefix_positions, sliding_windows
+from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy, ParallelBackend, TimeFeature
+from .cache import PreprocessedLogCache
+from .time_features import BusinessCalendar
+from .instrumentation import StageMetrics, EncodingProgress
+from .helpers import one_hot, hash_buckets
 
 class ComplexIndexEncoder(BaseEncoder):
+    HASH_BUCKET_PREFIX_NAME = 'Bucket'
+
     def __init__(
         self,
         include_timestamps: bool = False,
         *,
+        hashed_attributes: dict[str, int] = {},
+        window_size: int = None,
+
         labeling_type: LabelingType = LabelingType.NEXT_ACTIVITY,
         attributes: list[str] | str = [],
         categorical_encoding: CategoricalEncoding = CategoricalEncoding.STRING,
         numerical_scaling: NumericalScaling = NumericalScaling.NONE,
         prefix_length: int = None,
         prefix_strategy: PrefixStrategy = PrefixStrategy.UP_TO_SPECIFIED,
-        add_time_features: bool = False,
+        add_time_features: bool | list[TimeFeature] = False,
         timestamp_format: str = None,
         case_id_key: str = 'case:concept:name',
         activity_key: str = 'concept:name',
         timestamp_key: str = 'time:timestamp',
         outcome_key: str = 'outcome',
+        max_vocabulary_size: int | dict[str, int] = None,
+        min_value_frequency: int | dict[str, int] = None,
+        business_calendar: BusinessCalendar = None,
     ) -> None:
         """
         Initialize the ComplexIndexEncoder.
 
         Args:
             include_timestamps: Whether to add Timestamp columns or not.
+            hashed_attributes: Categorical attributes to encode with the hashing trick, mapped to their number of buckets. Values of these attributes are replaced by the bucket a stable hash of the value falls in (named 'Bucket_1', 'Bucket_2', ...), so that their columns do not depend on the number of distinct values (e.g. with one-hot encoding, every position takes as many columns as buckets) and values not seen when the encoder was frozen need no vocabulary lookup. Different values may share a bucket.
+            window_size: If provided, every prefix is encoded by its last window_size events only (sliding window), right-aligned: columns with suffix _<window_size> hold the last event of the prefix, and only prefixes shorter than window_size are padded. Columns then depend on window_size instead of prefix_length, which still determines which prefixes are encoded.
             labeling_type: Label type to apply to examples.
             attributes: Which attributes to consider. Can be a list of the attributes to consider or the string 'all' (all attributes found in the log will be encoded).
             categorical_encoding: How to encode categorical features. They can either remain strings (CategoricalEncoding.STRING) or be converted to one-hot vectors splitted across multiple columns (CategoricalEncoding.ONE_HOT).
             numerical_scaling: How to scale numerical features. They can be standardized (NumericalScaling.STANDARDIZATION) or left as-is (NumericalScaling.NONE).
             prefix_length: Maximum prefix length to consider: longer prefixes will be discarded, shorter prefixes may be discarded depending on prefix_strategy parameter. If not provided, defaults to maximum prefix length found in log. If provided, it must be a non-zero positive int number.
             prefix_strategy: Whether to consider prefix lengths from 1 to prefix_length (PrefixStrategy.UP_TO_SPECIFIED) or only the specified prefix_length (PrefixStrategy.ONLY_SPECIFIED).
-            add_time_features: Whether to add time features (time since case start and time since last event) to the encoding.
-            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data.
+            add_time_features: Time features to add to the encoding, as a list of TimeFeature (e.g. hour of day, day of week, time since case start), or True for time since case start and time since last event. TimeFeature.INTER_EVENT_TIMES adds the time since the previous event at every position of the prefix (columns InterEventTime_<i>, padding positions get 0).
+            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data. Numeric timestamps are read as time since epoch (unit inferred from their magnitude), and datetime columns (including Arrow timestamps) are used as they are.
             case_id_key: Column name for case identifiers.
             activity_key: Column name for activity names.
             timestamp_key: Column name for timestamps.
             outcome_key: Column name for outcome predition.
+            max_vocabulary_size: Maximum number of distinct values kept in the vocabulary of activities and categorical attributes (the most frequent ones), when the vocabulary is built (i.e. until the encoder is frozen). Other values are folded into the OTHER value. Can be an int, or a dict mapping column names (activity_key or attribute names) to their maximum. Frequencies of all values are recorded in the value_frequencies attribute. If not provided, all values are kept.
+            min_value_frequency: Minimum number of events a value must occur in to be kept in the vocabulary of activities and categorical attributes. Rarer values are folded into the OTHER value. Can be an int or a dict, as max_vocabulary_size. If not provided, all values are kept.
+            business_calendar: Working days and hours used by business-calendar time features (e.g. TimeFeature.IS_WORKING_HOURS). If not provided, Monday to Friday from 9 to 17, without holidays.
         """
         super().__init__(
             labeling_type,
@@ -53,9 +72,14 @@ class ComplexIndexEncoder(BaseEncoder):
             activity_key,
             timestamp_key,
             outcome_key,
+            max_vocabulary_size,
+            min_value_frequency,
+            business_calendar,
         )
 
         self.include_timestamps = include_timestamps
+        self.hashed_attributes = hashed_attributes
+        self.window_size = window_size
 
 
     def encode(
@@ -63,6 +87,13 @@ class ComplexIndexEncoder(BaseEncoder):
         df: pd.DataFrame,
         *,
         freeze: bool = False,
+        n_jobs: int = 1,
+        parallel_backend: ParallelBackend = ParallelBackend.PROCESS,
+        preprocessing_cache: PreprocessedLogCache = None,
+        instrument: bool = False,
+        stage_callback: Callable[[StageMetrics], None] = None,
+        progress_callback: Callable[[EncodingProgress], None] = None,
+        memory_budget: int = None,
     ) -> pd.DataFrame:
         """
         Encode the provided DataFrame with complex-index encoding and apply the specified labeling.
@@ -70,19 +101,105 @@ class ComplexIndexEncoder(BaseEncoder):
         Args:
             df: DataFrame to encode.
             freeze: Freeze encoder with provided parameters. Usually set to True when encoding the train log, False otherwise. Required if you want to later save the encoder to a file.
+            n_jobs: Number of worker processes used to encode cases in parallel. Set it to -1 to use all available CPUs.
+            parallel_backend: How cases are exchanged with worker processes when n_jobs is not 1. ComplexIndexEncoder only supports ParallelBackend.PROCESS (partitions and results are pickled).
+            preprocessing_cache: Cache of preprocessed logs. If provided, the preprocessed log is taken from the cache (or stored into it), so that encoding the same log multiple times preprocesses it only once.
+            instrument: Whether to measure every stage of the encoding (duration, rows and columns in and out, peak allocated memory). Measures are stored in the stage_metrics attribute of the encoder as StageMetrics objects.
+            stage_callback: Function called with the StageMetrics of every stage as soon as it ends. Setting it enables instrument.
+            progress_callback: Function called with the EncodingProgress of the encoding (current stage, cases encoded out of the total, rows produced) at the start of every stage and whenever cases are encoded (after every case, or every partition when n_jobs is not 1).
+            memory_budget: Maximum memory of the encoded log, in bytes. If the encoded log is projected to take more (see estimate), a MemoryError is raised before encoding.
 
         Returns:
             The encoded DataFrame.
         """
-        return super()._encode_template(df, freeze=freeze)
+        return super()._encode_template(
+            df,
+            freeze=freeze,
+            n_jobs=n_jobs,
+            parallel_backend=parallel_backend,
+            preprocessing_cache=preprocessing_cache,
+            instrument=instrument,
+            stage_callback=stage_callback,
+            progress_callback=progress_callback,
+            memory_budget=memory_budget,
+        )
     
 
-    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _check_parameters(self, df: pd.DataFrame) -> None:
+        super()._check_parameters(df)
+
+        if not isinstance(self.hashed_attributes, dict):
+            raise TypeError('hashed_attributes must be a dict mapping attribute names to numbers of buckets')
+
+        for attribute_name, num_buckets in self.hashed_attributes.items():
+            if self.attributes != 'all' and attribute_name not in self.attributes:
+                raise ValueError(f"hashed_attributes contains attribute '{attribute_name}', which is not in attributes")
+
+            if attribute_name not in self.original_df.columns:
+                raise ValueError(f"hashed_attributes contains attribute '{attribute_name}', which cannot be found in the log")
+
+            if not isinstance(num_buckets, int) or num_buckets <= 0:
+                raise ValueError(f"Number of buckets of attribute '{attribute_name}' must be a positive integer ({num_buckets} has been provided instead)")
+
+        if self.window_size is not None and (not isinstance(self.window_size, int) or self.window_size <= 0):
+            raise ValueError(f'window_size must be either None or a positive integer ({self.window_size} has been provided instead)')
+
+
+    def _extract_log_data(self, df: pd.DataFrame) -> None:
+        super()._extract_log_data(df)
+
+        # Hashed attributes take their buckets as values, which do not need UNKNOWN_VAL
+        for attribute_name, num_buckets in self.hashed_attributes.items():
+            if self.log_attributes[attribute_name]['type'] != 'categorical':
+                raise ValueError(f"hashed_attributes contains attribute '{attribute_name}', which is not categorical")
+
+            self.log_attributes[attribute_name]['values'] = self._get_bucket_values(num_buckets) + [self.PADDING_CAT_VAL]
+            self.log_attributes[attribute_name]['buckets'] = num_buckets
+
+
+    def _get_bucket_values(self, num_buckets: int) -> list[str]:
+        return [f'{self.HASH_BUCKET_PREFIX_NAME}_{i}' for i in range(1, num_buckets+1)]
+
+
+    def _hash_attributes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace the values of hashed attributes with their buckets.
+        """
+        hashed_columns = {}
+        for attribute_name, num_buckets in self.hashed_attributes.items():
+            bucket_values = np.asarray(self._get_bucket_values(num_buckets), dtype=object)
+            hashed_columns[attribute_name] = bucket_values[hash_buckets(df[attribute_name], num_buckets)]
+
+        return df.assign(**hashed_columns)
+
+
+    def _get_num_positions(self) -> int:
+        """
+        Number of columns of every event-level feature: window_size for sliding windows, prefix_length otherwise.
+        """
+        return self.window_size if self.window_size is not None else self.prefix_length
+
+
+    def _get_position_events(self, case_offsets: np.ndarray) -> np.ndarray:
+        if self.window_size is not None:
+            return sliding_windows(case_offsets, self.window_size)
+
+        return prefix_positions(case_offsets, self.prefix_length)
+
+
+    def _encode(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+        df = self._hash_attributes(df)
+
+        if self.window_size is not None:
+            return self._encode_windows(df, coded_log)
+
         rows = []
-        grouped = df.groupby(self.case_id_key)
 
-        for case_id, case_events in grouped:
-            case_events = case_events.sort_values(self.timestamp_key).reset_index()
+        for case_id, case_events in coded_log.iter_cases(df):
+            case_events = case_events.reset_index()
 
             for prefix_length in range(1, len(case_events)+1):
                 row = {
@@ -127,15 +244,83 @@ class ComplexIndexEncoder(BaseEncoder):
                 
                 rows.append(row)
 
+            self._report_progress(rows=len(case_events))
+
         encoded_df = pd.DataFrame(rows)
 
+        return encoded_df
+
+
+    def _encode_windows(self, df: pd.DataFrame, coded_log: CodedLog) -> pd.DataFrame:
+        """
+        Encode every prefix by its last window_size events, taken from strided windows over the events of its case (sorted by timestamp).
+        """
+        sorted_df = df.iloc[coded_log.order].reset_index(drop=True)
+        windows = sliding_windows(coded_log.case_offsets, self.window_size)
+
+        def take_windows(values: np.ndarray, column_name: str, padding_value) -> dict[str, np.ndarray]:
+            is_padding = windows < 0
+            return {
+                # The last event of a window is never padding, so it keeps the dtype of values
+                f'{column_name}_{i}': values[windows[:, i-1]] if i == self.window_size else np.where(is_padding[:, i-1], padding_value, values[windows[:, i-1]])
+                for i in range(1, self.window_size+1)
+            }
+
+        encoded_columns = {
+            self.case_id_key: coded_log.event_case_ids(),
+            self.timestamp_key: sorted_df[self.timestamp_key],
+            self.ORIGINAL_INDEX_KEY: coded_log.index,
+        }
+
+        # Add trace attributes
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'trace': continue
+
+            if attribute['type'] == 'categorical':
+                encoded_columns[attribute_name] = self._get_attribute_values(attribute_name, sorted_df[attribute_name])
+            else:
+                encoded_columns[attribute_name] = sorted_df[attribute_name]
+
+        # Add activities
+        activity_values = np.asarray(self._activity_vocabulary(), dtype=object)
+        activities = activity_values[coded_log.code_activities(self._activity_vocabulary(), self.UNKNOWN_VAL)]
+        encoded_columns.update(take_windows(activities, self.EVENT_COL_PREFIX_NAME, self.PADDING_CAT_VAL))
+
+        # Add timestamps (NaT for padding)
+        if self.include_timestamps:
+            timestamps = sorted_df[self.timestamp_key].array
+            for i in range(1, self.window_size+1):
+                encoded_columns[f'{self.TIMESTAMP_COL_PREFIX_NAME}_{i}'] = timestamps.take(windows[:, i-1], allow_fill=True)
+
+        # Add event attributes
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'event': continue
+
+            if attribute['type'] == 'categorical':
+                encoded_columns.update(take_windows(self._get_attribute_values(attribute_name, sorted_df[attribute_name]), attribute_name, self.PADDING_CAT_VAL))
+            else:
+                encoded_columns.update(take_windows(sorted_df[attribute_name].to_numpy(), attribute_name, self.PADDING_NUM_VAL))
+
+        self._report_progress(cases=coded_log.num_cases, rows=coded_log.num_events)
+
+        return pd.DataFrame(encoded_columns)
+
+
+    def _get_attribute_values(self, attribute_name: str, values: pd.Series) -> np.ndarray:
+        """
+        Vectorized _get_attribute_value over the values of a categorical attribute.
+        """
+        return values.where(values.isin(self.log_attributes[attribute_name]['values']), self.UNKNOWN_VAL).to_numpy(dtype=object)
+
+
+    def _complete_encoding(self, encoded_df: pd.DataFrame) -> pd.DataFrame:
         # Transform to one-hot if requested
         if self.categorical_encoding == CategoricalEncoding.ONE_HOT:
             categorical_columns = []
             categorical_columns_possible_values = []
             
             # Activity columns
-            for i in range(1, self.prefix_length+1):
+            for i in range(1, self._get_num_positions()+1):
                 categorical_columns.append(f'{self.EVENT_COL_PREFIX_NAME}_{i}')
                 categorical_columns_possible_values.append(self.log_activities)
 
@@ -143,7 +328,7 @@ class ComplexIndexEncoder(BaseEncoder):
             for attribute_name, attribute in self.log_attributes.items():
                 if attribute['type'] == 'categorical':
                     if attribute['scope'] == 'event':
-                        for i in range(1, self.prefix_length+1):
+                        for i in range(1, self._get_num_positions()+1):
                             categorical_columns.append(f'{attribute_name}_{i}')
                             categorical_columns_possible_values.append(attribute['values'])
                     else:
@@ -161,3 +346,52 @@ class ComplexIndexEncoder(BaseEncoder):
             )
 
         return encoded_df
+
+
+    def _estimate_feature_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        columns = []
+
+        # Trace attributes columns (without PADDING value)
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'trace': continue
+
+            if attribute['type'] == 'numerical':
+                columns.append((attribute_name, df[attribute_name].dtype, None))
+            else:
+                columns.append(self._estimate_categorical_column(attribute_name, [value for value in attribute['values'] if value != self.PADDING_CAT_VAL]))
+
+        # Activity columns
+        columns += [self._estimate_categorical_column(f'{self.EVENT_COL_PREFIX_NAME}_{i}', self._activity_vocabulary()) for i in range(1, self._get_num_positions()+1)]
+
+        # Timestamp columns
+        if self.include_timestamps:
+            columns += [(f'{self.TIMESTAMP_COL_PREFIX_NAME}_{i}', df[self.timestamp_key].dtype, None) for i in range(1, self._get_num_positions()+1)]
+
+        # Event attributes columns
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'event': continue
+
+            for i in range(1, self._get_num_positions()+1):
+                if attribute['type'] == 'numerical':
+                    # Columns of events that can be padding (with PADDING_NUM_VAL) are float
+                    is_never_padding = i == (self.window_size if self.window_size is not None else 1)
+                    columns.append((f'{attribute_name}_{i}', df[attribute_name].dtype if is_never_padding else np.dtype(np.float64), None))
+                else:
+                    columns.append(self._estimate_categorical_column(f'{attribute_name}_{i}', attribute['values']))
+
+        if self.categorical_encoding == CategoricalEncoding.ONE_HOT:
+            # Same order as _complete_encoding: activities, then categorical attributes
+            columns_possible_values = {f'{self.EVENT_COL_PREFIX_NAME}_{i}': self.log_activities for i in range(1, self._get_num_positions()+1)}
+
+            for attribute_name, attribute in self.log_attributes.items():
+                if attribute['type'] != 'categorical': continue
+
+                if attribute['scope'] == 'event':
+                    for i in range(1, self._get_num_positions()+1):
+                        columns_possible_values[f'{attribute_name}_{i}'] = attribute['values']
+                else:
+                    columns_possible_values[attribute_name] = [value for value in attribute['values'] if value != self.PADDING_CAT_VAL]
+
+            columns = self._estimate_one_hot_columns(columns, columns_possible_values)
+
+        return columns
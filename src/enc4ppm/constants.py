@@ -21,4 +21,49 @@ class NumericalScaling(Enum):
 
 class PrefixStrategy(Enum):
     UP_TO_SPECIFIED = 'up_to_specified'
-    ONLY_SPECIFIED = 'only_specified'
\ No newline at end of file
+    ONLY_SPECIFIED = 'only_specified'
+
+class ParallelBackend(Enum):
+    PROCESS = 'process'
+    SHARED_MEMORY = 'shared_memory'
+
+
+class CaseLengthDistribution(Enum):
+    UNIFORM = 'uniform'
+    GEOMETRIC = 'geometric'
+    LOGNORMAL = 'lognormal'
+    PARETO = 'pareto'
+
+
+class NumericalDistribution(Enum):
+    NORMAL = 'normal'
+    UNIFORM = 'uniform'
+    LOGNORMAL = 'lognormal'
+
+
+class Aggregation(Enum):
+    COUNT = 'count'
+    SUM = 'sum'
+    MEAN = 'mean'
+    MIN = 'min'
+    MAX = 'max'
+    STD = 'std'
+
+
+class FrequencyEncoding(Enum):
+    COUNT = 'count'
+    PRESENCE = 'presence'
+    PACKED_PRESENCE = 'packed_presence'
+
+
+class TimeFeature(Enum):
+    TIME_SINCE_CASE_START = 'time_since_case_start'
+    TIME_SINCE_PREVIOUS_EVENT = 'time_since_previous_event'
+    HOUR_OF_DAY = 'hour_of_day'
+    DAY_OF_WEEK = 'day_of_week'
+    MONTH = 'month'
+    TIME_SINCE_MIDNIGHT = 'time_since_midnight'
+    INTER_EVENT_TIMES = 'inter_event_times'
+    IS_WORKING_DAY = 'is_working_day'
+    IS_WORKING_HOURS = 'is_working_hours'
+    WORKING_DAYS_SINCE_CASE_START = 'working_days_since_case_start'
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+import pandas as pd
+
+
+@dataclass
+class EncodingEstimate:
+    """
+    Size of the encoding of a log, computed before encoding it (see the estimate method of encoders).
+
+    Attributes:
+        rows: Number of rows of the encoded DataFrame.
+        columns: Columns of the encoded DataFrame, in order.
+        dtypes: Dtype of every column of the encoded DataFrame.
+        bytes_per_dtype: Projected memory of the encoded DataFrame, in bytes, split by dtype.
+        bytes: Projected memory of the encoded DataFrame, in bytes.
+    """
+    rows: int
+    columns: list[str]
+    dtypes: list[str]
+    bytes_per_dtype: dict[str, int]
+    bytes: int
+
+
+def project_column_bytes(dtype, values: list | None = None) -> float:
+    """
+    Return the projected memory of a cell of a column with the given dtype, in bytes.
+    Variable-size columns (e.g. strings) must provide the values they can take: their cells are projected to take the mean memory of these values, as measured by pandas.
+    """
+    if values is None or len(values) == 0:
+        return getattr(dtype, 'itemsize', 8)
+
+    series = pd.Series(values, dtype=dtype)
+
+    return series.memory_usage(index=False, deep=True) / len(series)
+
+
+def build_estimate(rows: int, columns: list[tuple[str, object, list | None]]) -> EncodingEstimate:
+    """
+    Build the EncodingEstimate of an encoding with the given number of rows and columns, described as (name, dtype, values) tuples (see project_column_bytes).
+    """
+    bytes_per_dtype = {}
+    for _, dtype, values in columns:
+        bytes_per_dtype[str(dtype)] = bytes_per_dtype.get(str(dtype), 0) + project_column_bytes(dtype, values) * rows
+
+    bytes_per_dtype = {dtype: round(dtype_bytes) for dtype, dtype_bytes in bytes_per_dtype.items()}
+
+    return EncodingEstimate(
+        rows=rows,
+        columns=[name for name, _, _ in columns],
+        dtypes=[str(dtype) for _, dtype, _ in columns],
+        bytes_per_dtype=bytes_per_dtype,
+        bytes=sum(bytes_per_dtype.values()),
+    )
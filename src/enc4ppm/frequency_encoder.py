@@ -1,14 +1,23 @@
+from typing import Callable
+import numpy as np
 import pandas as pd
 
 from .base_encoder import BaseEncoder
-from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy
+from .coded_log import CodedLog, iter_levels
+from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy, ParallelBackend, TimeFeature, FrequencyEncoding
+from .cache import PreprocessedLogCache
+from .time_features import BusinessCalendar
+from .instrumentation import StageMetrics, EncodingProgress
 from .helpers import one_hot
 
 class FrequencyEncoder(BaseEncoder):
+    PACKED_PRESENCE_COL_PREFIX_NAME = 'PresenceBits'
+
     def __init__(
         self,
         *,
         include_latest_payload: bool = False,
+        frequency_encoding: FrequencyEncoding = FrequencyEncoding.COUNT,
 
         labeling_type: LabelingType = LabelingType.NEXT_ACTIVITY,
         attributes: list[str] | str = [],
@@ -16,30 +25,37 @@ class FrequencyEncoder(BaseEncoder):
         numerical_scaling: NumericalScaling = NumericalScaling.NONE,
         prefix_length: int = None,
         prefix_strategy: PrefixStrategy = PrefixStrategy.UP_TO_SPECIFIED,
-        add_time_features: bool = False,
+        add_time_features: bool | list[TimeFeature] = False,
         timestamp_format: str = None,
         case_id_key: str = 'case:concept:name',
         activity_key: str = 'concept:name',
         timestamp_key: str = 'time:timestamp',
         outcome_key: str = 'outcome',
+        max_vocabulary_size: int | dict[str, int] = None,
+        min_value_frequency: int | dict[str, int] = None,
+        business_calendar: BusinessCalendar = None,
     ) -> None:
         """
         Initialize the FrequencyEncoder.
 
         Args:
             include_latest_payload: Whether to include (True) or not (False) the latest values of trace and event attributes. The attributes to consider can be specified through the `attributes` parameter.
+            frequency_encoding: How to encode activities. Each activity can be encoded by the number of times it occurs in the prefix (FrequencyEncoding.COUNT), by a boolean flag telling whether it occurs in the prefix (FrequencyEncoding.PRESENCE), or by the same flags packed 8 per uint8 column (FrequencyEncoding.PACKED_PRESENCE, see unpack_presence).
             labeling_type: Label type to apply to examples.
             attributes: Which attributes to consider. Can be a list of the attributes to consider or the string 'all' (all attributes found in the log will be encoded).
             categorical_encoding: How to encode categorical features. They can either remain strings (CategoricalEncoding.STRING) or be converted to one-hot vectors splitted across multiple columns (CategoricalEncoding.ONE_HOT).
             numerical_scaling: How to scale numerical features. They can be standardized (NumericalScaling.STANDARDIZATION) or left as-is (NumericalScaling.NONE).
             prefix_length: Maximum prefix length to consider: longer prefixes will be discarded, shorter prefixes may be discarded depending on prefix_strategy parameter. If not provided, defaults to maximum prefix length found in log. If provided, it must be a non-zero positive int number.
             prefix_strategy: Whether to consider prefix lengths from 1 to prefix_length (PrefixStrategy.UP_TO_SPECIFIED) or only the specified prefix_length (PrefixStrategy.ONLY_SPECIFIED).
-            add_time_features: Whether to add time features (time since case start and time since last event) to the encoding.
-            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data.
+            add_time_features: Time features to add to the encoding, as a list of TimeFeature (e.g. hour of day, day of week, time since case start), or True for time since case start and time since last event.
+            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data. Numeric timestamps are read as time since epoch (unit inferred from their magnitude), and datetime columns (including Arrow timestamps) are used as they are.
             case_id_key: Column name for case identifiers.
             activity_key: Column name for activity names.
             timestamp_key: Column name for timestamps.
             outcome_key: Column name for outcome predition.
+            max_vocabulary_size: Maximum number of distinct values kept in the vocabulary of activities and categorical attributes (the most frequent ones), when the vocabulary is built (i.e. until the encoder is frozen). Other values are folded into the OTHER value. Can be an int, or a dict mapping column names (activity_key or attribute names) to their maximum. Frequencies of all values are recorded in the value_frequencies attribute. If not provided, all values are kept.
+            min_value_frequency: Minimum number of events a value must occur in to be kept in the vocabulary of activities and categorical attributes. Rarer values are folded into the OTHER value. Can be an int or a dict, as max_vocabulary_size. If not provided, all values are kept.
+            business_calendar: Working days and hours used by business-calendar time features (e.g. TimeFeature.IS_WORKING_HOURS). If not provided, Monday to Friday from 9 to 17, without holidays.
         """
         super().__init__(
             labeling_type,
@@ -54,9 +70,13 @@ class FrequencyEncoder(BaseEncoder):
             activity_key,
             timestamp_key,
             outcome_key,
+            max_vocabulary_size,
+            min_value_frequency,
+            business_calendar,
         )
 
         self.include_latest_payload = include_latest_payload
+        self.frequency_encoding = frequency_encoding
 
     
     def encode(
@@ -64,6 +84,14 @@ class FrequencyEncoder(BaseEncoder):
         df: pd.DataFrame,
         *,
         freeze: bool = False,
+        n_jobs: int = 1,
+        parallel_backend: ParallelBackend = ParallelBackend.PROCESS,
+        preprocessing_cache: PreprocessedLogCache = None,
+        deduplicate_variants: bool = False,
+        instrument: bool = False,
+        stage_callback: Callable[[StageMetrics], None] = None,
+        progress_callback: Callable[[EncodingProgress], None] = None,
+        memory_budget: int = None,
     ) -> pd.DataFrame:
         """
         Encode the provided DataFrame with frequency encoding and apply the specified labeling.
@@ -71,20 +99,77 @@ class FrequencyEncoder(BaseEncoder):
         Args:
             df: DataFrame to encode.
             freeze: Freeze encoder with provided parameters. Usually set to True when encoding the train log, False otherwise. Required if you want to later save the encoder to a file.
+            n_jobs: Number of worker processes used to encode cases in parallel. Set it to -1 to use all available CPUs.
+            parallel_backend: How cases are exchanged with worker processes when n_jobs is not 1. Partitions and results can be pickled (ParallelBackend.PROCESS) or placed in shared memory (ParallelBackend.SHARED_MEMORY).
+            preprocessing_cache: Cache of preprocessed logs. If provided, the preprocessed log is taken from the cache (or stored into it), so that encoding the same log multiple times preprocesses it only once.
+            deduplicate_variants: Whether to encode the prefixes of every variant (distinct sequence of activities) only once and copy them to all the cases of the variant. Labels, time features and latest payload are still computed for every case. Cannot be combined with n_jobs.
+            instrument: Whether to measure every stage of the encoding (duration, rows and columns in and out, peak allocated memory). Measures are stored in the stage_metrics attribute of the encoder as StageMetrics objects.
+            stage_callback: Function called with the StageMetrics of every stage as soon as it ends. Setting it enables instrument.
+            progress_callback: Function called with the EncodingProgress of the encoding (current stage, cases encoded out of the total, rows produced) at the start of every stage and whenever cases are encoded (after every case, or every partition when n_jobs is not 1).
+            memory_budget: Maximum memory of the encoded log, in bytes. If the encoded log is projected to take more (see estimate), a MemoryError is raised before encoding.
 
         Returns:
             The encoded DataFrame.
         """
-        return super()._encode_template(df, freeze=freeze)
+        return super()._encode_template(
+            df,
+            freeze=freeze,
+            n_jobs=n_jobs,
+            parallel_backend=parallel_backend,
+            preprocessing_cache=preprocessing_cache,
+            deduplicate_variants=deduplicate_variants,
+            instrument=instrument,
+            stage_callback=stage_callback,
+            progress_callback=progress_callback,
+            memory_budget=memory_budget,
+        )
+
+
+    def unpack_presence(self, encoded_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Unpack the columns of an encoding with FrequencyEncoding.PACKED_PRESENCE into one boolean column per activity, as encoded with FrequencyEncoding.PRESENCE.
+
+        Args:
+            encoded_df: DataFrame encoded by this encoder.
+
+        Returns:
+            The presence flags of every activity, with the same index as encoded_df.
+        """
+        if self.frequency_encoding != FrequencyEncoding.PACKED_PRESENCE:
+            raise ValueError(f'unpack_presence requires frequency_encoding to be FrequencyEncoding.PACKED_PRESENCE ({self.frequency_encoding} has been provided instead)')
+
+        activities = self._activity_vocabulary()[:-1]
+        packed = encoded_df[self._get_packed_presence_columns()].to_numpy(dtype=np.uint8)
+        flags = np.unpackbits(packed, axis=1, count=len(activities), bitorder='little').astype(bool)
+
+        return pd.DataFrame(flags, columns=activities, index=encoded_df.index)
+
+
+    def _check_parameters(self, df: pd.DataFrame) -> None:
+        super()._check_parameters(df)
+
+        if not isinstance(self.frequency_encoding, FrequencyEncoding):
+            raise TypeError(f'frequency_encoding must be a FrequencyEncoding ({self.frequency_encoding} has been provided instead)')
+
+
+    def _get_packed_presence_columns(self) -> list[str]:
+        """
+        Columns of FrequencyEncoding.PACKED_PRESENCE: bit j of column i is the flag of the (8*i + j)-th activity (PADDING excluded).
+        """
+        num_columns = -(-(len(self._activity_vocabulary()) - 1) // 8)
+        return [f'{self.PACKED_PRESENCE_COL_PREFIX_NAME}_{i}' for i in range(1, num_columns+1)]
+
 
+    def _encode(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+        if self.frequency_encoding != FrequencyEncoding.COUNT:
+            return self._encode_presence(df, coded_log)
 
-    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
         rows = []
-        grouped = df.groupby(self.case_id_key)
-        
-        for case_id, case_events in grouped:
-            case_events = case_events.sort_values(self.timestamp_key)
 
+        for case_id, case_events in coded_log.iter_cases(df):
             for prefix_length in range(1, len(case_events)+1):
                 prefix = case_events.iloc[:prefix_length]
                 counts = prefix[self.activity_key].value_counts()
@@ -103,8 +188,64 @@ class FrequencyEncoder(BaseEncoder):
 
                 rows.append(row)
 
+            self._report_progress(rows=len(case_events))
+
         encoded_df = pd.DataFrame(rows)
-        
+
+        return encoded_df
+
+
+    def _encode_presence(self, df: pd.DataFrame, coded_log: CodedLog) -> pd.DataFrame:
+        out = self._cumulate_presence(coded_log)
+        self._report_progress(cases=coded_log.num_cases, rows=coded_log.num_events)
+
+        return self._coded_frame(df, coded_log, out)
+
+
+    def _cumulate_presence(self, coded_log: CodedLog) -> np.ndarray:
+        """
+        Flag, for every sorted event of coded_log, which activities occur in the prefix ending with it.
+        """
+        activities = coded_log.code_activities(self._activity_vocabulary(), self.UNKNOWN_VAL)
+
+        # The smallest dtype holding all case numbers keeps marks close to the size of the flags (e.g. 1 byte per flag up to 255 cases)
+        dtype = np.min_scalar_type(coded_log.num_cases)
+        event_cases = np.repeat(np.arange(1, coded_log.num_cases+1, dtype=dtype), coded_log.case_lengths)
+
+        # Mark every occurrence with its (1-based) case number: since cases are sorted, a cumulative max down the
+        # events only carries marks of earlier events of the same case or smaller marks of previous cases
+        marks = np.zeros((coded_log.num_events, self._coded_width()), dtype=dtype)
+        marks[np.arange(coded_log.num_events), activities] = event_cases
+        np.maximum.accumulate(marks, axis=0, out=marks)
+
+        return marks == event_cases[:, None]
+
+
+    def _coded_width(self) -> int:
+        # One count per activity, PADDING excluded
+        return len(self._activity_vocabulary()) - 1
+
+
+    def _encode_coded(self, activities: np.ndarray, parents: np.ndarray, depths: np.ndarray, out: np.ndarray) -> None:
+        for _, rows in iter_levels(depths):
+            # The counts of a prefix are the counts of its parent plus its last activity
+            has_parent = parents[rows] >= 0
+            out[rows[has_parent]] = out[parents[rows[has_parent]]]
+            out[rows[~has_parent]] = 0
+            out[rows, activities[rows]] += 1
+
+
+    def _coded_features(self, out: np.ndarray) -> pd.DataFrame:
+        if self.frequency_encoding == FrequencyEncoding.PRESENCE:
+            return pd.DataFrame(out > 0, columns=self._activity_vocabulary()[:-1])
+
+        if self.frequency_encoding == FrequencyEncoding.PACKED_PRESENCE:
+            return pd.DataFrame(np.packbits(out > 0, axis=1, bitorder='little'), columns=self._get_packed_presence_columns())
+
+        return pd.DataFrame(out, columns=self._activity_vocabulary()[:-1])
+
+
+    def _complete_encoding(self, encoded_df: pd.DataFrame) -> pd.DataFrame:
         if self.include_latest_payload:
             encoded_df = super()._include_latest_payload(encoded_df)
 
@@ -130,3 +271,24 @@ class FrequencyEncoder(BaseEncoder):
             )
 
         return encoded_df
+
+
+    def _estimate_feature_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        # One count (or flag) per activity, PADDING excluded
+        if self.frequency_encoding == FrequencyEncoding.PACKED_PRESENCE:
+            columns = [(column, np.dtype(np.uint8), None) for column in self._get_packed_presence_columns()]
+        else:
+            dtype = np.dtype(bool) if self.frequency_encoding == FrequencyEncoding.PRESENCE else np.dtype(np.int64)
+            columns = [(activity, dtype, None) for activity in self._activity_vocabulary()[:-1]]
+
+        if not self.include_latest_payload:
+            return columns
+
+        columns += self._estimate_latest_payload_columns(df)
+
+        if self.categorical_encoding == CategoricalEncoding.ONE_HOT:
+            columns = self._estimate_one_hot_columns(columns, {
+                name: values for name, _, values in self._estimate_latest_payload_columns(df) if values is not None
+            })
+
+        return columns
@@ -1,5 +1,13 @@
+import warnings
+import numpy as np
 import pandas as pd
 
+# Private pandas API, only used to build sparse arrays without a dense intermediate (see sparse_array)
+try:
+    from pandas._libs.sparse import IntIndex
+except ImportError:
+    IntIndex = None
+
 def one_hot(
     df: pd.DataFrame,
     columns: list[str],
@@ -20,3 +28,148 @@ def one_hot(
     df_encoded = pd.get_dummies(df, columns=columns, drop_first=False)
 
     return df_encoded
+
+
+def hash_buckets(values: pd.Series, num_buckets: int) -> np.ndarray:
+    """
+    Return the bucket (from 0 to num_buckets-1) of every value, according to a stable hash of its string representation (the same value always falls in the same bucket, across processes and runs). Every distinct value is hashed once.
+    """
+    codes, uniques = pd.factorize(values)
+    unique_buckets = pd.util.hash_array(np.asarray(uniques, dtype=object).astype(str).astype(object)) % num_buckets
+
+    return unique_buckets[codes].astype(np.int64)
+
+
+def sparse_array(values: np.ndarray, positions: np.ndarray, length: int) -> pd.arrays.SparseArray:
+    """
+    Build a sparse array of the provided length, with fill value 0, holding values at the provided (increasing) positions.
+    The sparse index is built directly with the private pandas API when available; otherwise (e.g. if a pandas release moves or changes it), the array is built from its dense values with the public API.
+    """
+    if IntIndex is not None:
+        try:
+            return pd.arrays.SparseArray(values, sparse_index=IntIndex(length, positions.astype(np.int32)), fill_value=0, dtype=values.dtype)
+        except (TypeError, ValueError):
+            pass
+
+    dense_values = np.zeros(length, dtype=values.dtype)
+    dense_values[positions] = values
+
+    return pd.arrays.SparseArray(dense_values, fill_value=0)
+
+
+def take_rows(df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """
+    Return the rows of df at the provided (distinct) positions, with a RangeIndex. Unlike df.iloc, sparse columns only move their non-zero values, so their cost does not depend on the number of rows.
+    """
+    # Rows already in place (e.g. a log sorted again) are not moved
+    if len(rows) == len(df) and np.array_equal(rows, np.arange(len(df))):
+        return df.reset_index(drop=True)
+
+    is_sparse = [isinstance(dtype, pd.SparseDtype) for dtype in df.dtypes]
+    if not any(is_sparse):
+        return df.iloc[rows].reset_index(drop=True)
+
+    dense_df = df.loc[:, [not column_is_sparse for column_is_sparse in is_sparse]].iloc[rows].reset_index(drop=True)
+
+    # Position of every row of df in the result, -1 if not taken
+    new_positions = np.full(len(df), -1, dtype=np.int64)
+    new_positions[rows] = np.arange(len(rows))
+
+    sparse_columns = {}
+    for column, column_is_sparse in zip(df.columns, is_sparse):
+        if not column_is_sparse: continue
+
+        values = df[column].array
+        positions = new_positions[values.sp_index.to_int_index().indices]
+        is_taken = positions >= 0
+        order = np.argsort(positions[is_taken])
+
+        sparse_columns[column] = sparse_array(values.sp_values[is_taken][order], positions[is_taken][order], len(rows))
+
+    return pd.concat([dense_df, pd.DataFrame(sparse_columns, index=dense_df.index)], axis=1)[df.columns]
+
+
+# Largest absolute epoch values (about year 5000) expressed in each unit, from the coarsest to the finest
+EPOCH_UNIT_LIMITS = [('s', 1e11), ('ms', 1e14), ('us', 1e17)]
+
+
+def parse_timestamps(
+    values: pd.Series,
+    timestamp_format: str = None,
+    sample_size: int = 1000,
+) -> pd.Series:
+    """
+    Convert values to datetime, parsing every distinct value only once.
+
+    Datetime columns (including Arrow timestamps) are converted without parsing. Numeric columns are read as time since epoch, with the unit (s, ms, us or ns) inferred from their magnitude. Other columns (e.g. strings) are parsed with timestamp_format or, if not provided, with a format inferred once from a sample of their distinct values.
+
+    Args:
+        values: Series to convert.
+        timestamp_format: Format of the timestamps. If not provided, it is inferred.
+        sample_size: Number of distinct values used to infer the format.
+
+    Returns:
+        The converted Series, with the same index as values.
+    """
+    if isinstance(values.dtype, pd.ArrowDtype) and values.dtype.kind == 'M':
+        arrow_type = values.dtype.pyarrow_dtype
+        target_dtype = pd.DatetimeTZDtype(unit=arrow_type.unit, tz=arrow_type.tz) if arrow_type.tz is not None else f'datetime64[{arrow_type.unit}]'
+        return values.astype(target_dtype)
+
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values
+
+    if timestamp_format is None and pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return pd.to_datetime(values, unit=_infer_epoch_unit(values))
+
+    codes, uniques = pd.factorize(values)
+
+    if timestamp_format is None:
+        timestamp_format = _infer_timestamp_format(uniques[:sample_size])
+
+    converted = pd.DatetimeIndex(pd.to_datetime(uniques, format=timestamp_format))
+
+    return pd.Series(converted.take(codes, allow_fill=True, fill_value=pd.NaT), index=values.index, name=values.name)
+
+
+def _infer_epoch_unit(values: pd.Series) -> str:
+    """
+    Return the unit of the epoch values, i.e. the coarsest unit in which they represent dates before about year 5000.
+    """
+    max_value = values.abs().max()
+
+    for unit, limit in EPOCH_UNIT_LIMITS:
+        if pd.isna(max_value) or max_value < limit:
+            return unit
+
+    return 'ns'
+
+
+def _infer_timestamp_format(sample) -> str | None:
+    """
+    Return the first format, guessed from the values of sample, which parses the whole sample. If no format is found, return None and let pandas infer it.
+    """
+    sample = [value for value in sample if isinstance(value, str)]
+
+    tried_formats = set()
+
+    # Values usually share the same format, so the format of the first value is almost always the right one
+    for value in sample:
+        with warnings.catch_warnings():
+            # Warnings about day-first formats are irrelevant, since the guessed format is then used explicitly
+            warnings.simplefilter('ignore', UserWarning)
+            candidate_format = pd.tseries.api.guess_datetime_format(value)
+
+        if candidate_format is None or candidate_format in tried_formats:
+            continue
+
+        tried_formats.add(candidate_format)
+
+        try:
+            pd.to_datetime(sample, format=candidate_format)
+        except (ValueError, TypeError):
+            continue
+
+        return candidate_format
+
+    return None
@@ -0,0 +1,128 @@
+import os
+import pickle
+import pandas as pd
+
+from .base_encoder import BaseEncoder
+
+
+class IncrementalEncoder:
+    def __init__(
+        self,
+        encoder: BaseEncoder,
+    ) -> None:
+        """
+        Initialize the IncrementalEncoder, which keeps the encoding of a growing log up to date with a frozen encoder.
+        The events and the encoded rows of every case are kept, so that when new events are added only the cases receiving them are encoded again (their earlier prefixes included, since labels like next activity and remaining time change when a case grows).
+
+        Args:
+            encoder: Frozen encoder.
+        """
+        if not isinstance(encoder, BaseEncoder):
+            raise TypeError('encoder must be an instance of BaseEncoder')
+
+        if not encoder.is_frozen:
+            raise RuntimeError("Encoder must be frozen before encoding a log incrementally. Call with freeze=True during encoding.")
+
+        self.encoder = encoder
+
+        # Instance variables
+        self.case_events: dict[object, pd.DataFrame] = {}
+        self.case_encoded_rows: dict[object, pd.DataFrame] = {}
+        self.num_events = 0
+        self.updated_cases = []
+
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add new events to the log and encode again the cases they belong to. Only the events and encoded rows of these cases are touched, so the cost of an update does not grow with the size of the log.
+
+        Args:
+            df: New events. They can belong to new cases or to cases already in the log.
+
+        Returns:
+            The encoded rows of the updated cases, in the same order as in the encoding of the whole log (see get_encoded_log).
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("df must be a pandas DataFrame")
+
+        # Index new events after the ones already in the log, so that the index of an event is its position in the whole log
+        df = df.set_axis(pd.RangeIndex(self.num_events, self.num_events + len(df)), axis=0)
+
+        if df.empty:
+            self.updated_cases = []
+            return pd.DataFrame()
+
+        case_events = {}
+        for case_id, new_events in df.groupby(self.encoder.case_id_key, sort=False):
+            previous_events = self.case_events.get(case_id)
+            case_events[case_id] = new_events if previous_events is None else pd.concat([previous_events, new_events])
+
+        updated_events = pd.concat(case_events.values())
+
+        # Encoded rows are indexed by their last event, which gives the case they belong to
+        updated_encoded_df = self.encoder._encode_template(updated_events, keep_index=True)
+        row_cases = updated_events.loc[updated_encoded_df.index, self.encoder.case_id_key].to_numpy()
+
+        # The log is only extended once the updated cases have been encoded
+        self.case_events.update(case_events)
+        self.num_events += len(df)
+        self.updated_cases = list(case_events)
+
+        # Cases may have no rows left (e.g. no prefix of the length kept by the prefix strategy)
+        for case_id in self.updated_cases:
+            self.case_encoded_rows.pop(case_id, None)
+
+        for case_id, encoded_rows in updated_encoded_df.groupby(row_cases, sort=False):
+            self.case_encoded_rows[case_id] = encoded_rows
+
+        return updated_encoded_df.reset_index(drop=True)
+
+
+    def get_encoded_log(self) -> pd.DataFrame:
+        """
+        Build the encoding of the whole log from the encoded rows of every case.
+
+        Returns:
+            The encoding of the whole log, equal to the one returned by the encode method of the encoder.
+        """
+        if len(self.case_encoded_rows) == 0:
+            return pd.DataFrame()
+
+        return pd.concat(self.case_encoded_rows.values()).sort_index().reset_index(drop=True)
+
+
+    def save(self, filepath: str) -> None:
+        """
+        Save the incremental encoder, i.e. the encoder together with the events and encoded rows of every case, to a pickle file.
+
+        Args:
+            filepath (str): Path to the pickle file where the incremental encoder will be saved.
+        """
+        # Do not save the last encoded log
+        self.encoder.original_df = None
+
+        with open(filepath, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+    @classmethod
+    def load(cls, filepath: str) -> 'IncrementalEncoder':
+        """
+        Load an incremental encoder from a pickle file.
+
+        Args:
+            filepath (str): Path to the pickle file to load.
+
+        Returns:
+            incremental_encoder (IncrementalEncoder): The loaded incremental encoder.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File '{filepath}' does not exist.")
+
+        with open(filepath, 'rb') as f:
+            incremental_encoder = pickle.load(f)
+
+        if not isinstance(incremental_encoder, cls):
+            raise TypeError(f"Loaded object is not an instance of {cls.__name__}")
+
+        return incremental_encoder
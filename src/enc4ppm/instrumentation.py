@@ -0,0 +1,123 @@
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+import pandas as pd
+
+
+@dataclass
+class StageMetrics:
+    """
+    Measures of a stage of the encoding (e.g. _preprocess_log, _encode, _label_log).
+
+    Attributes:
+        stage: Name of the stage.
+        duration: Wall time of the stage, in seconds.
+        rows_in: Number of rows of the DataFrame given to the stage.
+        columns_in: Number of columns of the DataFrame given to the stage.
+        rows_out: Number of rows of the DataFrame returned by the stage (None if the stage does not return a DataFrame).
+        columns_out: Number of columns of the DataFrame returned by the stage (None if the stage does not return a DataFrame).
+        peak_memory: Peak memory allocated during the stage, in bytes, as traced by tracemalloc.
+    """
+    stage: str
+    duration: float
+    rows_in: int
+    columns_in: int
+    rows_out: int | None
+    columns_out: int | None
+    peak_memory: int
+
+
+def measure_stage(stage: str, function: Callable, df: pd.DataFrame, *args) -> tuple[Any, StageMetrics]:
+    """
+    Call function(df, *args) and measure it. If function returns a tuple, its first element is measured as the output DataFrame.
+    Memory is traced with tracemalloc, which is started for the duration of the stage if it is not already tracing.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    tracemalloc.reset_peak()
+    start_memory, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    try:
+        result = function(df, *args)
+        duration = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    output = result[0] if isinstance(result, tuple) else result
+    is_df = isinstance(output, pd.DataFrame)
+
+    metrics = StageMetrics(
+        stage=stage,
+        duration=duration,
+        rows_in=df.shape[0],
+        columns_in=df.shape[1],
+        rows_out=output.shape[0] if is_df else None,
+        columns_out=output.shape[1] if is_df else None,
+        peak_memory=peak_memory - start_memory,
+    )
+
+    return result, metrics
+
+
+@dataclass
+class EncodingProgress:
+    """
+    Progress of an encoding, reported to progress callbacks.
+
+    Attributes:
+        stage: Name of the current stage (see StageMetrics).
+        cases_processed: Number of cases encoded so far.
+        total_cases: Number of cases of the log.
+        rows_emitted: Number of encoded rows (i.e. prefixes, before applying the prefix strategy) produced so far.
+    """
+    stage: str
+    cases_processed: int
+    total_cases: int
+    rows_emitted: int
+
+
+class ProgressReporter:
+    def __init__(self, callback: Callable[[EncodingProgress], None], total_cases: int) -> None:
+        """
+        Initialize the ProgressReporter, which keeps track of the progress of an encoding and reports it to callback.
+
+        Args:
+            callback: Function called with the EncodingProgress at the start of every stage and whenever cases are encoded.
+            total_cases: Number of cases of the log.
+        """
+        self.callback = callback
+        self.total_cases = total_cases
+
+        # Instance variables
+        self.stage = None
+        self.cases_processed = 0
+        self.rows_emitted = 0
+
+
+    def start_stage(self, stage: str) -> None:
+        self.stage = stage
+        self._report()
+
+
+    def advance(self, cases: int = 1, rows: int = 0) -> None:
+        """
+        Record that cases more cases have been encoded, producing rows more rows.
+        """
+        self.cases_processed += cases
+        self.rows_emitted += rows
+        self._report()
+
+
+    def _report(self) -> None:
+        self.callback(EncodingProgress(
+            stage=self.stage,
+            cases_processed=self.cases_processed,
+            total_cases=self.total_cases,
+            rows_emitted=self.rows_emitted,
+        ))
@@ -0,0 +1,160 @@
+import asyncio
+import copy
+import pandas as pd
+
+from .base_encoder import BaseEncoder
+from .constants import LabelingType, PrefixStrategy
+
+class MicroBatcher:
+    def __init__(
+        self,
+        encoder: BaseEncoder,
+        *,
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+    ) -> None:
+        """
+        Initialize the MicroBatcher, which collects concurrent encode_prefix requests and encodes them as a single batch with a frozen encoder.
+
+        Args:
+            encoder: Frozen encoder used to encode the batches.
+            max_batch_size: Maximum number of prefixes encoded together. A batch is encoded as soon as it reaches this size.
+            max_wait: Maximum time (in seconds) the first prefix of a batch waits for other prefixes before the batch is encoded.
+        """
+        if not isinstance(encoder, BaseEncoder):
+            raise TypeError('encoder must be an instance of BaseEncoder')
+
+        if not encoder.is_frozen:
+            raise RuntimeError("Encoder must be frozen before using it in a MicroBatcher. Call with freeze=True during encoding.")
+
+        if not isinstance(max_batch_size, int) or max_batch_size <= 0:
+            raise ValueError(f'max_batch_size must be a positive integer ({max_batch_size} has been provided instead)')
+
+        if not isinstance(max_wait, (int, float)) or max_wait < 0:
+            raise ValueError(f'max_wait must be a non-negative number ({max_wait} has been provided instead)')
+
+        # The label of a running case is not known yet, so batches are encoded without labeling
+        self.encoder = copy.copy(encoder)
+        self.encoder.labeling_type = LabelingType.NONE
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        # Instance variables
+        self._pending: list[tuple[pd.DataFrame, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+
+    async def encode_prefix(self, prefix: pd.DataFrame) -> pd.Series:
+        """
+        Encode the prefix of a running case. The prefix is encoded together with the other prefixes requested concurrently.
+
+        Args:
+            prefix: DataFrame containing the events of a single case, in chronological order.
+
+        Returns:
+            The encoded row of the full prefix.
+        """
+        self._check_prefix(prefix)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prefix, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+
+    def _check_prefix(self, prefix: pd.DataFrame) -> None:
+        """
+        Checks and validations on a single prefix, so that an invalid request does not fail the whole batch.
+        """
+        if not isinstance(prefix, pd.DataFrame):
+            raise TypeError("prefix must be a pandas DataFrame")
+
+        if prefix.empty:
+            raise ValueError("prefix cannot be empty")
+
+        if self.encoder.case_id_key not in prefix.columns:
+            raise ValueError(f"prefix must contain column '{self.encoder.case_id_key}'")
+
+        if prefix[self.encoder.case_id_key].nunique() != 1:
+            raise ValueError("prefix must contain the events of a single case")
+
+        prefix_length = len(prefix)
+
+        if self.encoder.prefix_strategy == PrefixStrategy.UP_TO_SPECIFIED and prefix_length > self.encoder.prefix_length:
+            raise ValueError(f'prefix has {prefix_length} events, but the encoder only encodes prefixes up to length {self.encoder.prefix_length}')
+
+        if self.encoder.prefix_strategy == PrefixStrategy.ONLY_SPECIFIED and prefix_length != self.encoder.prefix_length:
+            raise ValueError(f'prefix has {prefix_length} events, but the encoder only encodes prefixes of length {self.encoder.prefix_length}')
+
+
+    def _flush(self) -> None:
+        """
+        Move the pending prefixes to a new batch and schedule its encoding.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+
+        if len(batch) == 0:
+            return
+
+        task = asyncio.ensure_future(self._encode_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+    async def _encode_batch(self, batch: list[tuple[pd.DataFrame, asyncio.Future]]) -> None:
+        """
+        Encode a batch in the default executor, so that the event loop keeps collecting the next batch, and resolve its futures. Since transform does not modify the encoder, multiple batches can be encoded at the same time.
+        """
+        loop = asyncio.get_running_loop()
+
+        try:
+            rows = await loop.run_in_executor(None, self._encode_prefixes, [prefix for prefix, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for row, (_, future) in zip(rows, batch):
+            if not future.done():
+                future.set_result(row)
+
+
+    def _encode_prefixes(self, prefixes: list[pd.DataFrame]) -> list[pd.Series]:
+        """
+        Encode the provided prefixes as a single log and return the row of each full prefix.
+        """
+        case_id_key = self.encoder.case_id_key
+
+        # Give every prefix its own case id, so that prefixes of the same case are not merged together
+        batch_dfs = []
+        for i, prefix in enumerate(prefixes):
+            batch_df = prefix.copy()
+            batch_df[case_id_key] = str(i)
+            batch_dfs.append(batch_df)
+
+        encoded_df = self.encoder.transform(pd.concat(batch_dfs, ignore_index=True))
+
+        # Rows are in original order, so the last row of each case is the full prefix
+        last_rows = encoded_df.groupby(case_id_key, sort=False).tail(1).set_index(case_id_key, drop=False)
+
+        rows = []
+        for i, prefix in enumerate(prefixes):
+            row = last_rows.loc[str(i)].copy()
+            row[case_id_key] = str(prefix[case_id_key].iloc[0])
+            row.name = None
+            rows.append(row)
+
+        return rows
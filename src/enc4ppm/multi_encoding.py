@@ -0,0 +1,86 @@
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+from .base_encoder import BaseEncoder
+from .coded_log import CodedLog
+from .parallel import resolve_n_jobs
+
+# Log shipped once to each worker process by _init_worker
+_worker_log = None
+
+
+def encode_many(
+    df: pd.DataFrame,
+    encoders: list[BaseEncoder],
+    *,
+    freeze: bool = False,
+    n_jobs: int = 1,
+) -> list[pd.DataFrame]:
+    """
+    Encode the same log with multiple encoders (e.g. different encodings or labeling types), checking, preprocessing and segmenting the log by case only once.
+    All encoders must share case_id_key, activity_key, timestamp_key and timestamp_format, which determine the preprocessing.
+
+    Args:
+        df: DataFrame to encode.
+        encoders: Encoders to apply to df.
+        freeze: Freeze all encoders with the provided parameters. See the encode method of the encoders.
+        n_jobs: Number of worker processes used to run the encoders in parallel. Set it to -1 to use all available CPUs.
+
+    Returns:
+        The encoded DataFrames, in the same order as encoders.
+    """
+    if not isinstance(encoders, list) or len(encoders) == 0:
+        raise ValueError('encoders must be a non-empty list of encoders')
+
+    for encoder in encoders:
+        if not isinstance(encoder, BaseEncoder):
+            raise TypeError('encoders must contain only instances of BaseEncoder')
+
+    first_encoder = encoders[0]
+    preprocessing_keys = ['case_id_key', 'activity_key', 'timestamp_key', 'timestamp_format']
+
+    for encoder in encoders[1:]:
+        for key in preprocessing_keys:
+            if getattr(encoder, key) != getattr(first_encoder, key):
+                raise ValueError(f"All encoders must share the same {key}, which determines how the log is preprocessed")
+
+    n_jobs = resolve_n_jobs(n_jobs)
+
+    # Shared preprocessing and case segmentation
+    first_encoder._check_log(df)
+    preprocessed_df = first_encoder._preprocess_log(df)
+    coded_log = first_encoder._code_log(preprocessed_df)
+
+    if n_jobs == 1:
+        return [
+            encoder._encode_template(df, freeze=freeze, preprocessed_df=preprocessed_df, coded_log=coded_log)
+            for encoder in encoders
+        ]
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(df, preprocessed_df, coded_log)) as executor:
+        futures = [executor.submit(_encode_with, encoder, freeze) for encoder in encoders]
+        results = [future.result() for future in futures]
+
+    encoded_dfs = []
+    for encoder, (encoded_df, worker_encoder) in zip(encoders, results):
+        # Bring back the state built by the worker (e.g. vocabularies, frozen flag)
+        encoder.__dict__.update(worker_encoder.__dict__)
+        encoder.original_df = df
+        encoded_dfs.append(encoded_df)
+
+    return encoded_dfs
+
+
+def _init_worker(df: pd.DataFrame, preprocessed_df: pd.DataFrame, coded_log: CodedLog) -> None:
+    global _worker_log
+    _worker_log = (df, preprocessed_df, coded_log)
+
+
+def _encode_with(encoder: BaseEncoder, freeze: bool) -> tuple[pd.DataFrame, BaseEncoder]:
+    df, preprocessed_df, coded_log = _worker_log
+    encoded_df = encoder._encode_template(df, freeze=freeze, preprocessed_df=preprocessed_df, coded_log=coded_log)
+
+    # The log is not sent back to the parent process
+    encoder.original_df = None
+
+    return encoded_df, encoder
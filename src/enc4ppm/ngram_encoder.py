@@ -0,0 +1,294 @@
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+from .base_encoder import BaseEncoder
+from .coded_log import CodedLog, sequence_depths
+from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy, ParallelBackend, TimeFeature
+from .cache import PreprocessedLogCache
+from .time_features import BusinessCalendar
+from .instrumentation import StageMetrics, EncodingProgress
+from .helpers import sparse_array
+
+class NGramEncoder(BaseEncoder):
+    NGRAM_SEPARATOR = ' -> '
+
+    def __init__(
+        self,
+        *,
+        ngram_sizes: list[int] = [2, 3],
+        sparse: bool = True,
+
+        labeling_type: LabelingType = LabelingType.NEXT_ACTIVITY,
+        numerical_scaling: NumericalScaling = NumericalScaling.NONE,
+        prefix_length: int = None,
+        prefix_strategy: PrefixStrategy = PrefixStrategy.UP_TO_SPECIFIED,
+        add_time_features: bool | list[TimeFeature] = False,
+        timestamp_format: str = None,
+        case_id_key: str = 'case:concept:name',
+        activity_key: str = 'concept:name',
+        timestamp_key: str = 'time:timestamp',
+        outcome_key: str = 'outcome',
+        max_vocabulary_size: int | dict[str, int] = None,
+        min_value_frequency: int | dict[str, int] = None,
+        business_calendar: BusinessCalendar = None,
+    ) -> None:
+        """
+        Initialize the NGramEncoder, which encodes every prefix with the number of occurrences of every n-gram (sequence of n consecutive activities) found in the log.
+        Columns are named after the activities of their n-gram, joined by ' -> '. N-grams not in the vocabulary built from the log (e.g. n-grams of a frozen encoder not seen during freezing, or containing unknown activities) are counted in the UNKNOWN column.
+
+        Args:
+            ngram_sizes: Sizes of the n-grams to count (e.g. [2, 3] counts 2-grams and 3-grams, [1] is equivalent to frequency encoding).
+            sparse: Whether to return counts as sparse columns (pandas SparseDtype), which only store the non-zero counts of every column. Otherwise, counts are dense int64 columns.
+            labeling_type: Label type to apply to examples.
+            numerical_scaling: How to scale numerical features. They can be standardized (NumericalScaling.STANDARDIZATION) or left as-is (NumericalScaling.NONE). Only applies to time features and remaining time labels, since counts are not scaled.
+            prefix_length: Maximum prefix length to consider: longer prefixes will be discarded, shorter prefixes may be discarded depending on prefix_strategy parameter. If not provided, defaults to maximum prefix length found in log. If provided, it must be a non-zero positive int number.
+            prefix_strategy: Whether to consider prefix lengths from 1 to prefix_length (PrefixStrategy.UP_TO_SPECIFIED) or only the specified prefix_length (PrefixStrategy.ONLY_SPECIFIED).
+            add_time_features: Time features to add to the encoding, as a list of TimeFeature (e.g. hour of day, day of week, time since case start), or True for time since case start and time since last event.
+            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data. Numeric timestamps are read as time since epoch (unit inferred from their magnitude), and datetime columns (including Arrow timestamps) are used as they are.
+            case_id_key: Column name for case identifiers.
+            activity_key: Column name for activity names.
+            timestamp_key: Column name for timestamps.
+            outcome_key: Column name for outcome predition.
+            max_vocabulary_size: Maximum number of distinct values kept in the vocabulary of activities (the most frequent ones), when the vocabulary is built (i.e. until the encoder is frozen). Other values are folded into the OTHER value. Can be an int, or a dict mapping column names (activity_key) to their maximum. Frequencies of all values are recorded in the value_frequencies attribute. If not provided, all values are kept.
+            min_value_frequency: Minimum number of events a value must occur in to be kept in the vocabulary of activities. Rarer values are folded into the OTHER value. Can be an int or a dict, as max_vocabulary_size. If not provided, all values are kept.
+            business_calendar: Working days and hours used by business-calendar time features (e.g. TimeFeature.IS_WORKING_HOURS). If not provided, Monday to Friday from 9 to 17, without holidays.
+        """
+        super().__init__(
+            labeling_type,
+            [],
+            CategoricalEncoding.STRING,
+            numerical_scaling,
+            prefix_length,
+            prefix_strategy,
+            add_time_features,
+            timestamp_format,
+            case_id_key,
+            activity_key,
+            timestamp_key,
+            outcome_key,
+            max_vocabulary_size,
+            min_value_frequency,
+            business_calendar,
+        )
+
+        self.ngram_sizes = ngram_sizes
+        self.sparse = sparse
+
+        # Instance variables
+        self.log_ngrams: list[tuple[str, ...]] = []
+
+
+    def encode(
+        self,
+        df: pd.DataFrame,
+        *,
+        freeze: bool = False,
+        n_jobs: int = 1,
+        parallel_backend: ParallelBackend = ParallelBackend.PROCESS,
+        preprocessing_cache: PreprocessedLogCache = None,
+        instrument: bool = False,
+        stage_callback: Callable[[StageMetrics], None] = None,
+        progress_callback: Callable[[EncodingProgress], None] = None,
+        memory_budget: int = None,
+    ) -> pd.DataFrame:
+        """
+        Encode the provided DataFrame with n-gram frequency encoding and apply the specified labeling.
+
+        Args:
+            df: DataFrame to encode.
+            freeze: Freeze encoder with provided parameters. Usually set to True when encoding the train log, False otherwise. Required if you want to later save the encoder to a file.
+            n_jobs: Number of worker processes used to encode cases in parallel. Set it to -1 to use all available CPUs.
+            parallel_backend: How cases are exchanged with worker processes when n_jobs is not 1. NGramEncoder only supports ParallelBackend.PROCESS (partitions and results are pickled).
+            preprocessing_cache: Cache of preprocessed logs. If provided, the preprocessed log is taken from the cache (or stored into it), so that encoding the same log multiple times preprocesses it only once.
+            instrument: Whether to measure every stage of the encoding (duration, rows and columns in and out, peak allocated memory). Measures are stored in the stage_metrics attribute of the encoder as StageMetrics objects.
+            stage_callback: Function called with the StageMetrics of every stage as soon as it ends. Setting it enables instrument.
+            progress_callback: Function called with the EncodingProgress of the encoding (current stage, cases encoded out of the total, rows produced) at the start of every stage and whenever cases are encoded (all at once, or every partition when n_jobs is not 1).
+            memory_budget: Maximum memory of the encoded log, in bytes. If the encoded log is projected to take more (see estimate), a MemoryError is raised before encoding. Sparse columns are projected as if they were dense.
+
+        Returns:
+            The encoded DataFrame.
+        """
+        return super()._encode_template(
+            df,
+            freeze=freeze,
+            n_jobs=n_jobs,
+            parallel_backend=parallel_backend,
+            preprocessing_cache=preprocessing_cache,
+            instrument=instrument,
+            stage_callback=stage_callback,
+            progress_callback=progress_callback,
+            memory_budget=memory_budget,
+        )
+
+
+    def _check_parameters(self, df: pd.DataFrame) -> None:
+        super()._check_parameters(df)
+
+        if not isinstance(self.ngram_sizes, list) or len(self.ngram_sizes) == 0 or not all(isinstance(size, int) and size > 0 for size in self.ngram_sizes):
+            raise ValueError(f'ngram_sizes must be a non-empty list of positive integers ({self.ngram_sizes} has been provided instead)')
+
+        if not isinstance(self.sparse, bool):
+            raise TypeError('sparse must be a boolean')
+
+
+    def _extract_log_data(self, df: pd.DataFrame) -> None:
+        super()._extract_log_data(df)
+
+        # Build n-gram vocab, in order of first occurrence for every size (with rare activities already folded, as when encoding)
+        coded_log = self._fold_coded_log(self._code_log(df))
+        activity_values = np.asarray(self._activity_vocabulary(), dtype=object)
+        self.log_ngrams = []
+
+        for size, ngram_codes in self._code_ngrams(coded_log).items():
+            ngram_codes = pd.unique(ngram_codes[ngram_codes >= 0])
+            self.log_ngrams += [tuple(ngram) for ngram in activity_values[self._decode_ngrams(ngram_codes, size)].tolist()]
+
+
+    def _code_ngrams(self, coded_log: CodedLog) -> dict[int, np.ndarray]:
+        """
+        Code the n-gram ending with every sorted event of coded_log as a base-V number (V being the size of the activity vocabulary), for every size in ngram_sizes.
+        Codes are computed in a single pass over the coded activities, each size extending the codes of the previous one (rolling code); events too close to the start of their case to end an n-gram get code -1.
+        """
+        num_activities = len(self._activity_vocabulary())
+
+        if num_activities ** max(self.ngram_sizes) >= np.iinfo(np.int64).max:
+            raise ValueError(f'n-grams of size {max(self.ngram_sizes)} over {num_activities} activities cannot be coded as 64-bit integers')
+
+        activities = coded_log.code_activities(self._activity_vocabulary(), self.UNKNOWN_VAL)
+        positions = coded_log.positions
+
+        ngram_codes = {}
+        codes = activities.copy()
+
+        for size in range(1, max(self.ngram_sizes)+1):
+            if size > 1:
+                # The n-gram ending with an event extends the (n-1)-gram ending with the previous event
+                codes[1:] = codes[:-1] * num_activities + activities[1:]
+
+            if size in self.ngram_sizes:
+                ngram_codes[size] = np.where(positions >= size-1, codes, -1)
+
+        return ngram_codes
+
+
+    def _decode_ngrams(self, ngram_codes: np.ndarray, size: int) -> np.ndarray:
+        """
+        Return the activities (as positions in _activity_vocabulary) of the n-grams with the provided codes, one row per n-gram.
+        """
+        num_activities = len(self._activity_vocabulary())
+        powers = num_activities ** np.arange(size-1, -1, -1, dtype=np.int64)
+
+        return (ngram_codes[:, None] // powers) % num_activities
+
+
+    def _get_ngram_column_positions(self, ngram_codes: np.ndarray, size: int) -> np.ndarray:
+        """
+        Return the column (position in _get_ngram_columns) counting the n-grams of the provided size and codes: n-grams not in vocab are counted in the UNKNOWN column (the last one).
+        """
+        activity_positions = {activity: i for i, activity in enumerate(self._activity_vocabulary())}
+        vocab_columns = np.array([i for i, ngram in enumerate(self.log_ngrams) if len(ngram) == size], dtype=np.int64)
+
+        positions = np.full(len(ngram_codes), len(self.log_ngrams), dtype=np.int64)
+        if len(vocab_columns) == 0:
+            return positions
+
+        # Vocab n-grams only contain vocab activities, since both are built (and frozen) together
+        vocab_activities = np.array([[activity_positions[activity] for activity in self.log_ngrams[i]] for i in vocab_columns], dtype=np.int64)
+        vocab_codes = vocab_activities @ (len(activity_positions) ** np.arange(size-1, -1, -1, dtype=np.int64))
+
+        sorter = np.argsort(vocab_codes)
+        matches = sorter[np.searchsorted(vocab_codes, ngram_codes, sorter=sorter).clip(max=len(vocab_codes)-1)]
+        is_known = vocab_codes[matches] == ngram_codes
+        positions[is_known] = vocab_columns[matches[is_known]]
+
+        return positions
+
+
+    def _get_ngram_columns(self) -> list[str]:
+        return [self.NGRAM_SEPARATOR.join(ngram) for ngram in self.log_ngrams] + [self.UNKNOWN_VAL]
+
+
+    def _encode(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+
+        # Occurrences of n-grams: the event ending them and the column counting them
+        occurrence_events = []
+        occurrence_columns = []
+
+        for size, ngram_codes in self._code_ngrams(coded_log).items():
+            events = np.flatnonzero(ngram_codes >= 0)
+
+            occurrence_events.append(events)
+            occurrence_columns.append(self._get_ngram_column_positions(ngram_codes[events], size))
+
+        counts = self._cumulate_counts(coded_log, np.concatenate(occurrence_events), np.concatenate(occurrence_columns))
+
+        encoded_df = pd.DataFrame({
+            self.case_id_key: coded_log.event_case_ids(),
+            self.timestamp_key: df[self.timestamp_key].iloc[coded_log.order].reset_index(drop=True),
+            self.ORIGINAL_INDEX_KEY: coded_log.index,
+        })
+        encoded_df = pd.concat([encoded_df, counts], axis=1)
+
+        self._report_progress(cases=coded_log.num_cases, rows=coded_log.num_events)
+
+        return encoded_df
+
+
+    def _cumulate_counts(self, coded_log: CodedLog, occurrence_events: np.ndarray, occurrence_columns: np.ndarray) -> pd.DataFrame:
+        """
+        Build the per-prefix counts from the occurrences of the n-grams. An occurrence sets the count of its column, from its event up to the next occurrence of the same column in the case (or the end of the case), to its rank amongst the occurrences of the column in the case.
+        Only the non-zero counts are materialized, column by column.
+        """
+        num_columns = len(self.log_ngrams) + 1
+
+        # Sort occurrences by column, then by event (i.e. by case and position)
+        order = np.lexsort((occurrence_events, occurrence_columns))
+        occurrence_events = occurrence_events[order]
+        occurrence_columns = occurrence_columns[order]
+
+        event_cases = np.repeat(np.arange(coded_log.num_cases), coded_log.case_lengths)
+        occurrence_cases = event_cases[occurrence_events]
+
+        # Occurrences of the same column in the same case form a group
+        is_group_start = np.ones(len(order), dtype=bool)
+        is_group_start[1:] = (occurrence_columns[1:] != occurrence_columns[:-1]) | (occurrence_cases[1:] != occurrence_cases[:-1])
+        group_starts = np.flatnonzero(is_group_start)
+        group_offsets = np.append(group_starts, len(order))
+        ranks = sequence_depths(group_offsets)
+
+        segment_ends = coded_log.case_offsets[occurrence_cases + 1]
+        is_group_end = np.append(is_group_start[1:], True)
+        segment_ends[~is_group_end] = occurrence_events[1:][~is_group_end[:-1]]
+        segment_lengths = segment_ends - occurrence_events
+
+        # Expand segments into rows and counts
+        segment_offsets = np.zeros(len(order)+1, dtype=np.int64)
+        np.cumsum(segment_lengths, out=segment_offsets[1:])
+        rows = sequence_depths(segment_offsets) - 1 + np.repeat(occurrence_events, segment_lengths)
+        counts = np.repeat(ranks, segment_lengths)
+
+        column_offsets = segment_offsets[np.searchsorted(occurrence_columns, np.arange(num_columns+1))]
+
+        columns = {}
+        for i, column in enumerate(self._get_ngram_columns()):
+            column_rows = rows[column_offsets[i]:column_offsets[i+1]]
+            column_counts = counts[column_offsets[i]:column_offsets[i+1]]
+
+            if self.sparse:
+                columns[column] = sparse_array(column_counts, column_rows, coded_log.num_events)
+            else:
+                columns[column] = np.zeros(coded_log.num_events, dtype=np.int64)
+                columns[column][column_rows] = column_counts
+
+        return pd.DataFrame(columns, index=pd.RangeIndex(coded_log.num_events))
+
+
+    def _estimate_feature_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        dtype = pd.SparseDtype(np.int64, 0) if self.sparse else np.dtype(np.int64)
+
+        return [(column, dtype, None) for column in self._get_ngram_columns()]
+
@@ -0,0 +1,180 @@
+import os
+import copy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import pandas as pd
+
+from .coded_log import CodedLog
+
+# Encoder shipped once to each worker process by _init_worker
+_worker_encoder = None
+
+# Shared arrays attached once by each worker process in _init_shared_memory_worker
+_worker_shared_memories = []
+_worker_arrays = {}
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """
+    Return the number of worker processes corresponding to n_jobs (-1 means all available CPUs).
+    """
+    if not isinstance(n_jobs, int) or (n_jobs <= 0 and n_jobs != -1):
+        raise ValueError(f'n_jobs must be either -1 or a positive integer ({n_jobs} has been provided instead)')
+
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+
+    return n_jobs
+
+
+def partition_by_case(df: pd.DataFrame, case_id_key: str, num_partitions: int) -> list[pd.DataFrame]:
+    """
+    Split df in num_partitions partitions by hashing the case id, so that all events of a case end up in the same partition. Empty partitions are discarded.
+    """
+    partition_ids = pd.util.hash_pandas_object(df[case_id_key], index=False).to_numpy() % num_partitions
+
+    partitions = []
+    for partition_id in range(num_partitions):
+        partition = df[partition_ids == partition_id]
+
+        if not partition.empty:
+            partitions.append(partition)
+
+    return partitions
+
+
+def encode_in_parallel(encoder, df: pd.DataFrame, n_jobs: int) -> pd.DataFrame:
+    """
+    Run encoder._encode on case partitions of the preprocessed log df in a pool of n_jobs processes and concatenate the results.
+    The encoder (i.e. its vocabularies) is shipped once per worker, while each task only carries its partition.
+    """
+    partitions = partition_by_case(df, encoder.case_id_key, n_jobs)
+
+    # Do not ship the whole original log to the workers: each task carries its own rows
+    worker_encoder = _get_worker_encoder(encoder)
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(worker_encoder,)) as executor:
+        futures = {
+            executor.submit(_encode_partition, partition, encoder.original_df.loc[partition.index]): partition
+            for partition in partitions
+        }
+
+        # Progress is reported by the parent process, as partitions are completed
+        for future in as_completed(futures):
+            encoder._report_progress(cases=futures[future][encoder.case_id_key].nunique(), rows=len(futures[future]))
+
+        encoded_partitions = [future.result() for future in futures]
+
+    return pd.concat(encoded_partitions, ignore_index=True)
+
+
+def split_cases(case_offsets: np.ndarray, num_ranges: int) -> list[tuple[int, int]]:
+    """
+    Split the cases delimited by case_offsets in at most num_ranges contiguous ranges of cases with about the same number of events. Ranges are returned as (first case, last case + 1).
+    """
+    num_events = case_offsets[-1]
+    targets = np.arange(1, num_ranges) * num_events // num_ranges
+    bounds = np.unique(np.concatenate([[0], np.searchsorted(case_offsets, targets), [len(case_offsets)-1]]))
+
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def encode_in_shared_memory(encoder, df: pd.DataFrame, n_jobs: int, coded_log: CodedLog = None) -> pd.DataFrame:
+    """
+    Encode the preprocessed log df with encoder._encode_coded in a pool of n_jobs processes.
+    The integer-coded events and the preallocated output matrix are placed in shared memory: workers read their range of cases and write its encoding in place, so neither partitions nor results are pickled.
+    If provided, coded_log must be the coded view of df; otherwise it is built from df.
+    """
+    if coded_log is None:
+        coded_log = encoder._code_log(df)
+
+    arrays = {
+        'activities': coded_log.code_activities(encoder._activity_vocabulary(), encoder.UNKNOWN_VAL),
+        'parents': coded_log.parents,
+        'depths': coded_log.depths,
+    }
+    out_shape = (coded_log.num_events, encoder._coded_width())
+    out_dtype = np.dtype(encoder.CODED_DTYPE)
+
+    shared_memories = []
+    try:
+        # Place the inputs and the output matrix in shared memory
+        shared_arrays = {}
+        for name, array in arrays.items():
+            shared_memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared_memories.append(shared_memory)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shared_memory.buf)[:] = array
+            shared_arrays[name] = (shared_memory.name, array.shape, array.dtype)
+
+        out_shared_memory = SharedMemory(create=True, size=max(int(np.prod(out_shape)) * out_dtype.itemsize, 1))
+        shared_memories.append(out_shared_memory)
+        shared_arrays['out'] = (out_shared_memory.name, out_shape, out_dtype)
+
+        worker_encoder = _get_worker_encoder(encoder)
+        case_ranges = split_cases(coded_log.case_offsets, n_jobs)
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_shared_memory_worker, initargs=(worker_encoder, shared_arrays)) as executor:
+            futures = {
+                executor.submit(_encode_shared_range, coded_log.case_offsets[first_case].item(), coded_log.case_offsets[last_case].item()): (first_case, last_case)
+                for first_case, last_case in case_ranges
+            }
+
+            for future in as_completed(futures):
+                future.result()
+
+                first_case, last_case = futures[future]
+                encoder._report_progress(cases=last_case - first_case, rows=(coded_log.case_offsets[last_case] - coded_log.case_offsets[first_case]).item())
+
+        # Copy the result out of shared memory before releasing it
+        out = np.ndarray(out_shape, dtype=out_dtype, buffer=out_shared_memory.buf).copy()
+    finally:
+        for shared_memory in shared_memories:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    return encoder._coded_frame(df, coded_log, out)
+
+
+def _get_worker_encoder(encoder):
+    """
+    Return a copy of encoder to ship to worker processes, without per-call state (the original log is not needed and progress is reported by the parent process).
+    """
+    worker_encoder = copy.copy(encoder)
+    worker_encoder.original_df = None
+    worker_encoder.progress_reporter = None
+
+    return worker_encoder
+
+
+def _init_worker(encoder) -> None:
+    global _worker_encoder
+    _worker_encoder = encoder
+
+
+def _encode_partition(partition: pd.DataFrame, original_partition: pd.DataFrame) -> pd.DataFrame:
+    _worker_encoder.original_df = original_partition
+    return _worker_encoder._encode(partition)
+
+
+def _init_shared_memory_worker(encoder, shared_arrays: dict[str, tuple]) -> None:
+    global _worker_encoder
+    _worker_encoder = encoder
+
+    for name, (shared_memory_name, shape, dtype) in shared_arrays.items():
+        shared_memory = SharedMemory(name=shared_memory_name)
+        _worker_shared_memories.append(shared_memory)
+        _worker_arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+
+
+def _encode_shared_range(start: int, stop: int) -> None:
+    # Parents of a range of whole cases are within the range: rebase them on the range start
+    parents = _worker_arrays['parents'][start:stop]
+    parents = np.where(parents >= 0, parents - start, -1)
+
+    _worker_encoder._encode_coded(
+        _worker_arrays['activities'][start:stop],
+        parents,
+        _worker_arrays['depths'][start:stop],
+        _worker_arrays['out'][start:stop],
+    )
@@ -0,0 +1,259 @@
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+from .base_encoder import BaseEncoder
+from .coded_log import CodedLog, prefix_positions
+from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy, ParallelBackend, TimeFeature
+from .cache import PreprocessedLogCache
+from .time_features import BusinessCalendar
+from .instrumentation import StageMetrics, EncodingProgress
+
+class SequenceEncoder(BaseEncoder):
+    PADDING_ID = 0
+    UNKNOWN_ID = 1
+
+    def __init__(
+        self,
+        *,
+        ragged: bool = False,
+
+        labeling_type: LabelingType = LabelingType.NEXT_ACTIVITY,
+        attributes: list[str] | str = [],
+        numerical_scaling: NumericalScaling = NumericalScaling.NONE,
+        prefix_length: int = None,
+        prefix_strategy: PrefixStrategy = PrefixStrategy.UP_TO_SPECIFIED,
+        add_time_features: bool | list[TimeFeature] = False,
+        timestamp_format: str = None,
+        case_id_key: str = 'case:concept:name',
+        activity_key: str = 'concept:name',
+        timestamp_key: str = 'time:timestamp',
+        outcome_key: str = 'outcome',
+        max_vocabulary_size: int | dict[str, int] = None,
+        min_value_frequency: int | dict[str, int] = None,
+        business_calendar: BusinessCalendar = None,
+    ) -> None:
+        """
+        Initialize the SequenceEncoder, which encodes every prefix as sequences of integer token ids (activities and categorical attributes) and floats (numerical attributes), to be fed to embedding-based models.
+        Token ids are taken from the vocabularies built from the log (see get_token_ids): PADDING_ID (0) for padding, UNKNOWN_ID (1) for values not in the vocabulary, and ids from 2 onwards for the values of the vocabulary. Trace attributes are encoded once per prefix, as a single token id or float.
+
+        Args:
+            ragged: Whether to encode every sequence (activities and event attributes) as a single column holding an array per prefix, as long as the prefix. Otherwise, sequences take one column per position (with suffix _<i>), padded up to prefix_length with PADDING_ID (token ids) or PADDING_NUM_VAL (floats).
+            labeling_type: Label type to apply to examples.
+            attributes: Which attributes to consider. Can be a list of the attributes to consider or the string 'all' (all attributes found in the log will be encoded).
+            numerical_scaling: How to scale numerical features. They can be standardized (NumericalScaling.STANDARDIZATION) or left as-is (NumericalScaling.NONE).
+            prefix_length: Maximum prefix length to consider: longer prefixes will be discarded, shorter prefixes may be discarded depending on prefix_strategy parameter. If not provided, defaults to maximum prefix length found in log. If provided, it must be a non-zero positive int number.
+            prefix_strategy: Whether to consider prefix lengths from 1 to prefix_length (PrefixStrategy.UP_TO_SPECIFIED) or only the specified prefix_length (PrefixStrategy.ONLY_SPECIFIED).
+            add_time_features: Time features to add to the encoding, as a list of TimeFeature (e.g. hour of day, day of week, time since case start), or True for time since case start and time since last event. TimeFeature.INTER_EVENT_TIMES adds the time since the previous event at every position of the prefix (columns InterEventTime_<i>, padding positions get 0), and requires ragged to be False.
+            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data. Numeric timestamps are read as time since epoch (unit inferred from their magnitude), and datetime columns (including Arrow timestamps) are used as they are.
+            case_id_key: Column name for case identifiers.
+            activity_key: Column name for activity names.
+            timestamp_key: Column name for timestamps.
+            outcome_key: Column name for outcome predition.
+            max_vocabulary_size: Maximum number of distinct values kept in the vocabulary of activities and categorical attributes (the most frequent ones), when the vocabulary is built (i.e. until the encoder is frozen). Other values are folded into the OTHER value, which takes its own token id. Can be an int, or a dict mapping column names (activity_key or attribute names) to their maximum. Frequencies of all values are recorded in the value_frequencies attribute. If not provided, all values are kept.
+            min_value_frequency: Minimum number of events a value must occur in to be kept in the vocabulary of activities and categorical attributes. Rarer values are folded into the OTHER value. Can be an int or a dict, as max_vocabulary_size. If not provided, all values are kept.
+            business_calendar: Working days and hours used by business-calendar time features (e.g. TimeFeature.IS_WORKING_HOURS). If not provided, Monday to Friday from 9 to 17, without holidays.
+        """
+        super().__init__(
+            labeling_type,
+            attributes,
+            CategoricalEncoding.STRING,
+            numerical_scaling,
+            prefix_length,
+            prefix_strategy,
+            add_time_features,
+            timestamp_format,
+            case_id_key,
+            activity_key,
+            timestamp_key,
+            outcome_key,
+            max_vocabulary_size,
+            min_value_frequency,
+            business_calendar,
+        )
+
+        self.ragged = ragged
+
+
+    def encode(
+        self,
+        df: pd.DataFrame,
+        *,
+        freeze: bool = False,
+        n_jobs: int = 1,
+        parallel_backend: ParallelBackend = ParallelBackend.PROCESS,
+        preprocessing_cache: PreprocessedLogCache = None,
+        instrument: bool = False,
+        stage_callback: Callable[[StageMetrics], None] = None,
+        progress_callback: Callable[[EncodingProgress], None] = None,
+        memory_budget: int = None,
+    ) -> pd.DataFrame:
+        """
+        Encode the provided DataFrame with sequence encoding and apply the specified labeling.
+
+        Args:
+            df: DataFrame to encode.
+            freeze: Freeze encoder with provided parameters. Usually set to True when encoding the train log, False otherwise. Required if you want to later save the encoder to a file.
+            n_jobs: Number of worker processes used to encode cases in parallel. Set it to -1 to use all available CPUs.
+            parallel_backend: How cases are exchanged with worker processes when n_jobs is not 1. SequenceEncoder only supports ParallelBackend.PROCESS (partitions and results are pickled).
+            preprocessing_cache: Cache of preprocessed logs. If provided, the preprocessed log is taken from the cache (or stored into it), so that encoding the same log multiple times preprocesses it only once.
+            instrument: Whether to measure every stage of the encoding (duration, rows and columns in and out, peak allocated memory). Measures are stored in the stage_metrics attribute of the encoder as StageMetrics objects.
+            stage_callback: Function called with the StageMetrics of every stage as soon as it ends. Setting it enables instrument.
+            progress_callback: Function called with the EncodingProgress of the encoding (current stage, cases encoded out of the total, rows produced) at the start of every stage and whenever cases are encoded (all at once, or every partition when n_jobs is not 1).
+            memory_budget: Maximum memory of the encoded log, in bytes. If the encoded log is projected to take more (see estimate), a MemoryError is raised before encoding.
+
+        Returns:
+            The encoded DataFrame.
+        """
+        return super()._encode_template(
+            df,
+            freeze=freeze,
+            n_jobs=n_jobs,
+            parallel_backend=parallel_backend,
+            preprocessing_cache=preprocessing_cache,
+            instrument=instrument,
+            stage_callback=stage_callback,
+            progress_callback=progress_callback,
+            memory_budget=memory_budget,
+        )
+
+
+    def get_token_ids(self, column: str) -> dict[str, int]:
+        """
+        Return the token ids of a column, i.e. activity_key or a categorical attribute.
+
+        Args:
+            column: Column whose token ids are returned.
+
+        Returns:
+            A dict mapping PADDING_CAT_VAL to PADDING_ID, UNKNOWN_VAL to UNKNOWN_ID and every other value of the vocabulary of column to its id (from 2 onwards, in vocabulary order).
+        """
+        if column == self.activity_key:
+            vocabulary = self.log_activities
+        elif column in self.log_attributes and self.log_attributes[column]['type'] == 'categorical':
+            vocabulary = self.log_attributes[column]['values']
+        else:
+            raise ValueError(f"Column '{column}' is neither the activity column nor a categorical attribute of the log")
+
+        values = [value for value in dict.fromkeys(vocabulary) if value not in [self.UNKNOWN_VAL, self.PADDING_CAT_VAL]]
+
+        return {self.PADDING_CAT_VAL: self.PADDING_ID, self.UNKNOWN_VAL: self.UNKNOWN_ID} | {value: i for i, value in enumerate(values, start=2)}
+
+
+    def _check_parameters(self, df: pd.DataFrame) -> None:
+        super()._check_parameters(df)
+
+        if not isinstance(self.ragged, bool):
+            raise TypeError('ragged must be a boolean')
+
+        if self.ragged and TimeFeature.INTER_EVENT_TIMES in self._get_time_features():
+            raise ValueError('TimeFeature.INTER_EVENT_TIMES takes one column per position, so it cannot be combined with ragged sequences')
+
+
+    def _get_num_positions(self) -> int:
+        return self.prefix_length
+
+
+    def _get_position_events(self, case_offsets: np.ndarray) -> np.ndarray:
+        return prefix_positions(case_offsets, self.prefix_length)
+
+
+    def _encode(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+        sorted_df = df.iloc[coded_log.order].reset_index(drop=True)
+
+        encoded_columns = {
+            self.case_id_key: coded_log.event_case_ids(),
+            self.timestamp_key: sorted_df[self.timestamp_key],
+            self.ORIGINAL_INDEX_KEY: coded_log.index,
+        }
+
+        # Add trace attributes
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'trace': continue
+
+            if attribute['type'] == 'categorical':
+                encoded_columns[attribute_name] = self._code_tokens(attribute_name, sorted_df[attribute_name])
+            else:
+                encoded_columns[attribute_name] = sorted_df[attribute_name].to_numpy(dtype=np.float64)
+
+        # Add activities
+        token_ids = self.get_token_ids(self.activity_key)
+        activity_ids = np.array([token_ids[activity] for activity in self._activity_vocabulary()], dtype=np.int64)
+        activities = activity_ids[coded_log.code_activities(self._activity_vocabulary(), self.UNKNOWN_VAL)]
+        encoded_columns.update(self._take_sequences(coded_log, activities, self.EVENT_COL_PREFIX_NAME, self.PADDING_ID))
+
+        # Add event attributes
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'event': continue
+
+            if attribute['type'] == 'categorical':
+                encoded_columns.update(self._take_sequences(coded_log, self._code_tokens(attribute_name, sorted_df[attribute_name]), attribute_name, self.PADDING_ID))
+            else:
+                encoded_columns.update(self._take_sequences(coded_log, sorted_df[attribute_name].to_numpy(dtype=np.float64), attribute_name, self.PADDING_NUM_VAL))
+
+        self._report_progress(cases=coded_log.num_cases, rows=coded_log.num_events)
+
+        return pd.DataFrame(encoded_columns)
+
+
+    def _code_tokens(self, column: str, values: pd.Series) -> np.ndarray:
+        """
+        Code values of column as token ids. Values not in the vocabulary of column (and missing values) get UNKNOWN_ID.
+        """
+        codes, uniques = pd.factorize(values)
+        token_ids = self.get_token_ids(column)
+
+        # Missing values are coded as -1, i.e. the last id
+        unique_ids = np.array([token_ids.get(value, self.UNKNOWN_ID) for value in uniques] + [self.UNKNOWN_ID], dtype=np.int64)
+
+        return unique_ids[codes]
+
+
+    def _take_sequences(self, coded_log: CodedLog, values: np.ndarray, column_name: str, padding_value) -> dict[str, np.ndarray]:
+        """
+        Take, for every sorted event of coded_log, the values of the events of the prefix ending with it: as an array per prefix if ragged, as one column per position (padded with padding_value) otherwise.
+        """
+        if self.ragged:
+            # Sequences are read-only views over the values of their case, so they take no memory of their own
+            values = values.copy()
+            values.flags.writeable = False
+            starts = np.repeat(coded_log.case_offsets[:-1], coded_log.case_lengths)
+
+            sequences = np.fromiter((values[start:end] for start, end in zip(starts.tolist(), range(1, len(values)+1))), dtype=object, count=len(values))
+            return {column_name: sequences}
+
+        positions = prefix_positions(coded_log.case_offsets, self.prefix_length)
+
+        return {
+            f'{column_name}_{i}': np.where(positions[:, i-1] >= 0, values[positions[:, i-1]], padding_value)
+            for i in range(1, self.prefix_length+1)
+        }
+
+
+    def _estimate_feature_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        columns = []
+
+        # Trace attributes columns
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'trace': continue
+
+            columns.append((attribute_name, np.dtype(np.int64) if attribute['type'] == 'categorical' else np.dtype(np.float64), None))
+
+        # Activity and event attributes columns
+        sequences = [(self.EVENT_COL_PREFIX_NAME, np.dtype(np.int64))]
+        for attribute_name, attribute in self.log_attributes.items():
+            if attribute['scope'] != 'event': continue
+
+            sequences.append((attribute_name, np.dtype(np.int64) if attribute['type'] == 'categorical' else np.dtype(np.float64)))
+
+        for column_name, dtype in sequences:
+            if self.ragged:
+                # Cells are views over the values of their case: only their array header is projected
+                columns.append((column_name, np.dtype(object), [np.zeros(2, dtype=dtype)[:1]]))
+            else:
+                columns += [(f'{column_name}_{i}', dtype, None) for i in range(1, self.prefix_length+1)]
+
+        return columns
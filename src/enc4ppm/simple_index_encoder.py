@@ -1,14 +1,23 @@
+from typing import Callable
+import numpy as np
 import pandas as pd
 
 from .base_encoder import BaseEncoder
-from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy
+from .coded_log import CodedLog, iter_levels, prefix_positions, sliding_windows
+from .constants import LabelingType, CategoricalEncoding, NumericalScaling, PrefixStrategy, ParallelBackend, TimeFeature
+from .cache import PreprocessedLogCache
+from .time_features import BusinessCalendar
+from .instrumentation import StageMetrics, EncodingProgress
 from .helpers import one_hot
 
 class SimpleIndexEncoder(BaseEncoder):
+    CODED_DTYPE = np.int32
+
     def __init__(
         self,
         *,
         include_latest_payload: bool = False,
+        window_size: int = None,
 
         labeling_type: LabelingType = LabelingType.NEXT_ACTIVITY,
         attributes: list[str] | str = [],
@@ -16,30 +25,37 @@ class SimpleIndexEncoder(BaseEncoder):
         numerical_scaling: NumericalScaling = NumericalScaling.NONE,
         prefix_length: int = None,
         prefix_strategy: PrefixStrategy = PrefixStrategy.UP_TO_SPECIFIED,
-        add_time_features: bool = False,
+        add_time_features: bool | list[TimeFeature] = False,
         timestamp_format: str = None,
         case_id_key: str = 'case:concept:name',
         activity_key: str = 'concept:name',
         timestamp_key: str = 'time:timestamp',
         outcome_key: str = 'outcome',
+        max_vocabulary_size: int | dict[str, int] = None,
+        min_value_frequency: int | dict[str, int] = None,
+        business_calendar: BusinessCalendar = None,
     ) -> None:
         """
         Initialize the SimpleIndexEncoder.
 
         Args:
             include_latest_payload: Whether to include (True) or not (False) the latest values of trace and event attributes. The attributes to consider can be specified through the `attributes` parameter.
+            window_size: If provided, every prefix is encoded by its last window_size events only (sliding window), right-aligned: column event_<window_size> holds the last event of the prefix, and only prefixes shorter than window_size are padded. Columns then depend on window_size instead of prefix_length, which still determines which prefixes are encoded.
             labeling_type: Label type to apply to examples.
             attributes: Which attributes to consider. Can be a list of the attributes to consider or the string 'all' (all attributes found in the log will be encoded).
             categorical_encoding: How to encode categorical features. They can either remain strings (CategoricalEncoding.STRING) or be converted to one-hot vectors splitted across multiple columns (CategoricalEncoding.ONE_HOT).
             numerical_scaling: How to scale numerical features. They can be standardized (NumericalScaling.STANDARDIZATION) or left as-is (NumericalScaling.NONE).
             prefix_length: Maximum prefix length to consider: longer prefixes will be discarded, shorter prefixes may be discarded depending on prefix_strategy parameter. If not provided, defaults to maximum prefix length found in log. If provided, it must be a non-zero positive int number.
             prefix_strategy: Whether to consider prefix lengths from 1 to prefix_length (PrefixStrategy.UP_TO_SPECIFIED) or only the specified prefix_length (PrefixStrategy.ONLY_SPECIFIED).
-            add_time_features: Whether to add time features (time since case start and time since last event) to the encoding.
-            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data.
+            add_time_features: Time features to add to the encoding, as a list of TimeFeature (e.g. hour of day, day of week, time since case start), or True for time since case start and time since last event. TimeFeature.INTER_EVENT_TIMES adds the time since the previous event at every position of the prefix (columns InterEventTime_<i>, padding positions get 0).
+            timestamp_format: Format of the timestamps in the log. If not provided, formatting will be inferred from the data. Numeric timestamps are read as time since epoch (unit inferred from their magnitude), and datetime columns (including Arrow timestamps) are used as they are.
             case_id_key: Column name for case identifiers.
             activity_key: Column name for activity names.
             timestamp_key: Column name for timestamps.
             outcome_key: Column name for outcome predition.
+            max_vocabulary_size: Maximum number of distinct values kept in the vocabulary of activities and categorical attributes (the most frequent ones), when the vocabulary is built (i.e. until the encoder is frozen). Other values are folded into the OTHER value. Can be an int, or a dict mapping column names (activity_key or attribute names) to their maximum. Frequencies of all values are recorded in the value_frequencies attribute. If not provided, all values are kept.
+            min_value_frequency: Minimum number of events a value must occur in to be kept in the vocabulary of activities and categorical attributes. Rarer values are folded into the OTHER value. Can be an int or a dict, as max_vocabulary_size. If not provided, all values are kept.
+            business_calendar: Working days and hours used by business-calendar time features (e.g. TimeFeature.IS_WORKING_HOURS). If not provided, Monday to Friday from 9 to 17, without holidays.
         """
         super().__init__(
             labeling_type,
@@ -54,9 +70,13 @@ class SimpleIndexEncoder(BaseEncoder):
             activity_key,
             timestamp_key,
             outcome_key,
+            max_vocabulary_size,
+            min_value_frequency,
+            business_calendar,
         )
 
         self.include_latest_payload = include_latest_payload
+        self.window_size = window_size
 
     
     def encode(
@@ -64,6 +84,14 @@ class SimpleIndexEncoder(BaseEncoder):
         df: pd.DataFrame,
         *,
         freeze: bool = False,
+        n_jobs: int = 1,
+        parallel_backend: ParallelBackend = ParallelBackend.PROCESS,
+        preprocessing_cache: PreprocessedLogCache = None,
+        deduplicate_variants: bool = False,
+        instrument: bool = False,
+        stage_callback: Callable[[StageMetrics], None] = None,
+        progress_callback: Callable[[EncodingProgress], None] = None,
+        memory_budget: int = None,
     ) -> pd.DataFrame:
         """
         Encode the provided DataFrame with simple-index encoding and apply the specified labeling.
@@ -71,19 +99,64 @@ class SimpleIndexEncoder(BaseEncoder):
         Args:
             df: DataFrame to encode.
             freeze: Freeze encoder with provided parameters. Usually set to True when encoding the train log, False otherwise. Required if you want to later save the encoder to a file.
+            n_jobs: Number of worker processes used to encode cases in parallel. Set it to -1 to use all available CPUs.
+            parallel_backend: How cases are exchanged with worker processes when n_jobs is not 1. Partitions and results can be pickled (ParallelBackend.PROCESS) or placed in shared memory (ParallelBackend.SHARED_MEMORY).
+            preprocessing_cache: Cache of preprocessed logs. If provided, the preprocessed log is taken from the cache (or stored into it), so that encoding the same log multiple times preprocesses it only once.
+            deduplicate_variants: Whether to encode the prefixes of every variant (distinct sequence of activities) only once and copy them to all the cases of the variant. Labels, time features and latest payload are still computed for every case. Cannot be combined with n_jobs.
+            instrument: Whether to measure every stage of the encoding (duration, rows and columns in and out, peak allocated memory). Measures are stored in the stage_metrics attribute of the encoder as StageMetrics objects.
+            stage_callback: Function called with the StageMetrics of every stage as soon as it ends. Setting it enables instrument.
+            progress_callback: Function called with the EncodingProgress of the encoding (current stage, cases encoded out of the total, rows produced) at the start of every stage and whenever cases are encoded (after every case, or every partition when n_jobs is not 1).
+            memory_budget: Maximum memory of the encoded log, in bytes. If the encoded log is projected to take more (see estimate), a MemoryError is raised before encoding.
 
         Returns:
             The encoded DataFrame.
         """
-        return super()._encode_template(df, freeze=freeze)
+        return super()._encode_template(
+            df,
+            freeze=freeze,
+            n_jobs=n_jobs,
+            parallel_backend=parallel_backend,
+            preprocessing_cache=preprocessing_cache,
+            deduplicate_variants=deduplicate_variants,
+            instrument=instrument,
+            stage_callback=stage_callback,
+            progress_callback=progress_callback,
+            memory_budget=memory_budget,
+        )
+
+
+    def _check_parameters(self, df: pd.DataFrame) -> None:
+        super()._check_parameters(df)
+
+        if self.window_size is not None and (not isinstance(self.window_size, int) or self.window_size <= 0):
+            raise ValueError(f'window_size must be either None or a positive integer ({self.window_size} has been provided instead)')
+
+
+    def _get_num_positions(self) -> int:
+        """
+        Number of activity columns: window_size for sliding windows, prefix_length otherwise.
+        """
+        return self.window_size if self.window_size is not None else self.prefix_length
+
+
+    def _get_position_events(self, case_offsets: np.ndarray) -> np.ndarray:
+        if self.window_size is not None:
+            return sliding_windows(case_offsets, self.window_size)
+
+        return prefix_positions(case_offsets, self.prefix_length)
 
 
-    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _encode(self, df: pd.DataFrame, coded_log: CodedLog = None) -> pd.DataFrame:
+        if coded_log is None:
+            coded_log = self._code_log(df)
+
+        if self.window_size is not None:
+            return self._encode_windows(df, coded_log)
+
         rows = []
-        grouped = df.groupby(self.case_id_key)
 
-        for case_id, case_events in grouped:
-            case_events = case_events.sort_values(self.timestamp_key).reset_index()
+        for case_id, case_events in coded_log.iter_cases(df):
+            case_events = case_events.reset_index()
 
             for prefix_length in range(1, len(case_events)+1):
                 row = {
@@ -100,8 +173,65 @@ class SimpleIndexEncoder(BaseEncoder):
                 
                 rows.append(row)
 
+            self._report_progress(rows=len(case_events))
+
         encoded_df = pd.DataFrame(rows)
 
+        return encoded_df
+
+
+    def _encode_windows(self, df: pd.DataFrame, coded_log: CodedLog) -> pd.DataFrame:
+        """
+        Encode every prefix by its last window_size activities, taken from strided windows over the coded activities of its case.
+        """
+        activities = coded_log.code_activities(self._activity_vocabulary(), self.UNKNOWN_VAL).astype(self.CODED_DTYPE)
+        padding_code = len(self._activity_vocabulary()) - 1
+
+        windows = sliding_windows(coded_log.case_offsets, self.window_size)
+        out = np.where(windows >= 0, activities[windows], padding_code)
+
+        self._report_progress(cases=coded_log.num_cases, rows=coded_log.num_events)
+
+        return self._coded_frame(df, coded_log, out)
+
+
+    def _coded_width(self) -> int:
+        return self._get_num_positions()
+
+
+    def _encode_coded(self, activities: np.ndarray, parents: np.ndarray, depths: np.ndarray, out: np.ndarray) -> None:
+        padding_code = len(self._activity_vocabulary()) - 1
+
+        if self.window_size is not None:
+            for _, rows in iter_levels(depths):
+                # A prefix shifts the window of its parent by one, then adds its last activity at the end
+                has_parent = parents[rows] >= 0
+                out[rows[has_parent], :-1] = out[parents[rows[has_parent]], 1:]
+                out[rows[~has_parent], :-1] = padding_code
+                out[rows, -1] = activities[rows]
+
+            return
+
+        for depth, rows in iter_levels(depths):
+            # A prefix repeats the activities of its parent, then adds its last activity (if within prefix_length)
+            has_parent = parents[rows] >= 0
+            out[rows[has_parent]] = out[parents[rows[has_parent]]]
+            out[rows[~has_parent]] = padding_code
+
+            if depth <= self.prefix_length:
+                out[rows, depth-1] = activities[rows]
+
+
+    def _coded_features(self, out: np.ndarray) -> pd.DataFrame:
+        activity_values = np.asarray(self._activity_vocabulary(), dtype=object)
+
+        return pd.DataFrame({
+            f'{self.EVENT_COL_PREFIX_NAME}_{i}': activity_values[out[:, i-1]]
+            for i in range(1, self._get_num_positions()+1)
+        })
+
+
+    def _complete_encoding(self, encoded_df: pd.DataFrame) -> pd.DataFrame:
         if self.include_latest_payload:
             encoded_df = super()._include_latest_payload(encoded_df)
 
@@ -111,7 +241,7 @@ class SimpleIndexEncoder(BaseEncoder):
             categorical_columns_possible_values = []
             
             # Activity columns
-            for i in range(1, self.prefix_length+1):
+            for i in range(1, self._get_num_positions()+1):
                 categorical_columns.append(f'{self.EVENT_COL_PREFIX_NAME}_{i}')
                 categorical_columns_possible_values.append(self.log_activities)
 
@@ -133,3 +263,23 @@ class SimpleIndexEncoder(BaseEncoder):
             )
 
         return encoded_df
+
+
+    def _estimate_feature_columns(self, df: pd.DataFrame) -> list[tuple[str, object, list | None]]:
+        activity_values = self._activity_vocabulary()
+        columns = [self._estimate_categorical_column(f'{self.EVENT_COL_PREFIX_NAME}_{i}', activity_values) for i in range(1, self._get_num_positions()+1)]
+
+        if self.include_latest_payload:
+            columns += self._estimate_latest_payload_columns(df)
+
+        if self.categorical_encoding == CategoricalEncoding.ONE_HOT:
+            columns_possible_values = {f'{self.EVENT_COL_PREFIX_NAME}_{i}': self.log_activities for i in range(1, self._get_num_positions()+1)}
+
+            if self.include_latest_payload:
+                columns_possible_values.update({
+                    name: values for name, _, values in self._estimate_latest_payload_columns(df) if values is not None
+                })
+
+            columns = self._estimate_one_hot_columns(columns, columns_possible_values)
+
+        return columns
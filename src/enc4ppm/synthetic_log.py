@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from .coded_log import iter_levels
+from .constants import CaseLengthDistribution, NumericalDistribution
+
+
+def generate_log(
+    *,
+    num_cases: int = 1000,
+    num_activities: int = 20,
+    case_length_distribution: CaseLengthDistribution = CaseLengthDistribution.LOGNORMAL,
+    mean_case_length: float = 10.0,
+    min_case_length: int = 1,
+    max_case_length: int = 100,
+    num_trace_categorical_attributes: int = 1,
+    num_trace_numerical_attributes: int = 1,
+    num_event_categorical_attributes: int = 1,
+    num_event_numerical_attributes: int = 1,
+    categorical_cardinality: int = 10,
+    numerical_distribution: NumericalDistribution = NumericalDistribution.NORMAL,
+    outcome_ratio: float = 0.5,
+    mean_case_interarrival: float = 3600.0,
+    mean_event_interval: float = 1800.0,
+    start_timestamp: str = '2025-01-01',
+    timestamp_format: str = None,
+    case_id_key: str = 'case:concept:name',
+    activity_key: str = 'concept:name',
+    timestamp_key: str = 'time:timestamp',
+    outcome_key: str = 'outcome',
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Generate a synthetic event log, e.g. to measure the performance of encoders on logs of any size. The same seed always generates the same log.
+
+    Activities follow a random Markov chain with skewed transition probabilities, so that (as in real logs) some variants are much more frequent than others. Cases start at exponentially distributed intervals and their events are spaced by exponentially distributed intervals too.
+    Trace attributes are named 'case:trace_categorical_<i>' and 'case:trace_numerical_<i>', event attributes 'event_categorical_<i>' and 'event_numerical_<i>' (with i zero-padded, so that no attribute name contains another one).
+
+    Args:
+        num_cases: Number of cases.
+        num_activities: Number of distinct activities.
+        case_length_distribution: Distribution of the number of events per case. CaseLengthDistribution.PARETO generates heavy-tailed lengths.
+        mean_case_length: Mean number of events per case (before clipping lengths to [min_case_length, max_case_length]). Ignored by CaseLengthDistribution.UNIFORM.
+        min_case_length: Minimum number of events per case.
+        max_case_length: Maximum number of events per case.
+        num_trace_categorical_attributes: Number of categorical trace attributes.
+        num_trace_numerical_attributes: Number of numerical trace attributes.
+        num_event_categorical_attributes: Number of categorical event attributes.
+        num_event_numerical_attributes: Number of numerical event attributes.
+        categorical_cardinality: Number of distinct values of every categorical attribute.
+        numerical_distribution: Distribution of the values of numerical attributes.
+        outcome_ratio: Fraction of cases with a True outcome.
+        mean_case_interarrival: Mean time (in seconds) between the start of consecutive cases.
+        mean_event_interval: Mean time (in seconds) between consecutive events of a case.
+        start_timestamp: Timestamp of the first event of the log.
+        timestamp_format: If provided, timestamps are formatted as strings with this format. Otherwise, they are datetimes.
+        case_id_key: Column name for case identifiers.
+        activity_key: Column name for activity names.
+        timestamp_key: Column name for timestamps.
+        outcome_key: Column name for the outcome of cases. If None, no outcome column is generated.
+        seed: Seed of the random generator.
+
+    Returns:
+        The generated log, with one row per event, sorted by timestamp.
+    """
+    for name, value in [('num_cases', num_cases), ('num_activities', num_activities), ('min_case_length', min_case_length), ('max_case_length', max_case_length), ('categorical_cardinality', categorical_cardinality)]:
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f'{name} must be a positive integer ({value} has been provided instead)')
+
+    if min_case_length > max_case_length:
+        raise ValueError(f'min_case_length ({min_case_length}) cannot be greater than max_case_length ({max_case_length})')
+
+    if not isinstance(case_length_distribution, CaseLengthDistribution):
+        raise TypeError(f'case_length_distribution must be a valid CaseLengthDistribution: {[e.name for e in CaseLengthDistribution]}')
+
+    if not isinstance(numerical_distribution, NumericalDistribution):
+        raise TypeError(f'numerical_distribution must be a valid NumericalDistribution: {[e.name for e in NumericalDistribution]}')
+
+    if not 0 <= outcome_ratio <= 1:
+        raise ValueError(f'outcome_ratio must be between 0 and 1 ({outcome_ratio} has been provided instead)')
+
+    rng = np.random.default_rng(seed)
+
+    case_lengths = _generate_case_lengths(rng, num_cases, case_length_distribution, mean_case_length, min_case_length, max_case_length)
+    case_offsets = np.concatenate([[0], np.cumsum(case_lengths)])
+    num_events = case_offsets[-1].item()
+
+    event_cases = np.repeat(np.arange(num_cases), case_lengths)
+    event_positions = np.arange(num_events) - np.repeat(case_offsets[:-1], case_lengths)
+
+    # Activities: Markov chain with skewed start and transition probabilities
+    start_probabilities = rng.dirichlet(np.full(num_activities, 0.3))
+    transition_probabilities = rng.dirichlet(np.full(num_activities, 0.3), size=num_activities)
+
+    activities = np.empty(num_events, dtype=np.int64)
+    first_events = case_offsets[:-1]
+    for depth, events in iter_levels(event_positions + 1):
+        if depth == 1:
+            activities[events] = rng.choice(num_activities, size=len(events), p=start_probabilities)
+        else:
+            activities[events] = _sample_categorical(rng, transition_probabilities[activities[events-1]])
+
+    activity_width = len(str(num_activities))
+    activity_names = np.array([f'Activity_{i:0{activity_width}d}' for i in range(1, num_activities+1)], dtype=object)
+
+    # Timestamps
+    case_starts = np.cumsum(rng.exponential(mean_case_interarrival, size=num_cases))
+    event_intervals = rng.exponential(mean_event_interval, size=num_events)
+    event_intervals[first_events] = 0
+    event_offsets = np.cumsum(event_intervals)
+    event_offsets -= np.repeat(event_offsets[first_events], case_lengths)
+    timestamps = pd.Timestamp(start_timestamp) + pd.to_timedelta(np.repeat(case_starts - case_starts[0], case_lengths) + event_offsets, unit='s').round('s')
+
+    case_width = len(str(num_cases))
+    case_ids = np.array([f'Case_{i:0{case_width}d}' for i in range(1, num_cases+1)], dtype=object)
+
+    columns = {
+        case_id_key: case_ids[event_cases],
+        activity_key: activity_names[activities],
+        timestamp_key: timestamps,
+    }
+
+    # Attributes: trace attributes are drawn once per case, event attributes once per event
+    for scope, num_categorical, num_numerical, size, prefix, event_rows in [
+        ('trace', num_trace_categorical_attributes, num_trace_numerical_attributes, num_cases, 'case:', event_cases),
+        ('event', num_event_categorical_attributes, num_event_numerical_attributes, num_events, '', slice(None)),
+    ]:
+        width = len(str(max(num_categorical, num_numerical, 1)))
+
+        for i in range(1, num_categorical+1):
+            name = f'{prefix}{scope}_categorical_{i:0{width}d}'
+            values = np.array([f'{scope}_categorical_{i:0{width}d}_value_{k}' for k in range(1, categorical_cardinality+1)], dtype=object)
+            columns[name] = values[rng.choice(categorical_cardinality, size=size, p=rng.dirichlet(np.ones(categorical_cardinality)))][event_rows]
+
+        for i in range(1, num_numerical+1):
+            name = f'{prefix}{scope}_numerical_{i:0{width}d}'
+            columns[name] = _sample_numerical(rng, numerical_distribution, size)[event_rows]
+
+    if outcome_key is not None:
+        columns[outcome_key] = (rng.random(num_cases) < outcome_ratio)[event_cases]
+
+    df = pd.DataFrame(columns)
+
+    # Interleave cases as in a real log
+    df = df.sort_values(timestamp_key, kind='stable').reset_index(drop=True)
+
+    if timestamp_format is not None:
+        df[timestamp_key] = df[timestamp_key].dt.strftime(timestamp_format)
+
+    return df
+
+
+def _generate_case_lengths(
+    rng: np.random.Generator,
+    num_cases: int,
+    distribution: CaseLengthDistribution,
+    mean_length: float,
+    min_length: int,
+    max_length: int,
+) -> np.ndarray:
+    """
+    Draw the number of events of every case, clipped to [min_length, max_length].
+    """
+    if distribution == CaseLengthDistribution.UNIFORM:
+        return rng.integers(min_length, max_length, size=num_cases, endpoint=True)
+
+    extra_mean = max(mean_length - min_length, 1e-9)
+
+    if distribution == CaseLengthDistribution.GEOMETRIC:
+        extra_lengths = rng.geometric(1 / (extra_mean + 1), size=num_cases) - 1
+    elif distribution == CaseLengthDistribution.LOGNORMAL:
+        sigma = 1.0
+        extra_lengths = rng.lognormal(np.log(extra_mean) - sigma**2 / 2, sigma, size=num_cases)
+    else:
+        # Lomax (Pareto II) distribution with shape 1.5: finite mean, infinite variance
+        shape = 1.5
+        extra_lengths = rng.pareto(shape, size=num_cases) * extra_mean * (shape - 1)
+
+    return np.clip(np.rint(min_length + extra_lengths), min_length, max_length).astype(np.int64)
+
+
+def _sample_categorical(rng: np.random.Generator, probabilities: np.ndarray) -> np.ndarray:
+    """
+    Draw one category per row of probabilities (rows of probabilities sum to 1), e.g. the next activity of every event given the transition probabilities of its activity.
+    """
+    cumulative_probabilities = np.cumsum(probabilities, axis=1)
+    samples = (rng.random((len(probabilities), 1)) * cumulative_probabilities[:, -1:] > cumulative_probabilities).sum(axis=1)
+
+    return np.minimum(samples, probabilities.shape[1] - 1)
+
+
+def _sample_numerical(rng: np.random.Generator, distribution: NumericalDistribution, size: int) -> np.ndarray:
+    """
+    Draw size values of a numerical attribute, with random scale.
+    """
+    scale = rng.uniform(1, 1000)
+
+    if distribution == NumericalDistribution.NORMAL:
+        return rng.normal(rng.uniform(-scale, scale), scale, size=size)
+
+    if distribution == NumericalDistribution.UNIFORM:
+        return rng.uniform(0, scale, size=size)
+
+    return rng.lognormal(np.log(scale), 1.0, size=size)
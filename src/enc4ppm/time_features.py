@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+from .constants import TimeFeature
+
+NS_PER_SECOND = 10**9
+SECONDS_PER_DAY = 24 * 60 * 60
+NS_PER_DAY = SECONDS_PER_DAY * NS_PER_SECOND
+
+# Time features taking values of type int or bool (the others are float)
+INTEGER_TIME_FEATURES = [TimeFeature.HOUR_OF_DAY, TimeFeature.DAY_OF_WEEK, TimeFeature.MONTH, TimeFeature.WORKING_DAYS_SINCE_CASE_START]
+BOOLEAN_TIME_FEATURES = [TimeFeature.IS_WORKING_DAY, TimeFeature.IS_WORKING_HOURS]
+
+
+@dataclass
+class BusinessCalendar:
+    """
+    Working days and hours used by business-calendar time features (TimeFeature.IS_WORKING_DAY, TimeFeature.IS_WORKING_HOURS and TimeFeature.WORKING_DAYS_SINCE_CASE_START).
+
+    Attributes:
+        weekmask: Working days of the week, from Monday to Sunday (e.g. '1111100' for Monday to Friday), as accepted by numpy.busday_count.
+        holidays: Non-working dates (e.g. ['2025-01-01', '2025-12-25']).
+        working_hours: Hours at which working days start and end (end excluded).
+    """
+    weekmask: str = '1111100'
+    holidays: list[str] = field(default_factory=list)
+    working_hours: tuple[int, int] = (9, 17)
+
+
+def timestamps_to_ns(timestamps: pd.Series, wall_time: bool = False) -> np.ndarray:
+    """
+    Return the timestamps as int64 nanoseconds since epoch. Timezone-aware timestamps are taken in UTC, so that differences between them are real elapsed times, unless wall_time is True (they then keep their local wall time, e.g. for the hour of day).
+    """
+    if wall_time and getattr(timestamps.dt, 'tz', None) is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+
+    return pd.DatetimeIndex(timestamps).as_unit('ns').asi8
+
+
+def compute_time_features(
+    timestamps: np.ndarray,
+    case_offsets: np.ndarray,
+    time_features: list[TimeFeature],
+    business_calendar: BusinessCalendar,
+    wall_timestamps: np.ndarray = None,
+) -> dict[TimeFeature, np.ndarray]:
+    """
+    Compute the requested time features of every event, from the int64 timestamps (see timestamps_to_ns) of events sorted by case and timestamp, whose cases are delimited by case_offsets.
+    Durations are computed from timestamps, calendar features (hour of day, day of week, month, time since midnight and business-calendar features) from wall_timestamps, i.e. the same timestamps in local wall time. If not provided, wall_timestamps are timestamps (e.g. timezone-naive logs).
+    Every feature is derived with array operations from the same intermediate arrays (day of every event, time since midnight, first event of its case), each computed once.
+    TimeFeature.INTER_EVENT_TIMES gives the time since the previous event of every event: index encoders then take it at every position of their prefixes.
+
+    Returns:
+        The values of every requested feature, in the order of time_features. Durations are in seconds.
+    """
+    if wall_timestamps is None:
+        wall_timestamps = timestamps
+
+    lengths = np.diff(case_offsets)
+    case_starts = np.repeat(timestamps[case_offsets[:-1]], lengths)
+    wall_case_starts = np.repeat(wall_timestamps[case_offsets[:-1]], lengths)
+
+    days = wall_timestamps // NS_PER_DAY
+    ns_since_midnight = wall_timestamps - days * NS_PER_DAY
+
+    previous_timestamps = np.empty_like(timestamps)
+    previous_timestamps[1:] = timestamps[:-1]
+    previous_timestamps[case_offsets[:-1][lengths > 0]] = timestamps[case_offsets[:-1][lengths > 0]]
+
+    dates = days.astype('datetime64[D]')
+    busday_kwargs = dict(weekmask=business_calendar.weekmask, holidays=business_calendar.holidays)
+
+    values = {}
+    for time_feature in time_features:
+        if time_feature == TimeFeature.TIME_SINCE_CASE_START:
+            values[time_feature] = (timestamps - case_starts) / NS_PER_SECOND
+        elif time_feature in [TimeFeature.TIME_SINCE_PREVIOUS_EVENT, TimeFeature.INTER_EVENT_TIMES]:
+            values[time_feature] = (timestamps - previous_timestamps) / NS_PER_SECOND
+        elif time_feature == TimeFeature.HOUR_OF_DAY:
+            values[time_feature] = ns_since_midnight // (3600 * NS_PER_SECOND)
+        elif time_feature == TimeFeature.DAY_OF_WEEK:
+            # 1970-01-01 is a Thursday, Monday is 0
+            values[time_feature] = (days + 3) % 7
+        elif time_feature == TimeFeature.MONTH:
+            values[time_feature] = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        elif time_feature == TimeFeature.TIME_SINCE_MIDNIGHT:
+            values[time_feature] = ns_since_midnight / NS_PER_SECOND
+        elif time_feature == TimeFeature.IS_WORKING_DAY:
+            values[time_feature] = np.is_busday(dates, **busday_kwargs)
+        elif time_feature == TimeFeature.IS_WORKING_HOURS:
+            start_hour, end_hour = business_calendar.working_hours
+            is_within_hours = (ns_since_midnight >= start_hour * 3600 * NS_PER_SECOND) & (ns_since_midnight < end_hour * 3600 * NS_PER_SECOND)
+            values[time_feature] = np.is_busday(dates, **busday_kwargs) & is_within_hours
+        elif time_feature == TimeFeature.WORKING_DAYS_SINCE_CASE_START:
+            values[time_feature] = np.busday_count((wall_case_starts // NS_PER_DAY).astype('datetime64[D]'), dates, **busday_kwargs).astype(np.int64)
+
+    return values
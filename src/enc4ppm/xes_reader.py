@@ -0,0 +1,145 @@
+import xml.etree.ElementTree as ET
+from typing import Iterator
+import pandas as pd
+
+from .base_encoder import BaseEncoder
+from .constants import LabelingType
+
+XES_CASE_PREFIX = 'case:'
+XES_DATE_TYPE = 'date'
+XES_ATTRIBUTE_TYPES = ['string', 'id', 'date', 'int', 'float', 'boolean']
+
+
+def read_xes_batches(
+    filepath: str,
+    *,
+    batch_size: int = 100_000,
+    columns: list[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Incrementally parse a XES file and yield its events as DataFrames, one row per event. Every batch only contains complete traces, so it can be encoded independently from the other batches.
+
+    Trace attributes are prefixed with 'case:' (e.g. the trace name becomes 'case:concept:name'), while event attributes keep their key (e.g. 'concept:name', 'time:timestamp'). Nested attributes (lists and containers) are skipped.
+
+    Args:
+        filepath: Path to the XES file.
+        batch_size: Number of events after which a batch is yielded. A trace is never split across batches, so a batch can exceed batch_size when it contains a trace longer than that.
+        columns: Columns of the yielded batches. If provided, batches are reindexed so that they all share the same columns (missing attributes are set to null). If not provided, each batch contains the attributes found in its traces.
+
+    Returns:
+        An iterator over the batches.
+    """
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError(f'batch_size must be a positive integer ({batch_size} has been provided instead)')
+
+    rows = []
+    date_keys = set()
+    root = None
+
+    for event, elem in ET.iterparse(filepath, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+
+        if _get_tag(elem) != 'trace':
+            continue
+
+        trace_attributes = {}
+        for child in elem:
+            if _get_tag(child) in XES_ATTRIBUTE_TYPES:
+                key, value = _parse_attribute(child, date_keys, prefix=XES_CASE_PREFIX)
+                trace_attributes[key] = value
+
+        for child in elem:
+            if _get_tag(child) != 'event':
+                continue
+
+            row = dict(trace_attributes)
+            for attribute in child:
+                if _get_tag(attribute) in XES_ATTRIBUTE_TYPES:
+                    key, value = _parse_attribute(attribute, date_keys)
+                    row[key] = value
+            rows.append(row)
+
+        # Processed traces are no longer needed: release them, so memory is bounded by the batch size
+        root.clear()
+
+        if len(rows) >= batch_size:
+            yield _build_batch(rows, date_keys, columns)
+            rows = []
+
+    if len(rows) > 0:
+        yield _build_batch(rows, date_keys, columns)
+
+
+def encode_xes(
+    encoder: BaseEncoder,
+    filepath: str,
+    *,
+    batch_size: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Incrementally parse a XES file and encode it batch by batch with a frozen encoder. Batches only contain complete traces, so concatenating the encoded batches gives the same result as encoding the whole log at once.
+
+    Args:
+        encoder: Frozen encoder. Its case_id_key, activity_key and timestamp_key must match the XES keys (which are the encoders' defaults).
+        filepath: Path to the XES file.
+        batch_size: Number of events after which a batch is encoded. See read_xes_batches.
+
+    Returns:
+        An iterator over the encoded batches.
+    """
+    if not encoder.is_frozen:
+        raise RuntimeError("Encoder must be frozen before encoding a XES file in batches. Call with freeze=True during encoding.")
+
+    # Make every batch contain the columns required by the encoder, even if its traces lack some attribute
+    columns = [encoder.case_id_key, encoder.activity_key, encoder.timestamp_key] + list(encoder.attributes)
+    if encoder.labeling_type == LabelingType.OUTCOME:
+        columns.append(encoder.outcome_key)
+
+    for batch_df in read_xes_batches(filepath, batch_size=batch_size, columns=columns):
+        yield encoder.encode(batch_df)
+
+
+def _get_tag(elem: ET.Element) -> str:
+    """
+    Return the tag of elem without its XML namespace.
+    """
+    return elem.tag.rsplit('}', 1)[-1]
+
+
+def _parse_attribute(elem: ET.Element, date_keys: set[str], prefix: str = '') -> tuple[str, str | int | float | bool]:
+    """
+    Return key and typed value of a XES attribute element. Keys of date attributes are added to date_keys, since dates are converted batch-wise.
+    """
+    attribute_type = _get_tag(elem)
+    key = prefix + elem.get('key')
+    value = elem.get('value')
+
+    if attribute_type == XES_DATE_TYPE:
+        date_keys.add(key)
+    elif attribute_type == 'int':
+        value = int(value)
+    elif attribute_type == 'float':
+        value = float(value)
+    elif attribute_type == 'boolean':
+        value = value.lower() == 'true'
+
+    return key, value
+
+
+def _build_batch(rows: list[dict], date_keys: set[str], columns: list[str] = None) -> pd.DataFrame:
+    """
+    Build a DataFrame from parsed events, converting date attributes to UTC timestamps.
+    """
+    batch_df = pd.DataFrame(rows)
+
+    if columns is not None:
+        batch_df = batch_df.reindex(columns=columns)
+
+    for key in date_keys:
+        if key in batch_df.columns:
+            batch_df[key] = pd.to_datetime(batch_df[key], utc=True, format='ISO8601')
+
+    return batch_df
@@ -10,4 +10,5 @@ UNKNOWN_VAL = 'UNKNOWN'
 PADDING_CAT_VAL = 'PADDING'
 PADDING_NUM_VAL = 0.0
 
-NUM_ACTIVITIES = 6
\ No newline at end of file
+NUM_ACTIVITIES = 6
+TEST_XES_LOG_NAME = 'dummy_log.xes'
@@ -0,0 +1,158 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.enc4ppm.aggregation_encoder import AggregationEncoder
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding, NumericalScaling, Aggregation
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(**kwargs):
+    return AggregationEncoder(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def test_aggregation_encoder(log):
+    encoded_log = get_encoder(attributes=['Customer', 'Amount']).encode(log)
+
+    # Case002: Receive Order (0), Contact Supplier (-20), Ship (0), Receive Payment (50)
+    assert encoded_log.iloc[3].to_dict() == {
+        CASE_ID_KEY: 'Case002',
+        UNKNOWN_VAL: 0,
+        'Receive Order': 1,
+        'Ship': 0,
+        'Receive Payment': 0,
+        'Contact Supplier': 1,
+        'Order Returned': 0,
+        'Issue Refund': 0,
+        'EventCount': 2,
+        'Customer_latest': 'CustomerB',
+        'Amount_latest': -20,
+        'Amount_sum': -20.0,
+        'Amount_mean': -10.0,
+        'Amount_min': -20.0,
+        'Amount_max': 0.0,
+        'Amount_std': 10.0,
+        'label': 'Ship',
+    }
+
+    # Activity counts are the ones of frequency encoding
+    frequency_encoded_log = FrequencyEncoder(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    ).encode(log)
+    pd.testing.assert_frame_equal(encoded_log[frequency_encoded_log.columns], frequency_encoded_log)
+
+
+def test_aggregation_encoder_aggregations():
+    log = generate_log(num_cases=100, num_event_numerical_attributes=2, seed=0)
+    numerical_attributes = ['event_numerical_1', 'event_numerical_2']
+
+    encoder = AggregationEncoder(attributes=numerical_attributes, labeling_type=LabelingType.NONE)
+    encoded_log = encoder.encode(log)
+
+    # Compare with aggregations recomputed for every prefix
+    sorted_log = log.sort_values(['case:concept:name', 'time:timestamp'], kind='stable')
+    for case_id, case_events in sorted_log.groupby('case:concept:name'):
+        encoded_case = encoded_log[encoded_log['case:concept:name'] == case_id]
+
+        for prefix_length in range(1, len(case_events)+1):
+            row = encoded_case.loc[case_events.index[prefix_length-1]]
+            assert row['EventCount'] == prefix_length
+
+            for attribute_name in numerical_attributes:
+                values = case_events[attribute_name].iloc[:prefix_length]
+
+                assert row[f'{attribute_name}_latest'] == values.iloc[-1]
+                assert row[f'{attribute_name}_sum'] == pytest.approx(values.sum())
+                assert row[f'{attribute_name}_mean'] == pytest.approx(values.mean())
+                assert row[f'{attribute_name}_min'] == values.min()
+                assert row[f'{attribute_name}_max'] == values.max()
+                assert row[f'{attribute_name}_std'] == pytest.approx(values.std(ddof=0), abs=1e-6)
+
+
+def test_aggregation_encoder_selected_aggregations(log):
+    encoded_log = get_encoder(attributes=['Amount'], aggregations=[Aggregation.MAX, Aggregation.MEAN]).encode(log)
+
+    assert [col for col in encoded_log.columns if col.startswith('Amount')] == ['Amount_latest', 'Amount_max', 'Amount_mean']
+    assert 'EventCount' not in encoded_log.columns
+
+    with pytest.raises(TypeError):
+        get_encoder(aggregations=['sum']).encode(log)
+
+
+def test_aggregation_encoder_onehot(log):
+    encoded_log = get_encoder(attributes=['Customer'], categorical_encoding=CategoricalEncoding.ONE_HOT).encode(log)
+
+    assert 'Customer_latest' not in encoded_log.columns
+    assert encoded_log[['Customer_latest_CustomerA', 'Customer_latest_CustomerB', 'Customer_latest_CustomerC', f'Customer_latest_{UNKNOWN_VAL}']].sum(axis=1).eq(1).all()
+
+
+def test_aggregation_encoder_unknown_values(log):
+    encoder = get_encoder(attributes=['Customer', 'Amount'])
+    frequency_encoder = FrequencyEncoder(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    )
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003', 'Case004'])].copy()
+
+    encoder.encode(train_log, freeze=True)
+    frequency_encoder.encode(train_log, freeze=True)
+    encoded_test_log = encoder.encode(test_log)
+    frequency_encoded_test_log = frequency_encoder.encode(test_log)
+
+    # Unknown activities are counted in the UNKNOWN column, unknown values (CustomerC is only in Case004) become UNKNOWN
+    pd.testing.assert_frame_equal(encoded_test_log[frequency_encoded_test_log.columns], frequency_encoded_test_log)
+    assert encoded_test_log[UNKNOWN_VAL].max() > 0
+    assert set(encoded_test_log['Customer_latest']) == {'CustomerA', UNKNOWN_VAL}
+
+
+def test_aggregation_encoder_standardization(log):
+    encoder = get_encoder(attributes=['Amount'], numerical_scaling=NumericalScaling.STANDARDIZATION, labeling_type=LabelingType.NONE)
+    encoded_log = encoder.encode(log, freeze=True)
+    raw_encoded_log = get_encoder(attributes=['Amount'], labeling_type=LabelingType.NONE).encode(log)
+
+    # Latest values and mean are standardized with the attribute statistics, sums with their own
+    amount_info = encoder.log_attributes['Amount']['values']
+    np.testing.assert_allclose(encoded_log['Amount_mean'], (raw_encoded_log['Amount_mean'] - amount_info['mean']) / amount_info['std'])
+    np.testing.assert_allclose(encoded_log['Amount_sum'].mean(), 0, atol=1e-9)
+    np.testing.assert_allclose(encoder.unscale_numerical_feature(encoded_log, 'Amount_sum')['Amount_sum'], raw_encoded_log['Amount_sum'])
+
+    # Activity counts and event counts are not scaled
+    assert encoded_log['EventCount'].equals(raw_encoded_log['EventCount'])
+
+
+def test_aggregation_encoder_estimate(log):
+    encoder = get_encoder(attributes='all', categorical_encoding=CategoricalEncoding.ONE_HOT, numerical_scaling=NumericalScaling.STANDARDIZATION)
+
+    estimate = encoder.estimate(log)
+    encoded_log = encoder.encode(log)
+
+    assert estimate.rows == len(encoded_log)
+    assert estimate.columns == encoded_log.columns.tolist()
+    assert estimate.dtypes == [str(dtype) for dtype in encoded_log.dtypes]
+
+
+def test_aggregation_encoder_parallel(log):
+    encoded_log = get_encoder(attributes=['Customer', 'Amount']).encode(log)
+    parallel_encoded_log = get_encoder(attributes=['Customer', 'Amount']).encode(log, n_jobs=2)
+
+    pd.testing.assert_frame_equal(encoded_log, parallel_encoded_log)
@@ -0,0 +1,86 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.coded_log import build_prefix_trie
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding, PrefixStrategy
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(encoder_class, **kwargs):
+    return encoder_class(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def rebuild_encoding(prefix_table, index, examples):
+    return pd.concat([examples.iloc[:, :1], prefix_table.iloc[index].reset_index(drop=True), examples.iloc[:, 1:]], axis=1)
+
+
+def test_build_prefix_trie():
+    # Sequences: [0, 1, 2], [0, 1], [1]
+    activities = np.array([0, 1, 2, 0, 1, 1])
+    case_offsets = np.array([0, 3, 5, 6])
+
+    event_nodes, node_activities, node_parents, node_depths = build_prefix_trie(activities, case_offsets)
+
+    assert event_nodes.tolist() == [0, 2, 3, 0, 2, 1]
+    assert node_activities.tolist() == [0, 1, 1, 2]
+    assert node_parents.tolist() == [-1, -1, 0, 2]
+    assert node_depths.tolist() == [1, 1, 2, 3]
+
+
+@pytest.mark.parametrize('encoder_class', [FrequencyEncoder, SimpleIndexEncoder])
+@pytest.mark.parametrize('encoder_kwargs', [
+    dict(labeling_type=LabelingType.NEXT_ACTIVITY),
+    dict(labeling_type=LabelingType.REMAINING_TIME, add_time_features=True, categorical_encoding=CategoricalEncoding.ONE_HOT),
+    dict(labeling_type=LabelingType.OUTCOME, outcome_key='Outcome', prefix_length=2, prefix_strategy=PrefixStrategy.ONLY_SPECIFIED),
+])
+def test_encode_prefix_table(log, encoder_class, encoder_kwargs):
+    encoded_log = get_encoder(encoder_class, **encoder_kwargs).encode(log)
+
+    encoder = get_encoder(encoder_class, **encoder_kwargs)
+    prefix_table, index, examples = encoder.encode_prefix_table(log)
+
+    # All cases start with Receive Order, and Case001 and Case004 share the same variant
+    assert len(prefix_table) < len(encoded_log)
+    pd.testing.assert_frame_equal(rebuild_encoding(prefix_table, index, examples), encoded_log)
+
+
+def test_encode_prefix_table_no_per_call_state(log, monkeypatch):
+    encoder = get_encoder(FrequencyEncoder)
+    prefix_table, index, examples = encoder.encode_prefix_table(log)
+    assert not any(isinstance(value, np.ndarray) for value in vars(encoder).values())
+
+    # An encoding failing after the prefix trie is encoded leaves nothing behind
+    def fail(df):
+        raise RuntimeError('labeling failed')
+
+    monkeypatch.setattr(encoder, '_label_log', fail)
+    with pytest.raises(RuntimeError):
+        encoder.encode_prefix_table(log)
+    monkeypatch.undo()
+
+    assert not any(isinstance(value, np.ndarray) for value in vars(encoder).values())
+    pd.testing.assert_frame_equal(rebuild_encoding(*encoder.encode_prefix_table(log)), rebuild_encoding(prefix_table, index, examples))
+
+
+def test_encode_prefix_table_not_supported(log):
+    with pytest.raises(ValueError):
+        get_encoder(ComplexIndexEncoder).encode_prefix_table(log)
+
+    with pytest.raises(ValueError):
+        get_encoder(FrequencyEncoder, attributes=['Customer'], include_latest_payload=True).encode_prefix_table(log)
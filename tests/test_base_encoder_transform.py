@@ -0,0 +1,65 @@
+import os
+import pytest
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder():
+    return ComplexIndexEncoder(
+        labeling_type=LabelingType.NEXT_ACTIVITY,
+        attributes=['Customer', 'Amount'],
+        categorical_encoding=CategoricalEncoding.ONE_HOT,
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    )
+
+
+def test_transform(log):
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003', 'Case004'])].copy()
+
+    encoder = get_encoder()
+    encoder.encode(train_log, freeze=True)
+    encoder_state = dict(encoder.__dict__)
+
+    encoded_test_log = encoder.transform(test_log)
+
+    # transform must not write anything to the encoder
+    assert encoder.__dict__.keys() == encoder_state.keys()
+    for key, value in encoder_state.items():
+        assert encoder.__dict__[key] is value
+
+    pd.testing.assert_frame_equal(encoded_test_log, encoder.encode(test_log))
+
+
+def test_transform_concurrent(log):
+    encoder = get_encoder()
+    encoded_log = encoder.encode(log, freeze=True)
+
+    logs = [log.sample(frac=1, random_state=i) for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        encoded_logs = list(executor.map(encoder.transform, logs))
+
+    for encoded_shuffled_log in encoded_logs:
+        # Rows follow the (shuffled) input order, so compare them by content
+        sort_columns = encoded_log.columns.tolist()
+        pd.testing.assert_frame_equal(
+            encoded_shuffled_log[sort_columns].sort_values(sort_columns).reset_index(drop=True),
+            encoded_log.sort_values(sort_columns).reset_index(drop=True),
+        )
+
+
+def test_transform_requires_frozen_encoder(log):
+    with pytest.raises(RuntimeError):
+        get_encoder().transform(log)
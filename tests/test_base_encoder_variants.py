@@ -0,0 +1,55 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding, PrefixStrategy
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(encoder_class, **kwargs):
+    return encoder_class(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize('encoder_class', [FrequencyEncoder, SimpleIndexEncoder])
+@pytest.mark.parametrize('encoder_kwargs', [
+    dict(labeling_type=LabelingType.NEXT_ACTIVITY),
+    dict(labeling_type=LabelingType.REMAINING_TIME, add_time_features=True),
+    dict(labeling_type=LabelingType.OUTCOME, outcome_key='Outcome', prefix_length=3, prefix_strategy=PrefixStrategy.ONLY_SPECIFIED),
+    dict(attributes=['Customer', 'Amount'], include_latest_payload=True, categorical_encoding=CategoricalEncoding.ONE_HOT),
+])
+def test_deduplicate_variants(log, encoder_class, encoder_kwargs):
+    # Case001 and Case004 share the same variant
+    encoded_log = get_encoder(encoder_class, **encoder_kwargs).encode(log)
+    encoded_log_variants = get_encoder(encoder_class, **encoder_kwargs).encode(log, deduplicate_variants=True)
+
+    pd.testing.assert_frame_equal(encoded_log_variants, encoded_log)
+
+
+@pytest.mark.parametrize('encoder_class', [FrequencyEncoder, SimpleIndexEncoder])
+def test_deduplicate_variants_frozen(log, encoder_class):
+    encoder = get_encoder(encoder_class)
+    encoder.encode(log[log[CASE_ID_KEY] != 'Case003'], freeze=True)
+
+    pd.testing.assert_frame_equal(encoder.encode(log, deduplicate_variants=True), encoder.encode(log))
+
+
+def test_deduplicate_variants_not_supported(log):
+    with pytest.raises(ValueError):
+        get_encoder(ComplexIndexEncoder)._encode_template(log, deduplicate_variants=True)
+
+    with pytest.raises(ValueError):
+        get_encoder(FrequencyEncoder).encode(log, deduplicate_variants=True, n_jobs=2)
@@ -0,0 +1,97 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.aggregation_encoder import AggregationEncoder
+from src.enc4ppm.ngram_encoder import NGramEncoder
+from src.enc4ppm.cache import PreprocessedLogCache
+from src.enc4ppm.constants import CategoricalEncoding
+from tests.data.dummy_log_info import *
+
+OTHER_VAL = 'OTHER'
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(encoder_class, **kwargs):
+    return encoder_class(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def test_max_vocabulary_size(log):
+    encoder = get_encoder(FrequencyEncoder, max_vocabulary_size=2, attributes=['Customer'], include_latest_payload=True)
+    encoded_log = encoder.encode(log)
+
+    # Ties (Receive Order, Ship and Receive Payment occur in 4 events each) are broken by first occurrence
+    assert encoder.log_activities == ['Receive Order', 'Ship', OTHER_VAL, UNKNOWN_VAL, PADDING_CAT_VAL]
+    assert encoder.log_attributes['Customer']['values'] == ['CustomerA', 'CustomerB', OTHER_VAL, UNKNOWN_VAL, PADDING_CAT_VAL]
+    assert encoder.value_frequencies == {
+        ACTIVITY_KEY: {'Receive Order': 4, 'Ship': 4, 'Receive Payment': 4, 'Contact Supplier': 1, 'Order Returned': 1, 'Issue Refund': 1},
+        'Customer': {'CustomerA': 8, 'CustomerB': 4, 'CustomerC': 3},
+    }
+
+    # Case003: Receive Order, Ship, Receive Payment, Order Returned (Issue Refund is the label)
+    assert encoded_log.loc[8, OTHER_VAL] == 2
+    assert encoded_log.loc[8, 'label'] == OTHER_VAL
+    assert encoded_log.loc[encoded_log[CASE_ID_KEY] == 'Case004', 'Customer_latest'].eq(OTHER_VAL).all()
+
+
+def test_min_value_frequency(log):
+    encoder = get_encoder(SimpleIndexEncoder, min_value_frequency={ACTIVITY_KEY: 2}, categorical_encoding=CategoricalEncoding.ONE_HOT, prefix_length=3)
+    encoded_log = encoder.encode(log)
+
+    assert encoder.log_activities == ['Receive Order', 'Ship', 'Receive Payment', OTHER_VAL, UNKNOWN_VAL, PADDING_CAT_VAL]
+    assert encoded_log.filter(like='event_2').columns.tolist() == [f'event_2_{activity}' for activity in encoder.log_activities]
+
+    # Case002: Receive Order, Contact Supplier
+    assert encoded_log.loc[3, 'event_2_OTHER']
+
+
+def test_vocabulary_caps_frozen(log):
+    encoder = get_encoder(FrequencyEncoder, min_value_frequency=2)
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003', 'Case004'])].copy()
+    test_log.loc[test_log[ACTIVITY_KEY] == 'Order Returned', ACTIVITY_KEY] = 'Contact Supplier'
+
+    encoder.encode(train_log, freeze=True)
+    encoded_test_log = encoder.encode(test_log)
+
+    # Contact Supplier was seen (once) when freezing, Issue Refund was not
+    assert encoder.log_activities == ['Receive Order', 'Ship', 'Receive Payment', OTHER_VAL, UNKNOWN_VAL, PADDING_CAT_VAL]
+    assert encoded_test_log[OTHER_VAL].tolist() == [0, 0, 0, 1, 0, 0]
+    assert encoded_test_log['label'].tolist() == ['Ship', 'Receive Payment', OTHER_VAL, UNKNOWN_VAL, 'Ship', 'Receive Payment']
+
+
+@pytest.mark.parametrize('encoder_class', [FrequencyEncoder, SimpleIndexEncoder, ComplexIndexEncoder, AggregationEncoder, NGramEncoder])
+def test_vocabulary_caps_encoding_strategies(log, encoder_class):
+    encoder_kwargs = dict(max_vocabulary_size=2)
+    if encoder_class != NGramEncoder:
+        encoder_kwargs['attributes'] = ['Customer', 'Amount']
+
+    encoded_log = get_encoder(encoder_class, **encoder_kwargs).encode(log)
+
+    # Folded values are the same whatever the path taken to encode the log
+    pd.testing.assert_frame_equal(get_encoder(encoder_class, **encoder_kwargs).encode(log, n_jobs=2), encoded_log)
+    pd.testing.assert_frame_equal(get_encoder(encoder_class, **encoder_kwargs).encode(log, preprocessing_cache=PreprocessedLogCache()), encoded_log)
+
+    if encoder_class in [FrequencyEncoder, SimpleIndexEncoder]:
+        pd.testing.assert_frame_equal(get_encoder(encoder_class, **encoder_kwargs).encode(log, deduplicate_variants=True), encoded_log)
+
+    assert get_encoder(encoder_class, **encoder_kwargs).estimate(log).columns == encoded_log.columns.tolist()
+
+
+def test_vocabulary_caps_invalid(log):
+    for encoder_kwargs in [dict(max_vocabulary_size=0), dict(min_value_frequency=1.5), dict(max_vocabulary_size={'Customer': 2})]:
+        with pytest.raises(ValueError):
+            get_encoder(FrequencyEncoder, **encoder_kwargs).encode(log)
@@ -0,0 +1,26 @@
+from benchmarks.run_benchmarks import iter_configurations, run_benchmark, compare_results
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType
+
+def test_iter_configurations():
+    configurations = iter_configurations()
+
+    # 3 encoders x 5 labeling types x 2 prefix strategies x 2 categorical encodings x 2 (time features) x 2 (latest payload or attributes)
+    assert len(configurations) == 3 * 5 * 2 * 2 * 2 * 2
+    assert all('include_latest_payload' not in configuration for configuration in configurations if configuration['encoder'] == 'ComplexIndexEncoder')
+
+
+def test_run_benchmark():
+    log = generate_log(num_cases=10, max_case_length=6)
+    configurations = iter_configurations(['FrequencyEncoder', 'ComplexIndexEncoder'], [LabelingType.OUTCOME])[:2]
+
+    results = [run_benchmark(configuration, log, prefix_length=3) for configuration in configurations]
+
+    for result in results:
+        assert result['num_cases'] == 10
+        assert result['num_events'] == len(log)
+        assert result['rows'] > 0 and result['time'] > 0 and result['peak_memory'] > 0
+
+    comparison = compare_results(results, results)
+    assert len(comparison) == len(results)
+    assert (comparison['time_ratio'] == 1).all()
@@ -0,0 +1,164 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.ngram_encoder import NGramEncoder
+from src.enc4ppm.sequence_encoder import SequenceEncoder
+from src.enc4ppm.cache import PreprocessedLogCache, EncodedLogCache, fingerprint_log, _save_frame, _load_frame
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(**kwargs):
+    return SimpleIndexEncoder(
+        labeling_type=LabelingType.NEXT_ACTIVITY,
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def test_fingerprint_log(log):
+    assert fingerprint_log(log) == fingerprint_log(log.copy())
+
+    changed_log = log.copy()
+    changed_log.loc[0, ACTIVITY_KEY] = 'Ship'
+    assert fingerprint_log(log) != fingerprint_log(changed_log)
+
+
+@pytest.mark.parametrize('on_disk', [False, True])
+def test_preprocessed_log_cache(log, tmp_path, on_disk):
+    cache = PreprocessedLogCache(directory=str(tmp_path) if on_disk else None)
+    encoded_log = get_encoder().encode(log)
+
+    encoded_log_miss = get_encoder().encode(log, preprocessing_cache=cache)
+    encoded_log_hit = get_encoder().encode(log.copy(), preprocessing_cache=cache)
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+    pd.testing.assert_frame_equal(encoded_log_miss, encoded_log)
+    pd.testing.assert_frame_equal(encoded_log_hit, encoded_log)
+
+    # Settings affecting preprocessing are part of the key
+    get_encoder(attributes=['Customer']).encode(log, preprocessing_cache=cache)
+    assert cache.misses == 2
+
+
+def test_preprocessed_log_cache_persistence(log, tmp_path):
+    get_encoder().encode(log, preprocessing_cache=PreprocessedLogCache(directory=str(tmp_path)))
+
+    cache = PreprocessedLogCache(directory=str(tmp_path))
+    FrequencyEncoder(timestamp_format=TIMESTAMP_FORMAT, case_id_key=CASE_ID_KEY, activity_key=ACTIVITY_KEY, timestamp_key=TIMESTAMP_KEY).encode(log, preprocessing_cache=cache)
+
+    assert cache.hits == 1
+
+
+@pytest.mark.parametrize('on_disk', [False, True])
+def test_preprocessed_log_cache_eviction(log, tmp_path, on_disk):
+    cache = PreprocessedLogCache(max_bytes=1, directory=str(tmp_path) if on_disk else None)
+
+    get_encoder().encode(log, preprocessing_cache=cache)
+    get_encoder().encode(log, preprocessing_cache=cache)
+
+    # Every entry exceeds max_bytes, so it is evicted right away
+    assert cache.hits == 0
+    assert cache.misses == 2
+
+
+@pytest.mark.parametrize('categorical_encoding', [CategoricalEncoding.STRING, CategoricalEncoding.ONE_HOT])
+def test_encoded_log_cache(log, tmp_path, categorical_encoding):
+    encoder = get_encoder(categorical_encoding=categorical_encoding, attributes='all')
+    encoded_log = encoder.encode(log, freeze=True)
+
+    cache = EncodedLogCache(str(tmp_path))
+    encoded_log_miss = cache.encode(encoder, log)
+    encoded_log_hit = EncodedLogCache(str(tmp_path)).encode(encoder, log.copy())
+
+    assert cache.misses == 1
+    pd.testing.assert_frame_equal(encoded_log_miss, encoded_log)
+    pd.testing.assert_frame_equal(encoded_log_hit, encoded_log)
+
+
+def test_encoded_log_cache_sparse_and_ragged(log, tmp_path):
+    encoder_kwargs = {
+        'timestamp_format': TIMESTAMP_FORMAT,
+        'case_id_key': CASE_ID_KEY,
+        'activity_key': ACTIVITY_KEY,
+        'timestamp_key': TIMESTAMP_KEY,
+    }
+
+    # Sparse n-gram counts
+    encoder = NGramEncoder(**encoder_kwargs)
+    encoded_log = encoder.encode(log, freeze=True)
+    EncodedLogCache(str(tmp_path)).encode(encoder, log)
+    pd.testing.assert_frame_equal(EncodedLogCache(str(tmp_path)).encode(encoder, log), encoded_log)
+
+    # Ragged sequences (arrays in object columns)
+    encoder = SequenceEncoder(ragged=True, attributes=['Customer', 'Amount'], **encoder_kwargs)
+    encoded_log = encoder.encode(log, freeze=True)
+    EncodedLogCache(str(tmp_path)).encode(encoder, log)
+    encoded_log_hit = EncodedLogCache(str(tmp_path)).encode(encoder, log)
+
+    pd.testing.assert_frame_equal(encoded_log_hit.drop(columns=['event', 'Amount']), encoded_log.drop(columns=['event', 'Amount']))
+    for column in ['event', 'Amount']:
+        assert encoded_log_hit[column].dtype == object
+        assert all(np.array_equal(hit, expected) for hit, expected in zip(encoded_log_hit[column], encoded_log[column]))
+
+
+def test_save_frame_round_trip(tmp_path):
+    df = pd.DataFrame({
+        'categorical': pd.Categorical(['b', 'a', 'b'], categories=['c', 'b', 'a'], ordered=True),
+        'timestamp': pd.to_datetime(['2024-03-31 00:30', '2024-03-31 04:30', '2024-03-31 05:30']).tz_localize('Europe/Rome'),
+        'object': np.array([1, 'b', 3], dtype=object),
+        'string': ['a', None, 'c'],
+    }, index=pd.Index([5, 3, 7], name='OriginalIndex'))
+
+    filepath = str(tmp_path / 'frame.npz')
+    _save_frame(df, filepath)
+    loaded_df = _load_frame(filepath)
+
+    pd.testing.assert_frame_equal(loaded_df, df)
+    # Unused categories and their order are kept, non-string objects are not converted to strings
+    assert loaded_df['categorical'].cat.categories.tolist() == ['c', 'b', 'a']
+    assert loaded_df['object'].tolist() == [1, 'b', 3]
+
+
+def test_encoded_log_cache_key(log, tmp_path):
+    cache = EncodedLogCache(str(tmp_path))
+
+    encoder = get_encoder()
+    encoder.encode(log, freeze=True)
+    cache.encode(encoder, log)
+
+    # A different frozen state must not reuse the entry
+    other_encoder = get_encoder()
+    other_encoder.encode(log.iloc[:5], freeze=True)
+    pd.testing.assert_frame_equal(cache.encode(other_encoder, log), other_encoder.encode(log))
+
+    assert cache.hits == 0
+    assert cache.misses == 2
+
+
+def test_encoded_log_cache_not_frozen(log, tmp_path):
+    with pytest.raises(RuntimeError):
+        EncodedLogCache(str(tmp_path)).encode(get_encoder(), log)
+
+
+def test_encoded_log_cache_eviction(log, tmp_path):
+    encoder = get_encoder()
+    encoder.encode(log, freeze=True)
+
+    cache = EncodedLogCache(str(tmp_path), max_bytes=1)
+    cache.encode(encoder, log)
+
+    assert len(list(tmp_path.iterdir())) == 0
@@ -4,6 +4,8 @@ import pandas as pd
 
 from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
 from src.enc4ppm.constants import LabelingType, CategoricalEncoding, PrefixStrategy
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.helpers import hash_buckets
 from tests.data.dummy_log_info import *
 
 PREFIX_LENGTH = 5
@@ -1423,3 +1425,113 @@ def test_complex_index_encoder_onehot_unknown_values(log, gt_encoded_log_onehot_
     encoded_test_log = encoded_test_log.to_dict(orient='records')
     for i in range(len(gt_encoded_log_onehot_unknown_values)):
         assert gt_encoded_log_onehot_unknown_values[i] == encoded_test_log[i]
+
+
+def test_complex_index_encoder_hashed_attributes(log):
+    complex_index_encoder = ComplexIndexEncoder(
+        hashed_attributes={'Customer': 3},
+        labeling_type=LabelingType.NEXT_ACTIVITY,
+        prefix_length=PREFIX_LENGTH,
+        attributes=['Customer', 'Amount'],
+        categorical_encoding=CategoricalEncoding.ONE_HOT,
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    )
+
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003', 'Case004'])].copy()
+
+    encoded_train_log = complex_index_encoder.encode(train_log, freeze=True)
+    encoded_test_log = complex_index_encoder.encode(test_log)
+
+    assert complex_index_encoder.log_attributes['Customer']['values'] == ['Bucket_1', 'Bucket_2', 'Bucket_3', PADDING_CAT_VAL]
+
+    # Unseen customers fall in a bucket instead of UNKNOWN, and columns do not change
+    bucket_columns = ['Customer_Bucket_1', 'Customer_Bucket_2', 'Customer_Bucket_3']
+    assert encoded_test_log.columns.tolist() == encoded_train_log.columns.tolist()
+    assert encoded_test_log.filter(like='Customer').columns.tolist() == bucket_columns
+    assert encoded_test_log[bucket_columns].sum(axis=1).eq(1).all()
+
+
+def test_complex_index_encoder_hashed_event_attributes():
+    log = generate_log(num_cases=50, categorical_cardinality=1000, seed=0)
+    complex_index_encoder = ComplexIndexEncoder(
+        hashed_attributes={'event_categorical_1': 8},
+        prefix_length=4,
+        attributes=['event_categorical_1'],
+        categorical_encoding=CategoricalEncoding.ONE_HOT,
+    )
+
+    encoded_log = complex_index_encoder.encode(log)
+
+    # One column per bucket (plus PADDING) per position, whatever the cardinality of the attribute
+    assert len(encoded_log.filter(like='event_categorical_1').columns) == 4 * (8+1)
+
+    # Values of the first event are replaced by their bucket
+    encoded_log = ComplexIndexEncoder(hashed_attributes={'event_categorical_1': 8}, prefix_length=4, attributes=['event_categorical_1']).encode(log)
+    first_events = log.sort_values('time:timestamp', kind='stable').groupby('case:concept:name').head(1)
+    expected_buckets = dict(zip(first_events['case:concept:name'], [f'Bucket_{bucket+1}' for bucket in hash_buckets(first_events['event_categorical_1'], 8)]))
+
+    assert encoded_log['event_categorical_1_1'].tolist() == encoded_log['case:concept:name'].map(expected_buckets).tolist()
+
+
+def test_complex_index_encoder_hashed_attributes_invalid(log):
+    for hashed_attributes, attributes in [({'Customer': 0}, ['Customer']), ({'Customer': 3}, []), ({'Amount': 3}, ['Amount'])]:
+        with pytest.raises(ValueError):
+            ComplexIndexEncoder(
+                hashed_attributes=hashed_attributes,
+                attributes=attributes,
+                timestamp_format=TIMESTAMP_FORMAT,
+                case_id_key=CASE_ID_KEY,
+                activity_key=ACTIVITY_KEY,
+                timestamp_key=TIMESTAMP_KEY,
+            ).encode(log)
+
+
+def test_complex_index_encoder_window(log):
+    complex_index_encoder = ComplexIndexEncoder(
+        True,
+        window_size=2,
+        labeling_type=LabelingType.NEXT_ACTIVITY,
+        attributes=['Customer', 'Amount'],
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    )
+
+    encoded_log = complex_index_encoder.encode(log)
+
+    assert encoded_log.columns.tolist() == [CASE_ID_KEY, 'Customer', 'event_1', 'event_2', 'Timestamp_1', 'Timestamp_2', 'Amount_1', 'Amount_2', 'label']
+
+    # Case002: Receive Order (0), Contact Supplier (-20), Ship (0)
+    case_encoded_log = encoded_log[encoded_log[CASE_ID_KEY] == 'Case002']
+    assert case_encoded_log[['event_1', 'event_2', 'Amount_1', 'Amount_2']].values.tolist() == [
+        [PADDING_CAT_VAL, 'Receive Order', PADDING_NUM_VAL, 0],
+        ['Receive Order', 'Contact Supplier', 0, -20],
+        ['Contact Supplier', 'Ship', -20, 0],
+    ]
+    assert case_encoded_log['Timestamp_1'].isna().tolist() == [True, False, False]
+    assert case_encoded_log['Timestamp_2'].tolist() == pd.to_datetime(['02/01/2025 12:00', '02/01/2025 17:30', '04/01/2025 10:00'], format=TIMESTAMP_FORMAT).tolist()
+
+
+def test_complex_index_encoder_window_matches_full_encoding():
+    log = generate_log(num_cases=50, mean_case_length=6, seed=0)
+    window_size = 3
+
+    encoded_log = ComplexIndexEncoder(window_size=window_size, attributes='all', labeling_type=LabelingType.NONE).encode(log)
+    full_encoded_log = ComplexIndexEncoder(attributes='all', labeling_type=LabelingType.NONE).encode(log)
+
+    # Windows are the last window_size events of the full encoding of every prefix
+    prefix_lengths = full_encoded_log.groupby('case:concept:name').cumcount().to_numpy() + 1
+    for name, padding_value in [('event', PADDING_CAT_VAL), ('event_categorical_1', PADDING_CAT_VAL), ('event_numerical_1', PADDING_NUM_VAL)]:
+        full_values = full_encoded_log.filter(regex=f'^{name}_\\d+$').to_numpy(dtype=object)
+        values = encoded_log[[f'{name}_{i}' for i in range(1, window_size+1)]].to_numpy(dtype=object)
+
+        for row, prefix_length in enumerate(prefix_lengths):
+            window = full_values[row, max(0, prefix_length-window_size):prefix_length].tolist()
+            assert values[row].tolist() == [padding_value] * (window_size-len(window)) + window
+
+    assert ComplexIndexEncoder(window_size=window_size, attributes='all').estimate(log).columns == ComplexIndexEncoder(window_size=window_size, attributes='all').encode(log).columns.tolist()
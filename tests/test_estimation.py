@@ -0,0 +1,104 @@
+import os
+import itertools
+import pytest
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding, PrefixStrategy
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(encoder_class, **kwargs):
+    return encoder_class(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        outcome_key='Outcome',
+        **kwargs,
+    )
+
+
+def assert_estimate_matches(estimate, encoded_log):
+    assert estimate.rows == len(encoded_log)
+    assert estimate.columns == encoded_log.columns.tolist()
+    assert estimate.dtypes == [str(dtype) for dtype in encoded_log.dtypes]
+
+
+@pytest.mark.parametrize('encoder_class', [FrequencyEncoder, SimpleIndexEncoder, ComplexIndexEncoder])
+@pytest.mark.parametrize('labeling_type', [labeling_type for labeling_type in LabelingType if labeling_type != LabelingType.CUSTOM])
+def test_estimate(log, encoder_class, labeling_type):
+    for prefix_strategy, categorical_encoding, attributes in itertools.product(list(PrefixStrategy), list(CategoricalEncoding), [[], 'all']):
+        extra_kwargs = {'include_timestamps': True} if encoder_class == ComplexIndexEncoder else {'include_latest_payload': True}
+        encoder = get_encoder(
+            encoder_class,
+            labeling_type=labeling_type,
+            prefix_strategy=prefix_strategy,
+            categorical_encoding=categorical_encoding,
+            attributes=attributes,
+            add_time_features=True,
+            prefix_length=3,
+            **extra_kwargs,
+        )
+
+        estimate = encoder.estimate(log)
+
+        # Estimating does not modify the encoder
+        assert encoder.log_activities == []
+        assert encoder.attributes == attributes
+
+        encoded_log = encoder.encode(log, freeze=True)
+        assert_estimate_matches(estimate, encoded_log)
+
+        # Frozen encoders are estimated with their vocabularies
+        assert_estimate_matches(encoder.estimate(log), encoded_log)
+
+
+def test_estimate_bytes():
+    log = generate_log(num_cases=200, seed=0)
+
+    for encoder_class in [FrequencyEncoder, SimpleIndexEncoder, ComplexIndexEncoder]:
+        encoder = encoder_class(attributes='all', categorical_encoding=CategoricalEncoding.ONE_HOT, prefix_length=5)
+
+        estimate = encoder.estimate(log)
+        encoded_log = encoder.encode(log)
+
+        assert_estimate_matches(estimate, encoded_log)
+        assert estimate.bytes == sum(estimate.bytes_per_dtype.values())
+
+        # Fixed-size columns are exact, string columns are projected from their values
+        memory_usage = encoded_log.memory_usage(index=False, deep=True)
+        assert estimate.bytes_per_dtype.get('bool', 0) == memory_usage[encoded_log.dtypes == bool].sum()
+        assert estimate.bytes == pytest.approx(memory_usage.sum(), rel=0.2)
+
+
+def test_memory_budget(log):
+    encoder = get_encoder(ComplexIndexEncoder, attributes='all', categorical_encoding=CategoricalEncoding.ONE_HOT)
+    estimate = encoder.estimate(log)
+
+    with pytest.raises(MemoryError):
+        encoder.encode(log, freeze=True, memory_budget=estimate.bytes - 1)
+
+    # A refused encoding leaves the encoder untouched
+    assert not encoder.is_frozen
+    assert encoder.log_activities == []
+    assert encoder.prefix_length is None
+
+    encoded_log = encoder.encode(log, memory_budget=estimate.bytes)
+    assert_estimate_matches(estimate, encoded_log)
+
+
+def test_memory_budget_invalid(log):
+    encoder = get_encoder(FrequencyEncoder)
+
+    for memory_budget in [0, -1, 1.5, '1GB']:
+        with pytest.raises(ValueError):
+            encoder.encode(log, memory_budget=memory_budget)
@@ -3,7 +3,8 @@ import pytest
 import pandas as pd
 
 from src.enc4ppm.frequency_encoder import FrequencyEncoder
-from src.enc4ppm.constants import LabelingType, CategoricalEncoding
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding, FrequencyEncoding
 from tests.data.dummy_log_info import *
 
 @pytest.fixture
@@ -837,3 +838,72 @@ def test_frequency_encoder_onehot_latest_payload_unknown_values(log, gt_encoded_
     encoded_test_log = encoded_test_log.to_dict(orient='records')
     for i in range(len(gt_encoded_log_onehot_latest_payload_unknown_values)):
         assert gt_encoded_log_onehot_latest_payload_unknown_values[i] == encoded_test_log[i]
+
+
+def test_frequency_encoder_presence(log):
+    frequency_encoder_kwargs = {
+        'labeling_type': LabelingType.NEXT_ACTIVITY,
+        'timestamp_format': TIMESTAMP_FORMAT,
+        'case_id_key': CASE_ID_KEY,
+        'activity_key': ACTIVITY_KEY,
+        'timestamp_key': TIMESTAMP_KEY,
+    }
+    encoded_log = FrequencyEncoder(**frequency_encoder_kwargs).encode(log)
+    presence_encoder = FrequencyEncoder(frequency_encoding=FrequencyEncoding.PRESENCE, **frequency_encoder_kwargs)
+    encoded_presence_log = presence_encoder.encode(log)
+
+    activity_columns = presence_encoder._activity_vocabulary()[:-1]
+    assert (encoded_presence_log[activity_columns].dtypes == bool).all()
+    pd.testing.assert_frame_equal(encoded_presence_log[activity_columns], encoded_log[activity_columns] > 0)
+
+    # Encoding each variant once gives the same flags
+    encoded_variants_log = FrequencyEncoder(frequency_encoding=FrequencyEncoding.PRESENCE, **frequency_encoder_kwargs).encode(log, deduplicate_variants=True)
+    pd.testing.assert_frame_equal(encoded_presence_log, encoded_variants_log)
+
+
+def test_frequency_encoder_packed_presence(log):
+    frequency_encoder_kwargs = {
+        'labeling_type': LabelingType.NEXT_ACTIVITY,
+        'timestamp_format': TIMESTAMP_FORMAT,
+        'case_id_key': CASE_ID_KEY,
+        'activity_key': ACTIVITY_KEY,
+        'timestamp_key': TIMESTAMP_KEY,
+    }
+    presence_encoder = FrequencyEncoder(frequency_encoding=FrequencyEncoding.PRESENCE, **frequency_encoder_kwargs)
+    encoded_presence_log = presence_encoder.encode(log)
+    packed_encoder = FrequencyEncoder(frequency_encoding=FrequencyEncoding.PACKED_PRESENCE, **frequency_encoder_kwargs)
+    encoded_packed_log = packed_encoder.encode(log)
+
+    # 6 activities and UNKNOWN fit in one byte
+    assert list(encoded_packed_log.columns) == [CASE_ID_KEY, 'PresenceBits_1', 'label']
+    assert encoded_packed_log['PresenceBits_1'].dtype == 'uint8'
+    # Case002 after Receive Order and Contact Supplier: bits 0 and 3
+    assert encoded_packed_log['PresenceBits_1'].iloc[3] == 0b1001
+
+    activity_columns = presence_encoder._activity_vocabulary()[:-1]
+    pd.testing.assert_frame_equal(packed_encoder.unpack_presence(encoded_packed_log), encoded_presence_log[activity_columns])
+
+
+def test_frequency_encoder_frequency_encoding_not_valid(log):
+    frequency_encoder = FrequencyEncoder(
+        frequency_encoding='presence',
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    )
+
+    with pytest.raises(TypeError):
+        frequency_encoder.encode(log)
+
+
+def test_frequency_encoder_presence_many_cases():
+    # More than 255 cases: case numbers used to compute flags do not fit in a byte
+    log = generate_log(num_cases=300, num_activities=5, seed=0)
+
+    encoded_log = FrequencyEncoder(labeling_type=LabelingType.NONE).encode(log, deduplicate_variants=True)
+    presence_encoder = FrequencyEncoder(frequency_encoding=FrequencyEncoding.PRESENCE, labeling_type=LabelingType.NONE)
+    encoded_presence_log = presence_encoder.encode(log)
+
+    activity_columns = presence_encoder._activity_vocabulary()[:-1]
+    pd.testing.assert_frame_equal(encoded_presence_log[activity_columns], encoded_log[activity_columns] > 0)
@@ -0,0 +1,90 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.enc4ppm import helpers
+from src.enc4ppm.helpers import parse_timestamps, hash_buckets, sparse_array, take_rows
+from tests.data.dummy_log_info import *
+
+TIMESTAMPS = ['01/01/2025 08:00', '01/01/2025 16:00', None, '02/01/2025 09:30', '01/01/2025 08:00']
+
+
+@pytest.mark.parametrize('timestamp_format', [TIMESTAMP_FORMAT, None])
+def test_parse_timestamps_strings(timestamp_format):
+    values = pd.Series(TIMESTAMPS, index=[10, 11, 12, 13, 14], name=TIMESTAMP_KEY)
+
+    pd.testing.assert_series_equal(
+        parse_timestamps(values, timestamp_format),
+        pd.to_datetime(values, format=timestamp_format),
+    )
+
+
+def test_parse_timestamps_infers_format_once():
+    # The first value is ambiguous (month/day), the following ones are not: the format must parse all of them
+    values = pd.Series(['01/02/2025 08:00', '25/01/2025 16:00', '26/01/2025 09:30'])
+
+    parsed = parse_timestamps(values)
+
+    assert parsed.tolist() == pd.to_datetime(values, format='%d/%m/%Y %H:%M').tolist()
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us', 'ns'])
+def test_parse_timestamps_epoch(unit):
+    expected = pd.Series(pd.to_datetime(['2025-01-01 08:00', '2025-01-02 16:30']))
+    values = pd.Series(expected.to_numpy().astype(f'datetime64[{unit}]').astype(np.int64))
+
+    parsed = parse_timestamps(values)
+
+    assert parsed.tolist() == expected.tolist()
+
+
+def test_parse_timestamps_datetime():
+    values = pd.Series(pd.to_datetime(['2025-01-01 08:00', '2025-01-02 16:30'], utc=True))
+
+    pd.testing.assert_series_equal(parse_timestamps(values), values)
+
+
+def test_parse_timestamps_arrow():
+    pa = pytest.importorskip('pyarrow')
+
+    expected = pd.Series(pd.to_datetime(['2025-01-01 08:00', '2025-01-02 16:30'], utc=True))
+    values = expected.astype(pd.ArrowDtype(pa.timestamp('ns', tz='UTC')))
+
+    parsed = parse_timestamps(values)
+
+    assert pd.api.types.is_datetime64_any_dtype(parsed.dtype) and not isinstance(parsed.dtype, pd.ArrowDtype)
+    assert parsed.tolist() == expected.tolist()
+
+
+def test_hash_buckets():
+    values = pd.Series(['CustomerA', 'CustomerB', 'CustomerA', 'CustomerC'])
+
+    buckets = hash_buckets(values, 16)
+
+    # Buckets do not depend on the process (unlike the built-in hash) nor on the dtype of values
+    assert buckets.tolist() == [2, 2, 2, 4]
+    assert hash_buckets(values.astype(object), 16).tolist() == [2, 2, 2, 4]
+
+
+@pytest.mark.parametrize('private_api', [True, False])
+def test_sparse_array(monkeypatch, private_api):
+    if not private_api:
+        monkeypatch.setattr(helpers, 'IntIndex', None)
+
+    array = sparse_array(np.array([3, 1, 2], dtype=np.int64), np.array([1, 4, 5]), 7)
+
+    assert array.dtype == pd.SparseDtype(np.int64, 0)
+    assert array.to_numpy().tolist() == [0, 3, 0, 0, 1, 2, 0]
+
+
+def test_take_rows():
+    df = pd.DataFrame({
+        'dense': ['a', 'b', 'c', 'd'],
+        'sparse': sparse_array(np.array([1, 2], dtype=np.int64), np.array([1, 3]), 4),
+    }, index=[10, 11, 12, 13])
+
+    for rows in [np.array([3, 1, 0]), np.arange(4)]:
+        taken_df = take_rows(df, rows)
+
+        assert taken_df['sparse'].dtype == pd.SparseDtype(np.int64, 0)
+        pd.testing.assert_frame_equal(taken_df.astype({'sparse': 'int64'}), df.iloc[rows].reset_index(drop=True).astype({'sparse': 'int64'}))
@@ -0,0 +1,90 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.incremental import IncrementalEncoder
+from src.enc4ppm.constants import LabelingType, NumericalScaling
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def split_by_day(log):
+    days = pd.to_datetime(log[TIMESTAMP_KEY], format=TIMESTAMP_FORMAT).dt.normalize()
+    return [log[days == day] for day in sorted(days.unique())]
+
+
+@pytest.mark.parametrize('encoder_class', [FrequencyEncoder, SimpleIndexEncoder, ComplexIndexEncoder])
+@pytest.mark.parametrize('labeling_type', [LabelingType.NEXT_ACTIVITY, LabelingType.REMAINING_TIME, LabelingType.OUTCOME])
+def test_incremental_encoder(log, encoder_class, labeling_type):
+    encoder = encoder_class(
+        labeling_type=labeling_type,
+        attributes=['Customer', 'Amount'],
+        numerical_scaling=NumericalScaling.STANDARDIZATION,
+        add_time_features=True,
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        outcome_key='Outcome',
+    )
+    encoder.encode(log, freeze=True)
+
+    incremental_encoder = IncrementalEncoder(encoder)
+    seen_events = []
+
+    for day_events in split_by_day(log):
+        updated_encoded_log = incremental_encoder.update(day_events)
+        seen_events.append(day_events)
+        encoded_log = encoder.encode(pd.concat(seen_events, ignore_index=True))
+
+        # Only the rows of the updated cases are returned
+        assert sorted(incremental_encoder.updated_cases) == sorted(day_events[CASE_ID_KEY].unique())
+        pd.testing.assert_frame_equal(updated_encoded_log, encoded_log[encoded_log[CASE_ID_KEY].isin(incremental_encoder.updated_cases)].reset_index(drop=True))
+        pd.testing.assert_frame_equal(incremental_encoder.get_encoded_log(), encoded_log)
+
+
+def test_incremental_encoder_save_load(log, tmp_path):
+    days = split_by_day(log)
+
+    encoder = FrequencyEncoder(timestamp_format=TIMESTAMP_FORMAT, case_id_key=CASE_ID_KEY, activity_key=ACTIVITY_KEY, timestamp_key=TIMESTAMP_KEY)
+    encoder.encode(log, freeze=True)
+
+    incremental_encoder = IncrementalEncoder(encoder)
+    incremental_encoder.update(pd.concat(days[:3]))
+    incremental_encoder.save(os.path.join(tmp_path, 'incremental.pkl'))
+
+    loaded_incremental_encoder = IncrementalEncoder.load(os.path.join(tmp_path, 'incremental.pkl'))
+    loaded_incremental_encoder.update(pd.concat(days[3:]))
+
+    pd.testing.assert_frame_equal(loaded_incremental_encoder.get_encoded_log(), encoder.encode(pd.concat(days, ignore_index=True)))
+
+
+def test_incremental_encoder_touches_updated_cases_only(log):
+    encoder = FrequencyEncoder(timestamp_format=TIMESTAMP_FORMAT, case_id_key=CASE_ID_KEY, activity_key=ACTIVITY_KEY, timestamp_key=TIMESTAMP_KEY)
+    encoder.encode(log, freeze=True)
+
+    first_case, *other_cases = log[CASE_ID_KEY].unique()
+    incremental_encoder = IncrementalEncoder(encoder)
+    incremental_encoder.update(log[log[CASE_ID_KEY].isin(other_cases)])
+
+    case_events = dict(incremental_encoder.case_events)
+    case_encoded_rows = dict(incremental_encoder.case_encoded_rows)
+    incremental_encoder.update(log[log[CASE_ID_KEY] == first_case])
+
+    # Events and encoded rows of the other cases are kept as they are, not rebuilt
+    assert incremental_encoder.updated_cases == [first_case]
+    for case_id in other_cases:
+        assert incremental_encoder.case_events[case_id] is case_events[case_id]
+        assert incremental_encoder.case_encoded_rows[case_id] is case_encoded_rows[case_id]
+
+
+def test_incremental_encoder_not_frozen():
+    with pytest.raises(RuntimeError):
+        IncrementalEncoder(FrequencyEncoder())
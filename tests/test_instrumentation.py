@@ -0,0 +1,107 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.cache import PreprocessedLogCache
+from src.enc4ppm.instrumentation import StageMetrics
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding, ParallelBackend
+from tests.data.dummy_log_info import *
+
+STAGES = ['preprocess_log', 'extract_log_data', 'encode', 'complete_encoding', 'after_encode', 'label_log', 'apply_prefix_strategy', 'postprocess_log']
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(encoder_class=ComplexIndexEncoder):
+    return encoder_class(
+        labeling_type=LabelingType.NEXT_ACTIVITY,
+        attributes=['Customer', 'Amount'],
+        categorical_encoding=CategoricalEncoding.ONE_HOT,
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    )
+
+
+def test_instrumentation(log):
+    encoder = get_encoder()
+    encoded_log = encoder.encode(log, instrument=True)
+
+    assert [metrics.stage for metrics in encoder.stage_metrics] == STAGES
+
+    stage_metrics = {metrics.stage: metrics for metrics in encoder.stage_metrics}
+    assert stage_metrics['preprocess_log'].rows_in == len(log)
+    assert stage_metrics['extract_log_data'].rows_out is None
+    assert stage_metrics['complete_encoding'].columns_out > stage_metrics['complete_encoding'].columns_in
+    assert stage_metrics['postprocess_log'].rows_out == len(encoded_log)
+    assert stage_metrics['postprocess_log'].columns_out == len(encoded_log.columns)
+
+    for metrics in encoder.stage_metrics:
+        assert metrics.duration >= 0
+        assert metrics.peak_memory >= 0
+
+    # Instrumentation does not change the encoding
+    pd.testing.assert_frame_equal(encoded_log, get_encoder().encode(log))
+
+
+def test_instrumentation_callback(log):
+    received_metrics = []
+
+    encoder = get_encoder(FrequencyEncoder)
+    encoder.encode(log, freeze=True, stage_callback=received_metrics.append)
+
+    assert all(isinstance(metrics, StageMetrics) for metrics in received_metrics)
+    assert received_metrics == encoder.stage_metrics
+
+    # Frozen encoders do not extract log data, cached logs are still measured when read from the cache
+    received_metrics = []
+    encoder.encode(log, preprocessing_cache=PreprocessedLogCache(), stage_callback=received_metrics.append)
+    assert [metrics.stage for metrics in received_metrics] == [stage for stage in STAGES if stage != 'extract_log_data']
+
+
+def test_instrumentation_disabled(log):
+    encoder = get_encoder()
+    encoder.encode(log)
+
+    assert encoder.stage_metrics is None
+
+
+@pytest.mark.parametrize('encoder_class', [FrequencyEncoder, SimpleIndexEncoder, ComplexIndexEncoder])
+@pytest.mark.parametrize('encode_kwargs', [
+    dict(),
+    dict(n_jobs=2),
+    dict(n_jobs=2, parallel_backend=ParallelBackend.SHARED_MEMORY),
+    dict(deduplicate_variants=True),
+])
+def test_progress_callback(log, encoder_class, encode_kwargs):
+    if encoder_class == ComplexIndexEncoder and ('parallel_backend' in encode_kwargs or 'deduplicate_variants' in encode_kwargs):
+        pytest.skip('ComplexIndexEncoder does not support coded encoding')
+
+    progress = []
+    get_encoder(encoder_class).encode(log, progress_callback=progress.append, **encode_kwargs)
+
+    assert [p.stage for p in progress if p.cases_processed == 0][0] == 'preprocess_log'
+    assert all(p.total_cases == log[CASE_ID_KEY].nunique() for p in progress)
+
+    encode_progress = [p for p in progress if p.stage == 'encode']
+    assert [p.cases_processed for p in encode_progress] == sorted(p.cases_processed for p in encode_progress)
+    assert encode_progress[-1].cases_processed == log[CASE_ID_KEY].nunique()
+    assert encode_progress[-1].rows_emitted == len(log)
+
+    assert progress[-1].stage == 'postprocess_log'
+
+
+def test_progress_callback_not_stored(log, tmp_path):
+    encoder = get_encoder(FrequencyEncoder)
+    encoder.encode(log, freeze=True, progress_callback=lambda progress: None)
+
+    # Callbacks (e.g. lambdas) are not kept on the encoder, so it can still be saved
+    assert encoder.progress_reporter is None
+    encoder.save(os.path.join(tmp_path, 'encoder.pkl'))
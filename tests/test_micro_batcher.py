@@ -0,0 +1,65 @@
+import os
+import asyncio
+import pytest
+import pandas as pd
+
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.micro_batcher import MicroBatcher
+from src.enc4ppm.constants import LabelingType
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(**kwargs):
+    return SimpleIndexEncoder(
+        labeling_type=LabelingType.REMAINING_TIME,
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def test_micro_batcher(log):
+    encoder = get_encoder()
+    # Remaining time labels every prefix, so the encoded log contains one row per prefix
+    encoded_log = encoder.encode(log, freeze=True).drop(columns=['label'])
+
+    prefixes = []
+    for _, case_events in log.groupby(CASE_ID_KEY, sort=False):
+        for prefix_length in range(1, len(case_events)+1):
+            prefixes.append(case_events.iloc[:prefix_length])
+
+    async def encode_all():
+        batcher = MicroBatcher(encoder, max_batch_size=4, max_wait=0.01)
+        return await asyncio.gather(*[batcher.encode_prefix(prefix) for prefix in prefixes])
+
+    rows = asyncio.run(encode_all())
+
+    assert len(rows) == len(encoded_log)
+
+    gt_rows = encoded_log.to_dict(orient='records')
+    for i in range(len(gt_rows)):
+        assert gt_rows[i] == rows[i].to_dict()
+
+
+def test_micro_batcher_requires_frozen_encoder(log):
+    with pytest.raises(RuntimeError):
+        MicroBatcher(get_encoder())
+
+
+def test_micro_batcher_prefix_too_long(log):
+    encoder = get_encoder(prefix_length=2)
+    encoder.encode(log, freeze=True)
+
+    async def encode_long_prefix():
+        batcher = MicroBatcher(encoder)
+        return await batcher.encode_prefix(log[log[CASE_ID_KEY] == 'Case003'])
+
+    with pytest.raises(ValueError):
+        asyncio.run(encode_long_prefix())
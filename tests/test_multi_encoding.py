@@ -0,0 +1,87 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.multi_encoding import encode_many
+from src.enc4ppm.base_encoder import BaseEncoder
+from src.enc4ppm.coded_log import CodedLog
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+ENCODER_KWARGS = {
+    'attributes': ['Customer', 'Amount'],
+    'timestamp_format': TIMESTAMP_FORMAT,
+    'case_id_key': CASE_ID_KEY,
+    'activity_key': ACTIVITY_KEY,
+    'timestamp_key': TIMESTAMP_KEY,
+}
+
+
+def get_encoders():
+    return [
+        FrequencyEncoder(include_latest_payload=True, labeling_type=LabelingType.NEXT_ACTIVITY, **ENCODER_KWARGS),
+        SimpleIndexEncoder(labeling_type=LabelingType.REMAINING_TIME, categorical_encoding=CategoricalEncoding.ONE_HOT, **ENCODER_KWARGS),
+        ComplexIndexEncoder(labeling_type=LabelingType.REMAINING_TIME_CLASSIFICATION, **ENCODER_KWARGS),
+    ]
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_encode_many(log, n_jobs):
+    encoded_logs = [encoder.encode(log, freeze=True) for encoder in get_encoders()]
+
+    encoders = get_encoders()
+    encoded_logs_many = encode_many(log, encoders, freeze=True, n_jobs=n_jobs)
+
+    assert len(encoded_logs_many) == len(encoded_logs)
+    for encoded_log_many, encoded_log in zip(encoded_logs_many, encoded_logs):
+        pd.testing.assert_frame_equal(encoded_log_many, encoded_log)
+
+    # Encoders are frozen as if encode had been called on each of them
+    for encoder in encoders:
+        assert encoder.is_frozen
+        assert encoder.original_df is log
+        assert len(encoder.log_activities) == NUM_ACTIVITIES + 2
+
+
+def test_encode_many_checks_and_sorts_once(log, monkeypatch):
+    calls = []
+
+    def spy(name, function):
+        def wrapper(*args, **kwargs):
+            calls.append(name)
+            return function(*args, **kwargs)
+        return wrapper
+
+    sort_columns = []
+
+    def sort_values(self, by, *args, **kwargs):
+        sort_columns.append(by)
+        return original_sort_values(self, by, *args, **kwargs)
+
+    original_sort_values = pd.DataFrame.sort_values
+    monkeypatch.setattr(BaseEncoder, '_check_log', spy('check_log', BaseEncoder._check_log))
+    monkeypatch.setattr(CodedLog, 'from_log', spy('code_log', CodedLog.from_log))
+    monkeypatch.setattr(pd.DataFrame, 'sort_values', sort_values)
+
+    encode_many(log, get_encoders(), freeze=True)
+
+    # The log is checked and sorted by case and timestamp once, not once per encoder (nor once per case)
+    assert calls.count('check_log') == 1
+    assert calls.count('code_log') == 1
+    assert TIMESTAMP_KEY not in sort_columns
+
+
+def test_encode_many_different_keys(log):
+    encoders = get_encoders() + [FrequencyEncoder()]
+
+    with pytest.raises(ValueError):
+        encode_many(log, encoders)
@@ -0,0 +1,160 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.ngram_encoder import NGramEncoder
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType, PrefixStrategy
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(**kwargs):
+    return NGramEncoder(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def test_ngram_encoder(log):
+    encoder = get_encoder(ngram_sizes=[2])
+    encoded_log = encoder.encode(log)
+
+    assert encoder.log_ngrams == [
+        ('Receive Order', 'Ship'),
+        ('Ship', 'Receive Payment'),
+        ('Receive Order', 'Contact Supplier'),
+        ('Contact Supplier', 'Ship'),
+        ('Receive Payment', 'Order Returned'),
+        ('Order Returned', 'Issue Refund'),
+    ]
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in encoded_log.dtypes[1:-1])
+
+    # Case002: Receive Order, Contact Supplier, Ship, Receive Payment
+    assert encoded_log.iloc[4].to_dict() == {
+        CASE_ID_KEY: 'Case002',
+        'Receive Order -> Ship': 0,
+        'Ship -> Receive Payment': 0,
+        'Receive Order -> Contact Supplier': 1,
+        'Contact Supplier -> Ship': 1,
+        'Receive Payment -> Order Returned': 0,
+        'Order Returned -> Issue Refund': 0,
+        UNKNOWN_VAL: 0,
+        'label': 'Receive Payment',
+    }
+
+
+def test_ngram_encoder_counts():
+    log = generate_log(num_cases=200, num_activities=5, seed=0)
+    ngram_sizes = [1, 2, 3]
+
+    encoded_log = NGramEncoder(ngram_sizes=ngram_sizes, labeling_type=LabelingType.NONE).encode(log)
+    dense_encoded_log = encoded_log.astype({column: 'int64' for column in encoded_log.columns[1:]})
+
+    # Compare with n-grams counted in every prefix
+    sorted_log = log.sort_values(['case:concept:name', 'time:timestamp'], kind='stable')
+    for _, case_events in sorted_log.groupby('case:concept:name'):
+        activities = case_events['concept:name'].tolist()
+
+        for prefix_length in range(1, len(activities)+1):
+            expected_counts = {}
+            for size in ngram_sizes:
+                for end in range(size, prefix_length+1):
+                    ngram = ' -> '.join(activities[end-size:end])
+                    expected_counts[ngram] = expected_counts.get(ngram, 0) + 1
+
+            row = dense_encoded_log.loc[case_events.index[prefix_length-1]].drop('case:concept:name')
+            assert row[row > 0].to_dict() == expected_counts
+
+
+def test_ngram_encoder_unigrams(log):
+    # 1-grams are activity frequencies
+    encoded_log = get_encoder(ngram_sizes=[1], sparse=False).encode(log)
+    frequency_encoded_log = FrequencyEncoder(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    ).encode(log)
+
+    pd.testing.assert_frame_equal(encoded_log[frequency_encoded_log.columns], frequency_encoded_log)
+
+
+def test_ngram_encoder_unknown_values(log):
+    encoder = get_encoder(ngram_sizes=[2, 3])
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003'])].copy()
+
+    encoder.encode(train_log, freeze=True)
+    encoded_test_log = encoder.encode(test_log)
+
+    # Case003: Receive Order, Ship, Receive Payment, Order Returned, Issue Refund
+    # Receive Payment -> Order Returned and Ship -> Receive Payment -> Order Returned are unknown
+    assert encoded_test_log[UNKNOWN_VAL].tolist() == [0, 0, 0, 2]
+    assert encoded_test_log['Receive Order -> Ship -> Receive Payment'].tolist() == [0, 0, 1, 1]
+
+
+def test_ngram_encoder_sparse(log):
+    encoded_log = get_encoder(prefix_strategy=PrefixStrategy.ONLY_SPECIFIED, prefix_length=3).encode(log)
+    dense_encoded_log = get_encoder(prefix_strategy=PrefixStrategy.ONLY_SPECIFIED, prefix_length=3, sparse=False).encode(log)
+
+    assert all(dtype == 'int64' for dtype in dense_encoded_log.dtypes[1:-1])
+    pd.testing.assert_frame_equal(encoded_log.astype(dense_encoded_log.dtypes.to_dict()), dense_encoded_log)
+
+
+def test_ngram_encoder_parallel(log):
+    encoded_log = get_encoder().encode(log)
+    parallel_encoded_log = get_encoder().encode(log, n_jobs=2)
+
+    pd.testing.assert_frame_equal(encoded_log, parallel_encoded_log)
+
+
+def test_ngram_encoder_estimate(log):
+    encoder = get_encoder(add_time_features=True)
+
+    estimate = encoder.estimate(log)
+    encoded_log = encoder.encode(log)
+
+    assert estimate.rows == len(encoded_log)
+    assert estimate.columns == encoded_log.columns.tolist()
+    assert estimate.dtypes == [str(dtype) for dtype in encoded_log.dtypes]
+
+
+def test_ngram_encoder_no_per_call_state(log, monkeypatch):
+    encoder = get_encoder()
+    encoded_log = encoder.encode(log)
+    assert not any(isinstance(value, pd.DataFrame) for name, value in vars(encoder).items() if name != 'original_df')
+
+    # An encoding failing after counts are set aside leaves nothing behind
+    def fail(df):
+        raise RuntimeError('labeling failed')
+
+    monkeypatch.setattr(encoder, '_label_log', fail)
+    with pytest.raises(RuntimeError):
+        encoder.encode(log)
+    monkeypatch.undo()
+
+    assert not any(isinstance(value, pd.DataFrame) for name, value in vars(encoder).items() if name != 'original_df')
+    pd.testing.assert_frame_equal(encoder.encode(log), encoded_log)
+
+
+def test_ngram_encoder_no_prefixes(log):
+    # No case has 6 events
+    encoded_log = get_encoder(prefix_strategy=PrefixStrategy.ONLY_SPECIFIED, prefix_length=6).encode(log)
+
+    assert len(encoded_log) == 0
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in encoded_log.dtypes[1:-1])
+
+
+def test_ngram_encoder_invalid_sizes(log):
+    for ngram_sizes in [[], [0], [2.5], 2]:
+        with pytest.raises(ValueError):
+            get_encoder(ngram_sizes=ngram_sizes).encode(log)
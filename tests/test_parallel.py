@@ -0,0 +1,84 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.constants import LabelingType, CategoricalEncoding, ParallelBackend
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+ENCODER_KWARGS = {
+    'attributes': ['Customer', 'Amount'],
+    'categorical_encoding': CategoricalEncoding.ONE_HOT,
+    'add_time_features': True,
+    'timestamp_format': TIMESTAMP_FORMAT,
+    'case_id_key': CASE_ID_KEY,
+    'activity_key': ACTIVITY_KEY,
+    'timestamp_key': TIMESTAMP_KEY,
+}
+
+
+@pytest.mark.parametrize('encoder_factory', [
+    lambda labeling_type: FrequencyEncoder(include_latest_payload=True, labeling_type=labeling_type, **ENCODER_KWARGS),
+    lambda labeling_type: SimpleIndexEncoder(include_latest_payload=True, labeling_type=labeling_type, **ENCODER_KWARGS),
+    lambda labeling_type: ComplexIndexEncoder(include_timestamps=True, labeling_type=labeling_type, **ENCODER_KWARGS),
+])
+@pytest.mark.parametrize('labeling_type', [LabelingType.NEXT_ACTIVITY, LabelingType.REMAINING_TIME])
+def test_parallel_encoding(log, encoder_factory, labeling_type):
+    encoded_log = encoder_factory(labeling_type).encode(log)
+    encoded_log_parallel = encoder_factory(labeling_type).encode(log, n_jobs=3)
+
+    pd.testing.assert_frame_equal(encoded_log_parallel, encoded_log)
+
+
+def test_parallel_encoding_frozen(log):
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003', 'Case004'])].copy()
+
+    encoder = SimpleIndexEncoder(include_latest_payload=True, **ENCODER_KWARGS)
+    encoder.encode(train_log, freeze=True)
+
+    pd.testing.assert_frame_equal(encoder.encode(test_log, n_jobs=-1), encoder.encode(test_log))
+
+
+def test_parallel_encoding_invalid_n_jobs(log):
+    with pytest.raises(ValueError):
+        FrequencyEncoder(**ENCODER_KWARGS).encode(log, n_jobs=0)
+
+
+@pytest.mark.parametrize('encoder_factory', [
+    lambda: FrequencyEncoder(**ENCODER_KWARGS),
+    lambda: FrequencyEncoder(include_latest_payload=True, **ENCODER_KWARGS),
+    lambda: SimpleIndexEncoder(**ENCODER_KWARGS),
+    lambda: SimpleIndexEncoder(include_latest_payload=True, prefix_length=3, **ENCODER_KWARGS),
+])
+def test_shared_memory_encoding(log, encoder_factory):
+    encoded_log = encoder_factory().encode(log)
+    encoded_log_parallel = encoder_factory().encode(log, n_jobs=3, parallel_backend=ParallelBackend.SHARED_MEMORY)
+
+    pd.testing.assert_frame_equal(encoded_log_parallel, encoded_log)
+
+
+def test_shared_memory_encoding_unknown_values(log):
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003', 'Case004'])].copy()
+
+    encoder = FrequencyEncoder(**ENCODER_KWARGS)
+    encoder.encode(train_log, freeze=True)
+
+    pd.testing.assert_frame_equal(
+        encoder.encode(test_log, n_jobs=2, parallel_backend=ParallelBackend.SHARED_MEMORY),
+        encoder.encode(test_log),
+    )
+
+
+def test_shared_memory_encoding_not_supported(log):
+    with pytest.raises(ValueError):
+        ComplexIndexEncoder(**ENCODER_KWARGS).encode(log, n_jobs=2, parallel_backend=ParallelBackend.SHARED_MEMORY)
@@ -0,0 +1,139 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.enc4ppm.sequence_encoder import SequenceEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType, TimeFeature
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(**kwargs):
+    return SequenceEncoder(
+        attributes=['Customer', 'Amount'],
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def test_sequence_encoder(log):
+    encoder = get_encoder()
+    encoded_log = encoder.encode(log)
+
+    assert encoder.get_token_ids(ACTIVITY_KEY) == {
+        PADDING_CAT_VAL: 0,
+        UNKNOWN_VAL: 1,
+        'Receive Order': 2,
+        'Ship': 3,
+        'Receive Payment': 4,
+        'Contact Supplier': 5,
+        'Order Returned': 6,
+        'Issue Refund': 7,
+    }
+    assert encoder.get_token_ids('Customer') == {PADDING_CAT_VAL: 0, UNKNOWN_VAL: 1, 'CustomerA': 2, 'CustomerB': 3, 'CustomerC': 4}
+
+    # Case002: Receive Order, Contact Supplier, Ship, Receive Payment
+    assert encoded_log.iloc[3].to_dict() == {
+        CASE_ID_KEY: 'Case002',
+        'Customer': 3,
+        'event_1': 2,
+        'event_2': 5,
+        'event_3': 0,
+        'event_4': 0,
+        'event_5': 0,
+        'Amount_1': 0.0,
+        'Amount_2': -20.0,
+        'Amount_3': PADDING_NUM_VAL,
+        'Amount_4': PADDING_NUM_VAL,
+        'Amount_5': PADDING_NUM_VAL,
+        'label': 'Ship',
+    }
+    assert all(encoded_log[f'event_{i}'].dtype == 'int64' for i in range(1, 6))
+    assert all(encoded_log[f'Amount_{i}'].dtype == 'float64' for i in range(1, 6))
+
+
+def test_sequence_encoder_matches_complex_index():
+    log = generate_log(num_cases=200, seed=0)
+
+    encoder = SequenceEncoder(attributes='all', labeling_type=LabelingType.NONE)
+    encoded_log = encoder.encode(log)
+    complex_encoded_log = ComplexIndexEncoder(attributes='all', labeling_type=LabelingType.NONE).encode(log)
+
+    for i in range(1, encoder.prefix_length+1):
+        column = f'{encoder.EVENT_COL_PREFIX_NAME}_{i}'
+        assert (complex_encoded_log[column].map(encoder.get_token_ids(encoder.activity_key)) == encoded_log[column]).all()
+
+        for attribute_name, attribute in encoder.log_attributes.items():
+            if attribute['scope'] != 'event': continue
+
+            column = f'{attribute_name}_{i}'
+            if attribute['type'] == 'categorical':
+                assert (complex_encoded_log[column].map(encoder.get_token_ids(attribute_name)) == encoded_log[column]).all()
+            else:
+                assert np.allclose(complex_encoded_log[column], encoded_log[column])
+
+
+def test_sequence_encoder_ragged(log):
+    encoded_log = get_encoder().encode(log)
+    encoded_ragged_log = get_encoder(ragged=True).encode(log)
+
+    assert encoded_ragged_log.columns.tolist() == [CASE_ID_KEY, 'Customer', 'event', 'Amount', 'label']
+    pd.testing.assert_series_equal(encoded_ragged_log['Customer'], encoded_log['Customer'])
+
+    for i in range(len(encoded_ragged_log)):
+        activities = encoded_ragged_log['event'].iloc[i]
+        amounts = encoded_ragged_log['Amount'].iloc[i]
+        prefix_length = len(activities)
+
+        assert activities.dtype == np.int64 and amounts.dtype == np.float64
+        assert np.array_equal(activities, encoded_log.loc[i, [f'event_{j}' for j in range(1, prefix_length+1)]].to_numpy(dtype=np.int64))
+        assert np.array_equal(amounts, encoded_log.loc[i, [f'Amount_{j}' for j in range(1, prefix_length+1)]].to_numpy(dtype=np.float64))
+
+        # Sequences are read-only views over the values of their case
+        assert not activities.flags.writeable
+
+
+def test_sequence_encoder_unknown_values(log):
+    encoder = get_encoder()
+    train_log = log[log[CASE_ID_KEY].isin(['Case001', 'Case002'])].copy()
+    test_log = log[log[CASE_ID_KEY].isin(['Case003'])].copy()
+
+    _ = encoder.encode(train_log, freeze=True)
+    encoded_test_log = encoder.encode(test_log)
+
+    # Case003: Receive Order, Ship, Receive Payment, Order Returned (unknown) by CustomerA
+    assert encoded_test_log['Customer'].tolist() == [2, 2, 2, 2]
+    assert encoded_test_log.loc[3, [f'event_{i}' for i in range(1, 5)]].tolist() == [2, 3, 4, SequenceEncoder.UNKNOWN_ID]
+
+
+def test_sequence_encoder_estimate(log):
+    for ragged in [False, True]:
+        encoder = get_encoder(ragged=ragged)
+        estimate = encoder.estimate(log)
+        encoded_log = encoder.encode(log)
+
+        assert estimate.columns == encoded_log.columns.tolist()
+        assert estimate.dtypes == [str(dtype) for dtype in encoded_log.dtypes]
+
+
+def test_sequence_encoder_parameters_not_valid(log):
+    with pytest.raises(TypeError):
+        get_encoder(ragged='yes').encode(log)
+
+    with pytest.raises(ValueError):
+        get_encoder(ragged=True, add_time_features=[TimeFeature.INTER_EVENT_TIMES]).encode(log)
+
+    encoder = get_encoder()
+    encoder.encode(log)
+    with pytest.raises(ValueError):
+        encoder.get_token_ids('Amount')
@@ -2267,3 +2267,43 @@ def test_simple_index_encoder_onehot_latest_payload_unknown_values(log, gt_encod
     encoded_test_log = encoded_test_log.to_dict(orient='records')
     for i in range(len(gt_encoded_log_onehot_latest_payload_unknown_values)):
         assert gt_encoded_log_onehot_latest_payload_unknown_values[i] == encoded_test_log[i]
+
+
+def test_simple_index_encoder_window(log):
+    simple_index_encoder = SimpleIndexEncoder(
+        window_size=2,
+        labeling_type=LabelingType.NEXT_ACTIVITY,
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+    )
+
+    encoded_log = simple_index_encoder.encode(log)
+
+    # Last 2 events of every prefix, right-aligned
+    assert encoded_log.columns.tolist() == [CASE_ID_KEY, 'event_1', 'event_2', 'label']
+    assert encoded_log[encoded_log[CASE_ID_KEY] == 'Case003'][['event_1', 'event_2']].values.tolist() == [
+        [PADDING_CAT_VAL, 'Receive Order'],
+        ['Receive Order', 'Ship'],
+        ['Ship', 'Receive Payment'],
+        ['Receive Payment', 'Order Returned'],
+    ]
+
+
+def test_simple_index_encoder_window_variants(log):
+    def get_encoder():
+        return SimpleIndexEncoder(
+            window_size=3,
+            categorical_encoding=CategoricalEncoding.ONE_HOT,
+            timestamp_format=TIMESTAMP_FORMAT,
+            case_id_key=CASE_ID_KEY,
+            activity_key=ACTIVITY_KEY,
+            timestamp_key=TIMESTAMP_KEY,
+        )
+
+    encoded_log = get_encoder().encode(log)
+
+    # Variants are encoded from the windows of their parent prefixes
+    pd.testing.assert_frame_equal(get_encoder().encode(log, deduplicate_variants=True), encoded_log)
+    assert get_encoder().estimate(log).columns == encoded_log.columns.tolist()
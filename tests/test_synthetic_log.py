@@ -0,0 +1,53 @@
+import pytest
+import pandas as pd
+
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.constants import CaseLengthDistribution, NumericalDistribution, LabelingType, CategoricalEncoding
+
+def test_generate_log_seed():
+    pd.testing.assert_frame_equal(generate_log(num_cases=50, seed=1), generate_log(num_cases=50, seed=1))
+    assert not generate_log(num_cases=50, seed=1).equals(generate_log(num_cases=50, seed=2))
+
+
+@pytest.mark.parametrize('case_length_distribution', list(CaseLengthDistribution))
+@pytest.mark.parametrize('numerical_distribution', list(NumericalDistribution))
+def test_generate_log(case_length_distribution, numerical_distribution):
+    log = generate_log(
+        num_cases=200,
+        num_activities=5,
+        case_length_distribution=case_length_distribution,
+        min_case_length=2,
+        max_case_length=30,
+        num_trace_categorical_attributes=2,
+        num_event_numerical_attributes=3,
+        categorical_cardinality=4,
+        numerical_distribution=numerical_distribution,
+    )
+
+    case_lengths = log.groupby('case:concept:name').size()
+    assert len(case_lengths) == 200
+    assert case_lengths.min() >= 2 and case_lengths.max() <= 30
+    assert log['concept:name'].nunique() <= 5
+    assert log['time:timestamp'].is_monotonic_increasing
+
+    assert log.columns.tolist() == [
+        'case:concept:name', 'concept:name', 'time:timestamp',
+        'case:trace_categorical_1', 'case:trace_categorical_2', 'case:trace_numerical_1',
+        'event_categorical_1', 'event_numerical_1', 'event_numerical_2', 'event_numerical_3',
+        'outcome',
+    ]
+
+    # Trace attributes and outcome are constant within a case
+    for column in ['case:trace_categorical_1', 'case:trace_numerical_1', 'outcome']:
+        assert (log.groupby('case:concept:name')[column].nunique() == 1).all()
+
+    assert log['event_categorical_1'].nunique() <= 4
+
+
+def test_generate_log_encoding():
+    log = generate_log(num_cases=30, max_case_length=8, timestamp_format='%Y-%m-%d %H:%M:%S')
+
+    FrequencyEncoder(labeling_type=LabelingType.OUTCOME, attributes='all', include_latest_payload=True).encode(log)
+    ComplexIndexEncoder(labeling_type=LabelingType.REMAINING_TIME, attributes='all', categorical_encoding=CategoricalEncoding.ONE_HOT).encode(log)
@@ -0,0 +1,135 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.enc4ppm.simple_index_encoder import SimpleIndexEncoder
+from src.enc4ppm.frequency_encoder import FrequencyEncoder
+from src.enc4ppm.time_features import BusinessCalendar, compute_time_features, timestamps_to_ns
+from src.enc4ppm.synthetic_log import generate_log
+from src.enc4ppm.constants import LabelingType, NumericalScaling, TimeFeature
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def log():
+    log_path = os.path.join(os.path.dirname(__file__), 'data', TEST_LOG_NAME)
+    return pd.read_csv(log_path)
+
+
+def get_encoder(encoder_class, **kwargs):
+    return encoder_class(
+        timestamp_format=TIMESTAMP_FORMAT,
+        case_id_key=CASE_ID_KEY,
+        activity_key=ACTIVITY_KEY,
+        timestamp_key=TIMESTAMP_KEY,
+        **kwargs,
+    )
+
+
+def test_compute_time_features():
+    log = generate_log(num_cases=50, seed=0).sort_values(['case:concept:name', 'time:timestamp'], kind='stable')
+    timestamps = log['time:timestamp']
+    case_offsets = np.append(0, np.cumsum(log.groupby('case:concept:name', sort=False).size().to_numpy()))
+
+    values = compute_time_features(timestamps_to_ns(timestamps), case_offsets, list(TimeFeature), BusinessCalendar())
+
+    # Compare with pandas datetime accessors
+    case_starts = log.groupby('case:concept:name')['time:timestamp'].transform('min')
+    assert values[TimeFeature.TIME_SINCE_CASE_START].tolist() == (timestamps - case_starts).dt.total_seconds().tolist()
+    assert values[TimeFeature.TIME_SINCE_PREVIOUS_EVENT].tolist() == log.groupby('case:concept:name')['time:timestamp'].diff().dt.total_seconds().fillna(0).tolist()
+    assert values[TimeFeature.HOUR_OF_DAY].tolist() == timestamps.dt.hour.tolist()
+    assert values[TimeFeature.DAY_OF_WEEK].tolist() == timestamps.dt.weekday.tolist()
+    assert values[TimeFeature.MONTH].tolist() == timestamps.dt.month.tolist()
+    assert values[TimeFeature.TIME_SINCE_MIDNIGHT].tolist() == (timestamps - timestamps.dt.normalize()).dt.total_seconds().tolist()
+    assert values[TimeFeature.IS_WORKING_DAY].tolist() == (timestamps.dt.weekday < 5).tolist()
+    assert values[TimeFeature.IS_WORKING_HOURS].tolist() == ((timestamps.dt.weekday < 5) & (timestamps.dt.hour >= 9) & (timestamps.dt.hour < 17)).tolist()
+
+
+def test_time_features_daylight_saving_time():
+    # Clocks go forward from 02:00 to 03:00 on 31/03/2024 in Europe/Rome
+    timestamps = pd.to_datetime(['2024-03-31 00:30', '2024-03-31 04:30', '2024-03-31 05:30']).tz_localize('Europe/Rome')
+    log = pd.DataFrame({
+        'case:concept:name': ['Case001'] * 3,
+        'concept:name': ['Receive Order', 'Ship', 'Receive Payment'],
+        'time:timestamp': timestamps,
+    })
+    encoder = SimpleIndexEncoder(
+        labeling_type=LabelingType.REMAINING_TIME,
+        add_time_features=[TimeFeature.TIME_SINCE_CASE_START, TimeFeature.TIME_SINCE_PREVIOUS_EVENT, TimeFeature.HOUR_OF_DAY, TimeFeature.INTER_EVENT_TIMES],
+    )
+    encoded_log = encoder.encode(log)
+
+    # Durations are elapsed times, consistent with the remaining time label (in hours)
+    assert encoded_log['TimeSinceCaseStart'].tolist() == [0.0, 10800.0, 14400.0]
+    assert encoded_log['TimeSincePreviousEvent'].tolist() == [0.0, 10800.0, 3600.0]
+    assert encoded_log['InterEventTime_2'].tolist() == [0.0, 10800.0, 10800.0]
+    assert encoded_log['label'].tolist() == [4.0, 1.0, 0.0]
+
+    # Calendar features are taken in local wall time
+    assert encoded_log['HourOfDay'].tolist() == [0, 4, 5]
+
+
+def test_business_calendar(log):
+    # 01/01/2025 is a Wednesday
+    business_calendar = BusinessCalendar(holidays=['2025-01-01'], working_hours=(8, 12))
+    encoder = get_encoder(
+        FrequencyEncoder,
+        add_time_features=[TimeFeature.IS_WORKING_DAY, TimeFeature.IS_WORKING_HOURS, TimeFeature.WORKING_DAYS_SINCE_CASE_START],
+        business_calendar=business_calendar,
+        labeling_type=LabelingType.NONE,
+    )
+
+    encoded_log = encoder.encode(log)
+
+    # Case001: 01/01/2025 08:00, 01/01/2025 16:00, 03/01/2025 10:00
+    case_encoded_log = encoded_log[encoded_log[CASE_ID_KEY] == 'Case001']
+    assert case_encoded_log['IsWorkingDay'].tolist() == [False, False, True]
+    assert case_encoded_log['IsWorkingHours'].tolist() == [False, False, True]
+    assert case_encoded_log['WorkingDaysSinceCaseStart'].tolist() == [0, 0, 1]
+
+
+def test_inter_event_times(log):
+    encoder = get_encoder(SimpleIndexEncoder, add_time_features=[TimeFeature.HOUR_OF_DAY, TimeFeature.INTER_EVENT_TIMES], prefix_length=3)
+    encoded_log = encoder.encode(log)
+
+    assert encoded_log.columns.tolist() == [CASE_ID_KEY, 'event_1', 'event_2', 'event_3', 'HourOfDay', 'InterEventTime_1', 'InterEventTime_2', 'InterEventTime_3', 'label']
+
+    # Case002: 02/01/2025 12:00, 02/01/2025 17:30, 04/01/2025 10:00
+    case_encoded_log = encoded_log[encoded_log[CASE_ID_KEY] == 'Case002']
+    assert case_encoded_log['HourOfDay'].tolist() == [12, 17, 10]
+    assert case_encoded_log[['InterEventTime_1', 'InterEventTime_2', 'InterEventTime_3']].values.tolist() == [
+        [0, PADDING_NUM_VAL, PADDING_NUM_VAL],
+        [0, 5.5*60*60, PADDING_NUM_VAL],
+        [0, 5.5*60*60, 40.5*60*60],
+    ]
+
+    # Windows take the inter-event times of their last events
+    window_encoded_log = get_encoder(SimpleIndexEncoder, add_time_features=[TimeFeature.INTER_EVENT_TIMES], window_size=2).encode(log)
+    assert window_encoded_log.loc[window_encoded_log[CASE_ID_KEY] == 'Case002', ['InterEventTime_1', 'InterEventTime_2']].values.tolist() == [
+        [PADDING_NUM_VAL, 0],
+        [0, 5.5*60*60],
+        [5.5*60*60, 40.5*60*60],
+    ]
+
+
+def test_time_features_standardization(log):
+    time_features = [TimeFeature.TIME_SINCE_CASE_START, TimeFeature.HOUR_OF_DAY, TimeFeature.IS_WORKING_DAY, TimeFeature.INTER_EVENT_TIMES]
+    encoder = get_encoder(SimpleIndexEncoder, add_time_features=time_features, numerical_scaling=NumericalScaling.STANDARDIZATION, prefix_length=3)
+
+    encoded_log = encoder.encode(log, freeze=True)
+
+    # Numerical time features are standardized, boolean ones are not
+    assert set(encoder.numerical_scaling_info) == {'TimeSinceCaseStart', 'HourOfDay', 'InterEventTime'}
+    assert encoded_log['IsWorkingDay'].dtype == bool
+    assert encoder.unscale_numerical_feature(encoded_log['HourOfDay'], 'HourOfDay').round().tolist() == [8, 16, 12, 17, 10, 15, 18, 10, 11, 17]
+
+    # Frozen encoders reuse the statistics
+    pd.testing.assert_frame_equal(encoder.encode(log), encoded_log)
+
+
+def test_time_features_invalid(log):
+    with pytest.raises(ValueError):
+        get_encoder(FrequencyEncoder, add_time_features=[TimeFeature.INTER_EVENT_TIMES]).encode(log)
+
+    with pytest.raises(TypeError):
+        get_encoder(FrequencyEncoder, add_time_features=['hour_of_day']).encode(log)
@@ -0,0 +1,49 @@
+import os
+import pytest
+import pandas as pd
+
+from src.enc4ppm.complex_index_encoder import ComplexIndexEncoder
+from src.enc4ppm.xes_reader import read_xes_batches, encode_xes
+from src.enc4ppm.constants import LabelingType
+from tests.data.dummy_log_info import *
+
+@pytest.fixture
+def xes_log_path():
+    return os.path.join(os.path.dirname(__file__), 'data', TEST_XES_LOG_NAME)
+
+
+def test_read_xes_batches(xes_log_path):
+    batches = list(read_xes_batches(xes_log_path, batch_size=4))
+
+    # Traces are never split: Case001 (3 events) + Case002 (4 events), Case003 (5 events), Case004 (3 events)
+    assert [len(batch) for batch in batches] == [7, 5, 3]
+
+    log = pd.concat(batches, ignore_index=True)
+
+    assert log['case:concept:name'].unique().tolist() == ['Case001', 'Case002', 'Case003', 'Case004']
+    assert log['concept:name'].tolist()[:3] == ['Receive Order', 'Ship', 'Receive Payment']
+    assert log['time:timestamp'].iloc[0] == pd.Timestamp('2025-01-01 07:00', tz='UTC')
+    assert log['case:Customer'].iloc[3] == 'CustomerB'
+    assert log['case:Outcome'].tolist().count(True) == 5
+    assert log['Amount'].sum() == 630
+
+
+def test_encode_xes(xes_log_path):
+    log = pd.concat(read_xes_batches(xes_log_path), ignore_index=True)
+
+    encoder = ComplexIndexEncoder(
+        labeling_type=LabelingType.OUTCOME,
+        attributes=['case:Customer', 'Amount'],
+        outcome_key='case:Outcome',
+    )
+    encoded_log = encoder.encode(log, freeze=True)
+
+    encoded_batches = list(encode_xes(encoder, xes_log_path, batch_size=4))
+
+    assert len(encoded_batches) == 3
+    pd.testing.assert_frame_equal(pd.concat(encoded_batches, ignore_index=True), encoded_log)
+
+
+def test_encode_xes_requires_frozen_encoder(xes_log_path):
+    with pytest.raises(RuntimeError):
+        next(encode_xes(ComplexIndexEncoder(), xes_log_path))